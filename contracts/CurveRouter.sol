@@ -0,0 +1,337 @@
+// SPDX-License-Identifier: MIT
+
+pragma experimental ABIEncoderV2;
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+
+import "../../interfaces/curve/ICurve.sol";
+import "../../interfaces/curve/ICurveAlt.sol";
+import "../../interfaces/uniswap/Uni.sol";
+
+// StrategyCurveLP getters describing its route
+interface IStrategyRoute {
+    function want() external view returns (address);
+
+    function basePool() external view returns (address);
+
+    function baseCoins() external view returns (uint256);
+
+    function baseIndex() external view returns (int128);
+
+    function baseLp() external view returns (address);
+
+    function metaPool() external view returns (address);
+
+    function metaIndex() external view returns (int128);
+
+    function metaLp() external view returns (address);
+}
+
+// Entry / exit router for StrategyCurveLP routes. Quotes every candidate path between
+// a strategy's want and its target LP in one view call and executes the best one:
+//   DIRECT: through the route's pools, what the strategy does on its own
+//   META_COIN: (metapool routes) swapped on uniswap for the metapool's own coin, added there
+//   BASE_COIN + j: swapped on uniswap for base pool coin j, added through the route
+// and the same paths backwards for exits. Holds nothing between calls: the caller sends
+// want (target LP) and gets the target LP (want) that call produced back, at least
+// `minLp` (`minOut`). Every hop has a minimum too: its quote, scaled by the caller's
+// minimum over the path's quote. Routes are read from the caller's getters, so only
+// strategies governance allowed can call.
+// Curve's calc_token_amount leaves out the imbalance fee, which only ever favours DIRECT.
+contract CurveRouter {
+    using SafeERC20 for IERC20;
+    using Address for address;
+    using SafeMath for uint256;
+
+    uint256 constant public DIRECT = 0;
+    uint256 constant public META_COIN = 1;
+    uint256 constant public BASE_COIN = 2;
+
+    // Uniswap v2 router, address(0) for the curve path only
+    address public immutable uniswap;
+
+    address public governance;
+    mapping(address => bool) public strategies;
+
+    struct Route {
+        address want;
+        address basePool;
+        uint256 baseCoins;
+        uint256 baseIndex;
+        address baseLp;
+        address metaPool;
+        uint256 metaIndex;
+        address metaLp;
+    }
+
+    constructor(address _uniswap) public {
+        uniswap = _uniswap;
+        governance = msg.sender;
+    }
+
+    function setGovernance(address _governance) external {
+        require(msg.sender == governance, "!governance");
+        governance = _governance;
+    }
+
+    function setStrategy(address _strategy, bool _allowed) external {
+        require(msg.sender == governance, "!governance");
+        strategies[_strategy] = _allowed;
+    }
+
+    // nothing is left here by enter / exit; tokens sent here by mistake go to governance
+    function sweep(address _token) external {
+        require(msg.sender == governance, "!governance");
+        IERC20(_token).safeTransfer(governance, IERC20(_token).balanceOf(address(this)));
+    }
+
+    function _route(address _strategy) internal view returns (Route memory r) {
+        IStrategyRoute s = IStrategyRoute(_strategy);
+        r.want = s.want();
+        r.basePool = s.basePool();
+        r.baseCoins = s.baseCoins();
+        r.baseIndex = uint256(s.baseIndex());
+        r.baseLp = s.baseLp();
+        r.metaPool = s.metaPool();
+        r.metaIndex = uint256(s.metaIndex());
+        r.metaLp = s.metaLp();
+    }
+
+    // quotes
+
+    // best path and the target LP it mints for `_amount` want
+    function quoteEnter(address _strategy, uint256 _amount) public view returns (uint256 path, uint256 lp) {
+        Route memory r = _route(_strategy);
+        lp = _quoteAddRoute(r, r.baseIndex, _amount);
+        if (r.metaPool != address(0)) {
+            uint256 coinOut = _quoteSwap(r.want, _coin(r.metaPool, 1 - r.metaIndex), _amount);
+            uint256 quoted = coinOut == 0 ? 0 : _quoteAddMeta(r, 1 - r.metaIndex, coinOut);
+            if (quoted > lp) {
+                (path, lp) = (META_COIN, quoted);
+            }
+        }
+        for (uint256 j = 0; j < r.baseCoins; j++) {
+            if (j == r.baseIndex) {
+                continue;
+            }
+            uint256 coinOut = _quoteSwap(r.want, _coin(r.basePool, j), _amount);
+            uint256 quoted = coinOut == 0 ? 0 : _quoteAddRoute(r, j, coinOut);
+            if (quoted > lp) {
+                (path, lp) = (BASE_COIN + j, quoted);
+            }
+        }
+    }
+
+    // best path and the want it returns for `_lp` target LP
+    function quoteExit(address _strategy, uint256 _lp) public view returns (uint256 path, uint256 out) {
+        Route memory r = _route(_strategy);
+        uint256 baseLpOut = _lp;
+        if (r.metaPool != address(0)) {
+            baseLpOut = ICurveAlt(r.metaPool).calc_withdraw_one_coin(_lp, int128(r.metaIndex));
+            uint256 coinOut = ICurveAlt(r.metaPool).calc_withdraw_one_coin(_lp, int128(1 - r.metaIndex));
+            out = _quoteSwap(_coin(r.metaPool, 1 - r.metaIndex), r.want, coinOut);
+            path = META_COIN;
+        }
+        uint256 quoted = ICurve(r.basePool).calc_withdraw_one_coin(baseLpOut, int128(r.baseIndex));
+        if (quoted >= out) {
+            (path, out) = (DIRECT, quoted);
+        }
+        for (uint256 j = 0; j < r.baseCoins; j++) {
+            if (j == r.baseIndex) {
+                continue;
+            }
+            uint256 coinOut = ICurve(r.basePool).calc_withdraw_one_coin(baseLpOut, int128(j));
+            quoted = _quoteSwap(_coin(r.basePool, j), r.want, coinOut);
+            if (quoted > out) {
+                (path, out) = (BASE_COIN + j, quoted);
+            }
+        }
+    }
+
+    // target LP for `_amount` of base coin `_i`, through the metapool when there is one
+    function _quoteAddRoute(Route memory r, uint256 _i, uint256 _amount) internal view returns (uint256) {
+        uint256 lp = _quoteAddBase(r, _i, _amount);
+        return r.metaPool == address(0) ? lp : _quoteAddMeta(r, r.metaIndex, lp);
+    }
+
+    function _quoteAddBase(Route memory r, uint256 _i, uint256 _amount) internal view returns (uint256) {
+        if (r.baseCoins == 3) {
+            uint256[3] memory amounts;
+            amounts[_i] = _amount;
+            return ICurve(r.basePool).calc_token_amount(amounts, true);
+        }
+        uint256[2] memory amounts;
+        amounts[_i] = _amount;
+        return ICurveAlt(r.basePool).calc_token_amount(amounts, true);
+    }
+
+    function _quoteAddMeta(Route memory r, uint256 _i, uint256 _amount) internal view returns (uint256) {
+        uint256[2] memory amounts;
+        amounts[_i] = _amount;
+        return ICurveAlt(r.metaPool).calc_token_amount(amounts, true);
+    }
+
+    // 0 when uniswap can't quote it
+    function _quoteSwap(address _from, address _to, uint256 _amount) internal view returns (uint256) {
+        // calls to an address without code revert past try / catch
+        if (_amount == 0 || !uniswap.isContract()) {
+            return 0;
+        }
+        address[] memory path = new address[](2);
+        path[0] = _from;
+        path[1] = _to;
+        try Uni(uniswap).getAmountsOut(_amount, path) returns (uint256[] memory amounts) {
+            return amounts[1];
+        } catch {
+            return 0;
+        }
+    }
+
+    // pools of either generation: coins(uint256) or coins(int128)
+    function _coin(address _pool, uint256 _i) internal view returns (address) {
+        (bool success, bytes memory ret) = _pool.staticcall(abi.encodeWithSignature("coins(uint256)", _i));
+        if (!success) {
+            (success, ret) = _pool.staticcall(abi.encodeWithSignature("coins(int128)", int128(_i)));
+        }
+        require(success, "!coins");
+        return abi.decode(ret, (address));
+    }
+
+    // execution
+
+    function enter(uint256 _amount, uint256 _minLp) external returns (uint256 lp) {
+        require(strategies[msg.sender], "!strategy");
+        Route memory r = _route(msg.sender);
+        (uint256 path, uint256 quoted) = quoteEnter(msg.sender, _amount);
+        require(quoted >= _minLp, "!minLp");
+        IERC20(r.want).safeTransferFrom(msg.sender, address(this), _amount);
+
+        if (path == META_COIN) {
+            uint256 i = 1 - r.metaIndex;
+            address coin = _coin(r.metaPool, i);
+            uint256 coinOut = _swap(r.want, coin, _amount, _hopMin(_quoteSwap(r.want, coin, _amount), _minLp, quoted));
+            lp = _addMeta(r, i, coin, coinOut, _minLp);
+        } else {
+            uint256 i = path == DIRECT ? r.baseIndex : path - BASE_COIN;
+            address coin = _coin(r.basePool, i);
+            uint256 amount = _amount;
+            if (path != DIRECT) {
+                amount = _swap(r.want, coin, _amount, _hopMin(_quoteSwap(r.want, coin, _amount), _minLp, quoted));
+            }
+            if (r.metaPool == address(0)) {
+                lp = _addBase(r, i, coin, amount, _minLp);
+            } else {
+                uint256 baseLp = _addBase(r, i, coin, amount, _hopMin(_quoteAddBase(r, i, amount), _minLp, quoted));
+                lp = _addMeta(r, r.metaIndex, r.baseLp, baseLp, _minLp);
+            }
+        }
+
+        require(lp >= _minLp, "!minLp");
+        IERC20(r.metaPool == address(0) ? r.baseLp : r.metaLp).safeTransfer(msg.sender, lp);
+    }
+
+    function exit(uint256 _lp, uint256 _minOut) external returns (uint256 out) {
+        require(strategies[msg.sender], "!strategy");
+        Route memory r = _route(msg.sender);
+        (uint256 path, uint256 quoted) = quoteExit(msg.sender, _lp);
+        require(quoted >= _minOut, "!minOut");
+        IERC20(r.metaPool == address(0) ? r.baseLp : r.metaLp).safeTransferFrom(msg.sender, address(this), _lp);
+
+        if (path == META_COIN) {
+            uint256 i = 1 - r.metaIndex;
+            address coin = _coin(r.metaPool, i);
+            uint256 coinMin = _hopMin(ICurveAlt(r.metaPool).calc_withdraw_one_coin(_lp, int128(i)), _minOut, quoted);
+            out = _swap(coin, r.want, _removeMeta(r, _lp, i, coin, coinMin), _minOut);
+        } else {
+            uint256 baseLpAmount = _lp;
+            if (r.metaPool != address(0)) {
+                uint256 baseLpMin = _hopMin(
+                    ICurveAlt(r.metaPool).calc_withdraw_one_coin(_lp, int128(r.metaIndex)), _minOut, quoted
+                );
+                baseLpAmount = _removeMeta(r, _lp, r.metaIndex, r.baseLp, baseLpMin);
+            }
+            if (path == DIRECT) {
+                out = _removeBase(r, baseLpAmount, r.baseIndex, r.want, _minOut);
+            } else {
+                uint256 j = path - BASE_COIN;
+                address coin = _coin(r.basePool, j);
+                uint256 coinMin = _hopMin(ICurve(r.basePool).calc_withdraw_one_coin(baseLpAmount, int128(j)), _minOut, quoted);
+                out = _swap(coin, r.want, _removeBase(r, baseLpAmount, j, coin, coinMin), _minOut);
+            }
+        }
+
+        require(out >= _minOut, "!minOut");
+        IERC20(r.want).safeTransfer(msg.sender, out);
+    }
+
+    // minimum of a hop quoted `_quote`: the caller's tolerance `_min` of the path's `_quoted`
+    function _hopMin(uint256 _quote, uint256 _min, uint256 _quoted) internal pure returns (uint256) {
+        if (_min == 0) {
+            return 0;
+        }
+        return _quote.mul(_min).div(_quoted);
+    }
+
+    // each hop returns what it produced, measured on the router's balance
+
+    function _addBase(Route memory r, uint256 _i, address _token, uint256 _amount, uint256 _min) internal returns (uint256) {
+        uint256 before = IERC20(r.baseLp).balanceOf(address(this));
+        _approve(_token, r.basePool, _amount);
+        if (r.baseCoins == 3) {
+            uint256[3] memory amounts;
+            amounts[_i] = _amount;
+            ICurve(r.basePool).add_liquidity(amounts, _min);
+        } else {
+            uint256[2] memory amounts;
+            amounts[_i] = _amount;
+            ICurveAlt(r.basePool).add_liquidity(amounts, _min);
+        }
+        return IERC20(r.baseLp).balanceOf(address(this)).sub(before);
+    }
+
+    function _addMeta(Route memory r, uint256 _i, address _token, uint256 _amount, uint256 _min) internal returns (uint256) {
+        uint256 before = IERC20(r.metaLp).balanceOf(address(this));
+        _approve(_token, r.metaPool, _amount);
+        uint256[2] memory amounts;
+        amounts[_i] = _amount;
+        ICurveAlt(r.metaPool).add_liquidity(amounts, _min);
+        return IERC20(r.metaLp).balanceOf(address(this)).sub(before);
+    }
+
+    function _removeBase(Route memory r, uint256 _lp, uint256 _j, address _token, uint256 _min) internal returns (uint256) {
+        uint256 before = IERC20(_token).balanceOf(address(this));
+        ICurve(r.basePool).remove_liquidity_one_coin(_lp, int128(_j), _min);
+        return IERC20(_token).balanceOf(address(this)).sub(before);
+    }
+
+    function _removeMeta(Route memory r, uint256 _lp, uint256 _i, address _token, uint256 _min) internal returns (uint256) {
+        uint256 before = IERC20(_token).balanceOf(address(this));
+        ICurveAlt(r.metaPool).remove_liquidity_one_coin(_lp, int128(_i), _min);
+        return IERC20(_token).balanceOf(address(this)).sub(before);
+    }
+
+    function _swap(address _from, address _to, uint256 _amount, uint256 _min) internal returns (uint256) {
+        uint256 before = IERC20(_to).balanceOf(address(this));
+        _approve(_from, uniswap, _amount);
+        address[] memory path = new address[](2);
+        path[0] = _from;
+        path[1] = _to;
+        Uni(uniswap).swapExactTokensForTokens(_amount, _min, path, address(this), now);
+        return IERC20(_to).balanceOf(address(this)).sub(before);
+    }
+
+    function _approve(address _token, address _spender, uint256 _amount) internal {
+        uint256 allowance = IERC20(_token).allowance(address(this), _spender);
+        if (allowance < _amount) {
+            // USDT only approves from 0
+            if (allowance > 0) {
+                IERC20(_token).safeApprove(_spender, 0);
+            }
+            IERC20(_token).safeApprove(_spender, uint256(-1));
+        }
+    }
+}
@@ -0,0 +1,106 @@
+// SPDX-License-Identifier: MIT
+
+pragma experimental ABIEncoderV2;
+pragma solidity 0.6.12;
+
+import "./StrategyCurveLP.sol";
+import "../../interfaces/curve/IGauge.sol";
+import "../../interfaces/curve/IMinter.sol";
+
+// StrategyCurveLP staking the last LP token in its Curve gauge (Route.targetVault)
+// instead of a v1 yVault: no wrapper strategy or withdrawal fee between the strategy
+// and the LP. The CRV the gauge accrues is minted on harvest and sold for want
+// through priceRouter (CRV -> WETH -> want), which makes it profit.
+contract StrategyCurveGauge is StrategyCurveLP {
+    address public immutable minter;
+    address public immutable crv;
+
+    // least want (in want units) per 1e18 CRV a sale has to get, kept by keepers at an
+    // off-chain price so a sandwich moving the pairs before the harvest fails the sale
+    uint256 public minWantPerCrv;
+
+    constructor(
+        address _vault,
+        Route memory _route,
+        address _minter,
+        string memory _name
+    ) public StrategyCurveLP(_vault, _route, _name) {
+        minter = _minter;
+        crv = IMinter(_minter).token();
+    }
+
+    function protectedTokens() internal override view returns (address[] memory) {
+        address[] memory route = super.protectedTokens();
+        address[] memory protected = new address[](route.length + 1);
+        for (uint256 i = 0; i < route.length; i++) {
+            protected[i] = route[i];
+        }
+        protected[route.length] = crv;
+        return protected;
+    }
+
+    // gauge balances are LP, 1:1
+    function _pricePerShare() internal override view returns (uint256) {
+        return 1e18;
+    }
+
+    // LP handed over by a migration earns nothing until it is staked
+    function _stakeHeld() internal override {
+        _stake();
+    }
+
+    function _claimRewards() internal override {
+        IMinter(minter).mint(targetVault);
+        uint256 _crv = IERC20(crv).balanceOf(address(this));
+        if (_crv == 0 || !priceRouter.isContract()) {
+            return;
+        }
+        address[] memory path = new address[](3);
+        path[0] = crv;
+        path[1] = weth;
+        path[2] = address(want);
+        uint256 _floor = _crv.mul(minWantPerCrv).div(1e18);
+        // the quote less slip bounds how far the swap itself moves the pairs
+        try Uni(priceRouter).getAmountsOut(_crv, path) returns (uint256[] memory amounts) {
+            uint256 _quoted = _minOut(amounts[2]);
+            if (_quoted > _floor) {
+                _floor = _quoted;
+            }
+        } catch {
+            return;
+        }
+        IERC20(crv).safeApprove(priceRouter, _crv);
+        // a sale that fails (dust, no liquidity, below the floor) keeps the CRV for
+        // the next harvest
+        try Uni(priceRouter).swapExactTokensForTokens(_crv, _floor, path, address(this), now) {
+        } catch {
+            IERC20(crv).safeApprove(priceRouter, 0);
+        }
+    }
+
+    function setMinWantPerCrv(uint256 _minWantPerCrv) external {
+        require(msg.sender == keeper || msg.sender == strategist || msg.sender == governance(), "!authorized");
+        minWantPerCrv = _minWantPerCrv;
+    }
+
+    function _stake() internal override {
+        uint256 _lp = IERC20(lpToken()).balanceOf(address(this));
+        if (_lp > 0) {
+            IGauge(targetVault).deposit(_lp);
+        }
+    }
+
+    function _unstake(uint256 _lp) internal override {
+        IGauge(targetVault).withdraw(_lp);
+    }
+
+    // gauge deposits don't transfer: unstake, the LP goes with the other LP tokens
+    function _migrateStake(address _newStrategy) internal override {
+        uint256 _staked = IGauge(targetVault).balanceOf(address(this));
+        if (_staked > 0) {
+            IGauge(targetVault).withdraw(_staked);
+        }
+        IMinter(minter).mint(targetVault);
+        IERC20(crv).safeTransfer(_newStrategy, IERC20(crv).balanceOf(address(this)));
+    }
+}
@@ -0,0 +1,599 @@
+// SPDX-License-Identifier: MIT
+
+pragma experimental ABIEncoderV2;
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/math/Math.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import {BaseStrategy, StrategyParams} from "@yearnvaults/contracts/BaseStrategy.sol";
+
+import "../../interfaces/curve/ICurve.sol";
+import "../../interfaces/curve/ICurveAlt.sol";
+import "../../interfaces/curve/ICurveRouter.sol";
+import "../../interfaces/uniswap/Uni.sol";
+import "../../interfaces/yearn/Vault.sol";
+
+// Single sided Curve LP strategy: want -> base pool (coin baseIndex) -> optional
+// metapool (base LP at metaIndex) -> v1 yVault of the last LP token.
+// Deploy it directly for a new leg, or through one of the named strategies.
+contract StrategyCurveLP is BaseStrategy {
+    using SafeERC20 for IERC20;
+    using Address for address;
+    using SafeMath for uint256;
+
+    struct Route {
+        address basePool;
+        // 2 or 3 coin pool
+        uint256 baseCoins;
+        int128 baseIndex;
+        address baseLp;
+        // address(0) when the base LP goes straight into the target vault
+        address metaPool;
+        int128 metaIndex;
+        address metaLp;
+        // vault which is deposited into for yield
+        address targetVault;
+    }
+
+    address public immutable basePool;
+    uint256 public immutable baseCoins;
+    int128 public immutable baseIndex;
+    address public immutable baseLp;
+    address public immutable metaPool;
+    int128 public immutable metaIndex;
+    address public immutable metaLp;
+    address public immutable targetVault;
+    // want amount * wantScale = 18 decimals amount
+    uint256 public immutable wantScale;
+
+    // adding protection against slippage attacks
+    uint constant public DENOMINATOR = 10000;
+    // tunables are packed into BaseStrategy's last slot (next to emergencyExit),
+    // so reading them in harvest costs no extra SLOAD. Keep new ones small.
+    uint16 public slip = 100;
+    // max price impact (bps, against the virtual price) of one withdrawal. Above it
+    // `_withdrawSome` halves the amount until it fits and leaves the rest invested
+    // for later withdrawals. DENOMINATOR turns it off.
+    uint16 public maxImpact = uint16(DENOMINATOR);
+    // bps of the strategy's debt kept as want. Profits are reported out of it and the
+    // vault's credit refills it, so a harvest with an unchanged debt ratio doesn't
+    // exit and re-enter the pools. 0 invests everything.
+    uint16 public wantFloat = 0;
+    // min amounts from the pools' own quotes (calc_token_amount / calc_withdraw_one_coin)
+    // less `slip`, instead of the virtual price value less `slip` on deposits and no
+    // minimum on withdrawals. Quotes follow the pool's current state: deposits into
+    // imbalanced pools go through, but a pool moved earlier in the block is not caught.
+    bool public quoteSlippage = false;
+    // want below this stays in the strategy until inflows add up to it, so a small
+    // deposit doesn't pay for a full add_liquidity / depositAll route on its own.
+    // It still counts in estimatedTotalAssets (balanceOfWant).
+    uint128 public minInvest = 0;
+    // halvings tried before giving up on a withdrawal for now
+    uint256 constant public MAX_PROBES = 8;
+
+    string internal strategyName;
+
+    // Uniswap v2 router valuing want in ETH for harvestTrigger. address(0) takes the
+    // keeper's callCost in want, as BaseStrategy does.
+    address public priceRouter = 0x7a250d5630B4cF539739dF2C5dAcD4c659F2488D;
+    address constant public weth = 0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2;
+
+    // entry / exit router picking the best of several paths between want and the target
+    // LP (contracts/CurveRouter.sol). address(0) goes through the route's pools directly.
+    address public router;
+
+    // oracle reads, taken once per harvest / withdrawal and threaded through.
+    // each one is an external call doing a full StableSwap invariant computation.
+    struct Prices {
+        uint256 baseVirtualPrice;
+        // 0 without a metapool
+        uint256 metaVirtualPrice;
+        uint256 pricePerShare;
+    }
+
+    constructor(
+        address _vault, // vault is v2, address is 0xBFa4D8AA6d8a379aBFe7793399D3DdaCC5bBECBB
+        Route memory _route,
+        string memory _name
+    ) public BaseStrategy(_vault) {
+        require(_route.baseCoins == 2 || _route.baseCoins == 3, "!coins");
+        require(uint256(_route.baseIndex) < _route.baseCoins, "!index");
+        require(_route.metaPool == address(0) || uint256(_route.metaIndex) < 2, "!index");
+
+        basePool = _route.basePool;
+        baseCoins = _route.baseCoins;
+        baseIndex = _route.baseIndex;
+        baseLp = _route.baseLp;
+        metaPool = _route.metaPool;
+        metaIndex = _route.metaIndex;
+        metaLp = _route.metaLp;
+        targetVault = _route.targetVault;
+        uint8 decimals = ERC20(address(want)).decimals();
+        require(decimals <= 18, "!decimals");
+        wantScale = 10 ** uint256(18 - decimals);
+        strategyName = _name;
+
+        // immutables can't be read before construction finishes
+        want.safeApprove(_route.basePool, uint256(-1));
+        if (_route.metaPool == address(0)) {
+            IERC20(_route.baseLp).safeApprove(_route.targetVault, uint256(-1));
+        } else {
+            IERC20(_route.baseLp).safeApprove(_route.metaPool, uint256(-1));
+            IERC20(_route.metaLp).safeApprove(_route.targetVault, uint256(-1));
+        }
+    }
+
+    function name() external override view returns (string memory) {
+        return strategyName;
+    }
+
+    // LP token held by the target vault
+    function lpToken() public view returns (address) {
+        return metaPool == address(0) ? baseLp : metaLp;
+    }
+
+    function protectedTokens() internal virtual override view returns (address[] memory) {
+        address[] memory protected = new address[](metaPool == address(0) ? 2 : 3);
+        // want is already protected by default
+        protected[0] = targetVault;
+        protected[1] = baseLp;
+        if (metaPool != address(0)) {
+            protected[2] = metaLp;
+        }
+        return protected;
+    }
+
+    // returns sum of all assets, realized and unrealized
+    function estimatedTotalAssets() public override view returns (uint256) {
+        return _estimatedTotalAssets(_prices());
+    }
+
+    function _estimatedTotalAssets(Prices memory _p) internal view returns (uint256) {
+        return balanceOfWant().add(_balanceOfPool(_balanceOfStake(_p.pricePerShare), _p));
+    }
+
+    function _prices() internal view returns (Prices memory _p) {
+        _p.baseVirtualPrice = ICurve(basePool).get_virtual_price();
+        if (metaPool != address(0)) {
+            _p.metaVirtualPrice = ICurve(metaPool).get_virtual_price();
+        }
+        _p.pricePerShare = _pricePerShare();
+    }
+
+    // target LP per target vault share (1e18)
+    function _pricePerShare() internal virtual view returns (uint256) {
+        return Vault(targetVault).getPricePerFullShare();
+    }
+
+    // virtual price of the LP token held by the target vault
+    function _lpPrice(Prices memory _p) internal view returns (uint256) {
+        return metaPool == address(0) ? _p.baseVirtualPrice : _p.metaVirtualPrice;
+    }
+
+    // true when a harvest pays for itself: the gain it realizes, the idle want it
+    // invests, the vault's credit and the debt it repays, valued in ETH, exceed
+    // profitFactor times `callCost` (wei). A loss or debt outstanding beyond
+    // debtThreshold, or maxReportDelay passing, also trigger, as in BaseStrategy.
+    function harvestTrigger(uint256 callCost) public override view returns (bool) {
+        StrategyParams memory params = vault.strategies(address(this));
+        if (params.activation == 0) return false;
+        if (block.timestamp.sub(params.lastReport) >= maxReportDelay) return true;
+
+        uint256 total = estimatedTotalAssets();
+        if (total.add(debtThreshold) < params.totalDebt) return true;
+
+        uint256 outstanding = vault.debtOutstanding();
+        if (outstanding > debtThreshold) return true;
+        uint256 value = vault.creditAvailable().add(outstanding).add(_idleWant(outstanding, params.totalDebt));
+        if (total > params.totalDebt) {
+            value = value.add(total.sub(params.totalDebt));
+        }
+        return profitFactor.mul(callCost) < _wantToEth(value);
+    }
+
+    // want the next harvest would invest, see adjustPosition
+    function _idleWant(uint256 _outstanding, uint256 _totalDebt) internal view returns (uint256 _idle) {
+        uint256 _reserved = _outstanding.add(_totalDebt.mul(wantFloat).div(DENOMINATOR));
+        uint256 _wantBalance = balanceOfWant();
+        if (_wantBalance > _reserved) {
+            _idle = _wantBalance - _reserved;
+        }
+        if (_idle < minInvest) {
+            _idle = 0;
+        }
+    }
+
+    // `_amount` of want in ETH (wei) at the router's price, 0 when it can't be priced
+    function _wantToEth(uint256 _amount) internal view returns (uint256) {
+        if (_amount == 0 || priceRouter == address(0) || address(want) == weth) {
+            return _amount;
+        }
+        // calls to an address without code revert past try / catch
+        if (!priceRouter.isContract()) {
+            return 0;
+        }
+        address[] memory path = new address[](2);
+        path[0] = address(want);
+        path[1] = weth;
+        try Uni(priceRouter).getAmountsOut(_amount, path) returns (uint256[] memory amounts) {
+            return amounts[1];
+        } catch {
+            return 0;
+        }
+    }
+
+    function prepareReturn(uint256 _debtOutstanding) internal override returns (uint256 _profit, uint256 _loss, uint256 _debtPayment) {
+        _claimRewards();
+        Prices memory _p = _prices();
+
+        // We might need to return want to the vault
+        if (_debtOutstanding > 0) {
+            uint256 _amountFreed = 0;
+            (_amountFreed, _loss) = _liquidatePosition(_debtOutstanding, _p);
+            _debtPayment = Math.min(_amountFreed, _debtOutstanding);
+        }
+
+        // harvest() will track profit by estimated total assets compared to debt.
+        uint256 debt = vault.strategies(address(this)).totalDebt;
+        uint256 currentValue = _estimatedTotalAssets(_p);
+
+        if (currentValue > debt) {
+            _profit = currentValue.sub(debt);
+        }
+
+        //Funds stay in target vault if not performing debt repayment.
+        if (debt > currentValue) {
+            _loss = debt.sub(currentValue);
+        }
+
+        uint256 wantBalance = balanceOfWant();
+        uint256 toFree = _debtPayment.add(_profit);
+
+        if (toFree > wantBalance) {
+            toFree = toFree.sub(wantBalance);
+
+            (, uint256 withdrawalLoss, ) = _withdrawSome(toFree, _p);
+
+            //when we withdraw we can lose money in the withdrawal
+            if (withdrawalLoss < _profit) {
+                _profit = _profit.sub(withdrawalLoss);
+            } else {
+                _loss = _loss.add(withdrawalLoss.sub(_profit));
+                _profit = 0;
+            }
+
+            wantBalance = balanceOfWant();
+
+            if (wantBalance < _profit) {
+                _profit = wantBalance;
+                _debtPayment = 0;
+            } else if (wantBalance < _debtPayment.add(_profit)) {
+                _debtPayment = wantBalance.sub(_profit);
+            }
+        }
+    }
+
+    function adjustPosition(uint256 _debtOutstanding) internal override {
+        //emergency exit is dealt with in prepareReturn
+        if (emergencyExit) {
+            return;
+        }
+
+        uint256 _wantAvailable = _investable(_debtOutstanding);
+        if (_wantAvailable == 0) {
+            _stakeHeld();
+            return;
+        }
+
+        // slippage protection on deposit, against the virtual price or the pool's quote
+        bool quoted = quoteSlippage;
+        if (router != address(0)) {
+            _routerEnter(_wantAvailable, quoted);
+            _stake();
+            return;
+        }
+        uint256 baseVirtualPrice = quoted ? 0 : ICurve(basePool).get_virtual_price();
+        _addLiquidity(_wantAvailable, quoted, baseVirtualPrice);
+
+        if (metaPool != address(0)) {
+            uint256 baseLpBalance = IERC20(baseLp).balanceOf(address(this));
+            uint256[2] memory amounts;
+            amounts[uint256(metaIndex)] = baseLpBalance;
+            uint256 v = quoted
+                ? ICurveAlt(metaPool).calc_token_amount(amounts, true)
+                : baseLpBalance.mul(baseVirtualPrice).div(ICurve(metaPool).get_virtual_price());
+            ICurveAlt(metaPool).add_liquidity(amounts, _minOut(v));
+        }
+        _stake();
+    }
+
+    // want a harvest invests: the balance less the debt outstanding and the float,
+    // 0 below minInvest
+    function _investable(uint256 _debtOutstanding) internal view returns (uint256) {
+        // do not invest if we have more debt than want
+        uint256 _wantBalance = balanceOfWant();
+        if (_debtOutstanding >= _wantBalance) {
+            return 0;
+        }
+
+        // Invest the rest of the want, less the float
+        uint256 _wantAvailable = _wantBalance.sub(_debtOutstanding);
+        if (wantFloat > 0) {
+            uint256 _float = vault.strategies(address(this)).totalDebt.mul(wantFloat).div(DENOMINATOR);
+            if (_wantAvailable <= _float) {
+                return 0;
+            }
+            _wantAvailable = _wantAvailable.sub(_float);
+        }
+        return _wantAvailable < minInvest ? 0 : _wantAvailable;
+    }
+
+    function _routerEnter(uint256 _amount, bool _quoted) internal {
+        uint256 v;
+        if (_quoted) {
+            (, v) = ICurveRouter(router).quoteEnter(address(this), _amount);
+        } else {
+            // target LP worth `_amount` at its virtual price
+            address lastPool = metaPool == address(0) ? basePool : metaPool;
+            v = _amount.mul(wantScale).mul(1e18).div(ICurve(lastPool).get_virtual_price());
+        }
+        ICurveRouter(router).enter(_amount, _minOut(v));
+    }
+
+    // rewards of the position beyond the target vault's price per share, into want.
+    // Called before harvest accounting, so what they fetch is reported as profit.
+    function _claimRewards() internal virtual {}
+
+    // put all target LP held into the target vault
+    function _stake() internal virtual {
+        Vault(targetVault).depositAll();
+    }
+
+    // target LP held on a harvest that invests nothing, e.g. handed over by a
+    // migration. The target vault takes it along with the next investment.
+    function _stakeHeld() internal virtual {}
+
+    function _unstake(uint256 _shares) internal virtual {
+        Vault(targetVault).withdraw(_shares);
+    }
+
+    function _addLiquidity(uint256 _amount, bool _quoted, uint256 _baseVirtualPrice) internal {
+        // base LP worth `_amount` at the virtual price
+        uint256 v = _quoted ? 0 : _amount.mul(wantScale).mul(1e18).div(_baseVirtualPrice);
+        if (baseCoins == 3) {
+            uint256[3] memory amounts;
+            amounts[uint256(baseIndex)] = _amount;
+            if (_quoted) {
+                v = ICurve(basePool).calc_token_amount(amounts, true);
+            }
+            ICurve(basePool).add_liquidity(amounts, _minOut(v));
+        } else {
+            uint256[2] memory amounts;
+            amounts[uint256(baseIndex)] = _amount;
+            if (_quoted) {
+                v = ICurveAlt(basePool).calc_token_amount(amounts, true);
+            }
+            ICurveAlt(basePool).add_liquidity(amounts, _minOut(v));
+        }
+    }
+
+    function _minOut(uint256 _expected) internal view returns (uint256) {
+        return _expected.mul(DENOMINATOR.sub(slip)).div(DENOMINATOR);
+    }
+
+    //v0.3.0 - liquidatePosition is emergency exit. Supplants exitPosition
+    function liquidatePosition(uint256 _amountNeeded) internal override returns (uint256 _liquidatedAmount, uint256 _loss) {
+        return _liquidatePosition(_amountNeeded, _prices());
+    }
+
+    function _liquidatePosition(uint256 _amountNeeded, Prices memory _p) internal returns (uint256 _liquidatedAmount, uint256 _loss) {
+        uint256 balanceOfWant = balanceOfWant();
+        if (balanceOfWant < _amountNeeded) {
+            // We need to withdraw to get back more want
+            (, , uint256 deferred) = _withdrawSome(_amountNeeded.sub(balanceOfWant), _p);
+            // what maxImpact held back is still invested, not lost
+            _amountNeeded = _amountNeeded.sub(deferred);
+            balanceOfWant = balanceOfWant();
+        }
+
+        if (balanceOfWant >= _amountNeeded) {
+            _liquidatedAmount = _amountNeeded;
+        } else {
+            _liquidatedAmount = balanceOfWant;
+            _loss = _amountNeeded.sub(balanceOfWant);
+        }
+    }
+
+    // withdraw `_amount` want worth of LP from the target vault and unwind the route.
+    // `_deferred` is the part of `_amount` left invested to stay within maxImpact.
+    function _withdrawSome(uint256 _amount, Prices memory _p) internal returns (uint256 _liquidatedAmount, uint256 _loss, uint256 _deferred) {
+        uint256 balanceBefore = balanceOfWant();
+        uint256 lpPrice = _lpPrice(_p);
+        uint256 lpNeeded = _amount.mul(wantScale).mul(1e18).div(lpPrice);
+        uint256 lpIdle = IERC20(lpToken()).balanceOf(address(this));
+
+        if (maxImpact < DENOMINATOR) {
+            // LP we have is what gets probed; a shortfall beyond it is still a loss
+            uint256 lpAvailable = Math.min(lpNeeded, lpIdle.add(_balanceOfStake(_p.pricePerShare)));
+            uint256 lpHeldBack = lpAvailable.sub(_tranche(lpAvailable, lpPrice));
+            if (lpHeldBack > 0) {
+                _deferred = Math.min(lpHeldBack.mul(lpPrice).div(1e18).div(wantScale), _amount);
+                _amount = _amount.sub(_deferred);
+                lpNeeded = lpNeeded.sub(lpHeldBack);
+            }
+        }
+
+        if (lpNeeded > lpIdle) {
+            uint256 shares = lpNeeded.sub(lpIdle).mul(1e18).div(_p.pricePerShare);
+            shares = Math.min(shares, IERC20(targetVault).balanceOf(address(this)));
+            if (shares > 0) {
+                _unstake(shares);
+            }
+        }
+
+        // slippage protection is at vault-level, unless quoteSlippage is on. Router exits
+        // are bounded by the virtual price
+        if (router != address(0)) {
+            _routerExit(lpPrice);
+        } else if (metaPool != address(0)) {
+            uint256 metaLpBalance = IERC20(metaLp).balanceOf(address(this));
+            if (metaLpBalance > 0) {
+                uint256 minOut = quoteSlippage ? _minOut(ICurveAlt(metaPool).calc_withdraw_one_coin(metaLpBalance, metaIndex)) : 0;
+                ICurveAlt(metaPool).remove_liquidity_one_coin(metaLpBalance, metaIndex, minOut);
+            }
+        }
+        uint256 baseLpBalance = IERC20(baseLp).balanceOf(address(this));
+        if (baseLpBalance > 0) {
+            uint256 minOut = quoteSlippage ? _minOut(ICurve(basePool).calc_withdraw_one_coin(baseLpBalance, baseIndex)) : 0;
+            ICurve(basePool).remove_liquidity_one_coin(baseLpBalance, baseIndex, minOut);
+        }
+
+        uint256 freed = balanceOfWant().sub(balanceBefore);
+        if (freed >= _amount) {
+            _liquidatedAmount = _amount;
+        } else {
+            _liquidatedAmount = freed;
+            _loss = _amount.sub(freed);
+        }
+    }
+
+    // all target LP held out to want through the router, at least its value at the
+    // virtual price less `slip`: a quote read in the same block moves with the pools
+    function _routerExit(uint256 _lpPrice) internal {
+        uint256 lpBalance = IERC20(lpToken()).balanceOf(address(this));
+        if (lpBalance == 0) {
+            return;
+        }
+        uint256 value = lpBalance.mul(_lpPrice).div(1e18).div(wantScale);
+        ICurveRouter(router).exit(lpBalance, _minOut(value));
+    }
+
+    // largest of `_lp`, `_lp / 2`, `_lp / 4`, ... target LP whose withdrawal stays within maxImpact
+    function _tranche(uint256 _lp, uint256 _lpPrice) internal view returns (uint256) {
+        for (uint256 i = 0; i < MAX_PROBES; i++) {
+            if (_lp == 0 || _withdrawImpact(_lp, _lpPrice) <= maxImpact) {
+                return _lp;
+            }
+            _lp = _lp / 2;
+        }
+        return 0;
+    }
+
+    // bps of value lost taking `_lp` target LP out to want, against the virtual price
+    function _withdrawImpact(uint256 _lp, uint256 _lpPrice) internal view returns (uint256) {
+        uint256 value = _lp.mul(_lpPrice).div(1e18).div(wantScale);
+        if (value == 0) {
+            return 0;
+        }
+        uint256 out = _lp;
+        if (metaPool != address(0)) {
+            out = ICurveAlt(metaPool).calc_withdraw_one_coin(out, metaIndex);
+        }
+        out = ICurve(basePool).calc_withdraw_one_coin(out, baseIndex);
+        return out >= value ? 0 : value.sub(out).mul(DENOMINATOR).div(value);
+    }
+
+    // price impact (bps) of withdrawing `_amount` want in one go
+    function withdrawImpact(uint256 _amount) external view returns (uint256) {
+        uint256 lpPrice = _lpPrice(_prices());
+        return _withdrawImpact(_amount.mul(wantScale).mul(1e18).div(lpPrice), lpPrice);
+    }
+
+    // it looks like this function transfers not just "want" tokens, but all tokens
+    function prepareMigration(address _newStrategy) internal override {
+        // want is transferred by the base contract's migrate function
+        _migrateStake(_newStrategy);
+        IERC20(baseLp).safeTransfer(_newStrategy, IERC20(baseLp).balanceOf(address(this)));
+        if (metaPool != address(0)) {
+            IERC20(metaLp).safeTransfer(_newStrategy, IERC20(metaLp).balanceOf(address(this)));
+        }
+    }
+
+    // hand the staked position over, before the LP tokens held are transferred
+    function _migrateStake(address _newStrategy) internal virtual {
+        IERC20(targetVault).safeTransfer(_newStrategy, IERC20(targetVault).balanceOf(address(this)));
+    }
+
+    // returns value of the LP tokens held plus `extra` target LP tokens, in want
+    function balanceOfPool(uint256 extra) public view returns (uint256) {
+        return _balanceOfPool(extra, _prices());
+    }
+
+    function _balanceOfPool(uint256 extra, Prices memory _p) internal view returns (uint256) {
+        //get_virtual_price returns 1e18
+        uint256 value = IERC20(baseLp).balanceOf(address(this)).mul(_p.baseVirtualPrice);
+        if (metaPool != address(0)) {
+            value = value.add(extra.add(IERC20(metaLp).balanceOf(address(this))).mul(_p.metaVirtualPrice));
+        } else {
+            value = value.add(extra.mul(_p.baseVirtualPrice));
+        }
+        return value.div(1e18).div(wantScale);
+    }
+
+    // returns amount of target LP tokens in the target vault
+    function balanceOfStake() public view returns (uint256) {
+        return _balanceOfStake(_pricePerShare());
+    }
+
+    function _balanceOfStake(uint256 ratio) internal view returns (uint256) {
+        uint256 _balance = IERC20(targetVault).balanceOf(address(this));
+        return (_balance).mul(ratio).div(1e18); //getPricePerFullShare returns 1e18
+    }
+
+    // returns balance of want
+    function balanceOfWant() public view returns (uint256) {
+        return want.balanceOf(address(this));
+    }
+
+    function setSlip(uint _slip) external {
+        require(msg.sender == strategist || msg.sender == governance(), "!sg");
+        require(_slip <= DENOMINATOR, "!slip");
+        slip = uint16(_slip);
+    }
+
+    function setPriceRouter(address _priceRouter) external {
+        require(msg.sender == strategist || msg.sender == governance(), "!sg");
+        priceRouter = _priceRouter;
+    }
+
+    // the router moves the strategy's want and LP: governance only
+    function setRouter(address _router) external onlyGovernance {
+        if (router != address(0)) {
+            want.safeApprove(router, 0);
+            IERC20(lpToken()).safeApprove(router, 0);
+        }
+        if (_router != address(0)) {
+            want.safeApprove(_router, uint256(-1));
+            IERC20(lpToken()).safeApprove(_router, uint256(-1));
+        }
+        router = _router;
+    }
+
+    function setQuoteSlippage(bool _quoteSlippage) external {
+        require(msg.sender == strategist || msg.sender == governance(), "!sg");
+        quoteSlippage = _quoteSlippage;
+    }
+
+    function setMinInvest(uint _minInvest) external {
+        require(msg.sender == strategist || msg.sender == governance(), "!sg");
+        require(_minInvest <= uint128(-1), "!minInvest");
+        minInvest = uint128(_minInvest);
+    }
+
+    function setWantFloat(uint _wantFloat) external {
+        require(msg.sender == strategist || msg.sender == governance(), "!sg");
+        require(_wantFloat <= DENOMINATOR, "!float");
+        wantFloat = uint16(_wantFloat);
+    }
+
+    function setMaxImpact(uint _maxImpact) external {
+        require(msg.sender == strategist || msg.sender == governance(), "!sg");
+        require(_maxImpact <= DENOMINATOR, "!impact");
+        maxImpact = uint16(_maxImpact);
+    }
+
+}
@@ -0,0 +1,393 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./MockERC20.sol";
+
+
+interface IBasePool {
+    function get_virtual_price() external view returns (uint256);
+}
+
+
+// StableSwap stand-in for the local (non-fork) stack. Ports the invariant math of
+// curve's 3pool / metapool vyper contracts so deposits and withdrawals see realistic
+// price impact. Admin fees and A ramping are not modelled.
+abstract contract MockCurvePoolBase {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 constant public FEE_DENOMINATOR = 1e10;
+    uint256 constant public PRECISION = 1e18;
+
+    address[] public coins;
+    uint256[] public balances;
+    address public lp_token;
+    // metapools: the last coin is the base pool's LP token, priced at its virtual price
+    address public base_pool;
+    uint256 public A;
+    uint256 public fee;
+    address public owner;
+
+    // 10 ** (36 - decimals) for every coin
+    uint256[] internal rates;
+
+    constructor(
+        address[] memory _coins,
+        address _lp_token,
+        uint256 _A,
+        uint256 _fee,
+        address _base_pool
+    ) public {
+        for (uint256 i = 0; i < _coins.length; i++) {
+            coins.push(_coins[i]);
+            balances.push(0);
+            rates.push(10 ** (36 - uint256(MockERC20(_coins[i]).decimals())));
+        }
+        lp_token = _lp_token;
+        A = _A;
+        fee = _fee;
+        base_pool = _base_pool;
+        owner = msg.sender;
+    }
+
+    function set_A(uint256 _A) external {
+        require(msg.sender == owner, "!owner");
+        A = _A;
+    }
+
+    function set_fee(uint256 _fee) external {
+        require(msg.sender == owner, "!owner");
+        fee = _fee;
+    }
+
+    function get_virtual_price() external view returns (uint256) {
+        uint256 D = _getD(_xp(_storedRates(), balances), A);
+        return D.mul(PRECISION).div(IERC20(lp_token).totalSupply());
+    }
+
+    function get_dy(int128 i, int128 j, uint256 dx) external view returns (uint256 dy) {
+        (dy, ) = _exchangeAmount(_index(i), _index(j), dx);
+    }
+
+    function calc_withdraw_one_coin(uint256 _token_amount, int128 i) external view returns (uint256 dy) {
+        (dy, ) = _calcWithdrawOneCoin(_token_amount, _index(i));
+    }
+
+    function exchange(int128 i, int128 j, uint256 dx, uint256 min_dy) external {
+        uint256 _i = _index(i);
+        uint256 _j = _index(j);
+        (uint256 dy, ) = _exchangeAmount(_i, _j, dx);
+        require(dy >= min_dy, "Exchange resulted in fewer coins than expected");
+
+        balances[_i] = balances[_i].add(dx);
+        balances[_j] = balances[_j].sub(dy);
+        IERC20(coins[_i]).safeTransferFrom(msg.sender, address(this), dx);
+        IERC20(coins[_j]).safeTransfer(msg.sender, dy);
+    }
+
+    function remove_liquidity_one_coin(uint256 _token_amount, int128 i, uint256 min_amount) external {
+        uint256 _i = _index(i);
+        (uint256 dy, ) = _calcWithdrawOneCoin(_token_amount, _i);
+        require(dy >= min_amount, "Not enough coins removed");
+
+        balances[_i] = balances[_i].sub(dy);
+        MockERC20(lp_token).burnFrom(msg.sender, _token_amount);
+        IERC20(coins[_i]).safeTransfer(msg.sender, dy);
+    }
+
+    function _addLiquidity(uint256[] memory amounts, uint256 min_mint_amount) internal returns (uint256 mint_amount) {
+        uint256 tokenSupply = IERC20(lp_token).totalSupply();
+        uint256[] memory _rates = _storedRates();
+        uint256[] memory oldBalances = balances;
+        uint256[] memory newBalances = new uint256[](amounts.length);
+
+        uint256 D0 = 0;
+        if (tokenSupply > 0) {
+            D0 = _getD(_xp(_rates, oldBalances), A);
+        }
+        for (uint256 i = 0; i < amounts.length; i++) {
+            if (tokenSupply == 0) {
+                require(amounts[i] > 0, "initial deposit requires all coins");
+            }
+            newBalances[i] = oldBalances[i].add(amounts[i]);
+            balances[i] = newBalances[i];
+        }
+        uint256 D1 = _getD(_xp(_rates, newBalances), A);
+        require(D1 > D0, "D1 <= D0");
+
+        if (tokenSupply > 0) {
+            uint256 D2 = _getD(_xp(_rates, _chargeImbalanceFee(oldBalances, newBalances, D0, D1)), A);
+            mint_amount = tokenSupply.mul(D2.sub(D0)).div(D0);
+        } else {
+            mint_amount = D1;
+        }
+        require(mint_amount >= min_mint_amount, "Slippage screwup");
+
+        for (uint256 i = 0; i < amounts.length; i++) {
+            if (amounts[i] > 0) {
+                IERC20(coins[i]).safeTransferFrom(msg.sender, address(this), amounts[i]);
+            }
+        }
+        MockERC20(lp_token).mint(msg.sender, mint_amount);
+    }
+
+    function _removeLiquidity(uint256 _amount, uint256[] memory min_amounts) internal {
+        uint256 totalSupply = IERC20(lp_token).totalSupply();
+        MockERC20(lp_token).burnFrom(msg.sender, _amount);
+        for (uint256 i = 0; i < min_amounts.length; i++) {
+            uint256 value = balances[i].mul(_amount).div(totalSupply);
+            require(value >= min_amounts[i], "Withdrawal resulted in fewer coins than expected");
+            balances[i] = balances[i].sub(value);
+            IERC20(coins[i]).safeTransfer(msg.sender, value);
+        }
+    }
+
+    function _calcTokenAmount(uint256[] memory amounts, bool deposit) internal view returns (uint256) {
+        uint256[] memory _rates = _storedRates();
+        uint256[] memory _balances = balances;
+        uint256 D0 = _getD(_xp(_rates, _balances), A);
+        for (uint256 i = 0; i < amounts.length; i++) {
+            if (deposit) {
+                _balances[i] = _balances[i].add(amounts[i]);
+            } else {
+                _balances[i] = _balances[i].sub(amounts[i]);
+            }
+        }
+        uint256 D1 = _getD(_xp(_rates, _balances), A);
+        uint256 diff = deposit ? D1.sub(D0) : D0.sub(D1);
+        return diff.mul(IERC20(lp_token).totalSupply()).div(D0);
+    }
+
+    function _chargeImbalanceFee(
+        uint256[] memory oldBalances,
+        uint256[] memory newBalances,
+        uint256 D0,
+        uint256 D1
+    ) internal view returns (uint256[] memory) {
+        uint256 _fee = fee.mul(oldBalances.length).div(4 * (oldBalances.length - 1));
+        for (uint256 i = 0; i < oldBalances.length; i++) {
+            uint256 idealBalance = D1.mul(oldBalances[i]).div(D0);
+            uint256 difference = idealBalance > newBalances[i]
+                ? idealBalance - newBalances[i]
+                : newBalances[i] - idealBalance;
+            newBalances[i] = newBalances[i].sub(_fee.mul(difference).div(FEE_DENOMINATOR));
+        }
+        return newBalances;
+    }
+
+    function _exchangeAmount(uint256 i, uint256 j, uint256 dx) internal view returns (uint256 dy, uint256 dy_fee) {
+        uint256[] memory _rates = _storedRates();
+        uint256[] memory xp = _xp(_rates, balances);
+
+        uint256 x = xp[i].add(dx.mul(_rates[i]).div(PRECISION));
+        uint256 y = _getY(i, j, x, xp);
+        dy = xp[j].sub(y).sub(1);
+        dy_fee = dy.mul(fee).div(FEE_DENOMINATOR);
+        dy = dy.sub(dy_fee).mul(PRECISION).div(_rates[j]);
+    }
+
+    function _calcWithdrawOneCoin(uint256 _token_amount, uint256 i) internal view returns (uint256 dy, uint256 dy_fee) {
+        uint256[] memory _rates = _storedRates();
+        uint256[] memory xp = _xp(_rates, balances);
+
+        uint256 D0 = _getD(xp, A);
+        uint256 D1 = D0.sub(_token_amount.mul(D0).div(IERC20(lp_token).totalSupply()));
+        uint256 newY = _getYD(i, xp, D1);
+        uint256 dy0 = xp[i].sub(newY).mul(PRECISION).div(_rates[i]);
+
+        uint256[] memory xpReduced = _reduceXp(xp, i, newY, D0, D1);
+        dy = xpReduced[i].sub(_getYD(i, xpReduced, D1));
+        // withdraw less to account for rounding errors
+        dy = dy.sub(1).mul(PRECISION).div(_rates[i]);
+        dy_fee = dy0.sub(dy);
+    }
+
+    function _reduceXp(
+        uint256[] memory xp,
+        uint256 i,
+        uint256 newY,
+        uint256 D0,
+        uint256 D1
+    ) internal view returns (uint256[] memory xpReduced) {
+        uint256 _fee = fee.mul(xp.length).div(4 * (xp.length - 1));
+        xpReduced = new uint256[](xp.length);
+        for (uint256 j = 0; j < xp.length; j++) {
+            uint256 dxExpected;
+            if (j == i) {
+                dxExpected = xp[j].mul(D1).div(D0).sub(newY);
+            } else {
+                dxExpected = xp[j].sub(xp[j].mul(D1).div(D0));
+            }
+            xpReduced[j] = xp[j].sub(_fee.mul(dxExpected).div(FEE_DENOMINATOR));
+        }
+    }
+
+    function _storedRates() internal view returns (uint256[] memory _rates) {
+        _rates = rates;
+        if (base_pool != address(0)) {
+            _rates[_rates.length - 1] = IBasePool(base_pool).get_virtual_price();
+        }
+    }
+
+    function _xp(uint256[] memory _rates, uint256[] memory _balances) internal pure returns (uint256[] memory xp) {
+        xp = new uint256[](_balances.length);
+        for (uint256 i = 0; i < _balances.length; i++) {
+            xp[i] = _rates[i].mul(_balances[i]).div(PRECISION);
+        }
+    }
+
+    function _getD(uint256[] memory xp, uint256 amp) internal pure returns (uint256) {
+        uint256 N = xp.length;
+        uint256 S = 0;
+        for (uint256 i = 0; i < N; i++) {
+            S = S.add(xp[i]);
+        }
+        if (S == 0) {
+            return 0;
+        }
+
+        uint256 Dprev;
+        uint256 D = S;
+        uint256 Ann = amp.mul(N);
+        for (uint256 _i = 0; _i < 255; _i++) {
+            uint256 D_P = D;
+            for (uint256 j = 0; j < N; j++) {
+                D_P = D_P.mul(D).div(xp[j].mul(N));
+            }
+            Dprev = D;
+            D = Ann.mul(S).add(D_P.mul(N)).mul(D).div(Ann.sub(1).mul(D).add(N.add(1).mul(D_P)));
+            if (D > Dprev) {
+                if (D - Dprev <= 1) break;
+            } else {
+                if (Dprev - D <= 1) break;
+            }
+        }
+        return D;
+    }
+
+    function _getY(uint256 i, uint256 j, uint256 x, uint256[] memory xp) internal view returns (uint256) {
+        require(i != j, "same coin");
+        uint256 N = xp.length;
+        uint256 D = _getD(xp, A);
+        uint256 Ann = A.mul(N);
+        uint256 c = D;
+        uint256 S_ = 0;
+        uint256 _x;
+        for (uint256 k = 0; k < N; k++) {
+            if (k == i) {
+                _x = x;
+            } else if (k != j) {
+                _x = xp[k];
+            } else {
+                continue;
+            }
+            S_ = S_.add(_x);
+            c = c.mul(D).div(_x.mul(N));
+        }
+        c = c.mul(D).div(Ann.mul(N));
+        return _solveY(S_.add(D.div(Ann)), c, D);
+    }
+
+    function _getYD(uint256 i, uint256[] memory xp, uint256 D) internal view returns (uint256) {
+        uint256 N = xp.length;
+        uint256 Ann = A.mul(N);
+        uint256 c = D;
+        uint256 S_ = 0;
+        for (uint256 k = 0; k < N; k++) {
+            if (k == i) continue;
+            S_ = S_.add(xp[k]);
+            c = c.mul(D).div(xp[k].mul(N));
+        }
+        c = c.mul(D).div(Ann.mul(N));
+        return _solveY(S_.add(D.div(Ann)), c, D);
+    }
+
+    function _solveY(uint256 b, uint256 c, uint256 D) internal pure returns (uint256 y) {
+        uint256 yPrev;
+        y = D;
+        for (uint256 _i = 0; _i < 255; _i++) {
+            yPrev = y;
+            y = y.mul(y).add(c).div(y.mul(2).add(b).sub(D));
+            if (y > yPrev) {
+                if (y - yPrev <= 1) break;
+            } else {
+                if (yPrev - y <= 1) break;
+            }
+        }
+    }
+
+    function _index(int128 i) internal view returns (uint256) {
+        require(i >= 0 && uint256(uint128(i)) < coins.length, "bad coin index");
+        return uint256(uint128(i));
+    }
+}
+
+
+// 2 coin pool, used for the mUSD / gUSD metapools (coin 1 is 3Crv)
+contract MockCurvePool2 is MockCurvePoolBase {
+    constructor(
+        address[] memory _coins,
+        address _lp_token,
+        uint256 _A,
+        uint256 _fee,
+        address _base_pool
+    ) public MockCurvePoolBase(_coins, _lp_token, _A, _fee, _base_pool) {
+        require(_coins.length == 2, "!coins");
+    }
+
+    function add_liquidity(uint256[2] calldata amounts, uint256 min_mint_amount) external {
+        _addLiquidity(_asArray(amounts), min_mint_amount);
+    }
+
+    function remove_liquidity(uint256 _amount, uint256[2] calldata min_amounts) external {
+        _removeLiquidity(_amount, _asArray(min_amounts));
+    }
+
+    function calc_token_amount(uint256[2] calldata amounts, bool deposit) external view returns (uint256) {
+        return _calcTokenAmount(_asArray(amounts), deposit);
+    }
+
+    function _asArray(uint256[2] memory _amounts) internal pure returns (uint256[] memory amounts) {
+        amounts = new uint256[](2);
+        amounts[0] = _amounts[0];
+        amounts[1] = _amounts[1];
+    }
+}
+
+
+// 3 coin pool, used for 3pool (DAI/USDC/USDT) and sBTC (renBTC/WBTC/sBTC)
+contract MockCurvePool3 is MockCurvePoolBase {
+    constructor(
+        address[] memory _coins,
+        address _lp_token,
+        uint256 _A,
+        uint256 _fee,
+        address _base_pool
+    ) public MockCurvePoolBase(_coins, _lp_token, _A, _fee, _base_pool) {
+        require(_coins.length == 3, "!coins");
+    }
+
+    function add_liquidity(uint256[3] calldata amounts, uint256 min_mint_amount) external {
+        _addLiquidity(_asArray(amounts), min_mint_amount);
+    }
+
+    function remove_liquidity(uint256 _amount, uint256[3] calldata min_amounts) external {
+        _removeLiquidity(_amount, _asArray(min_amounts));
+    }
+
+    function calc_token_amount(uint256[3] calldata amounts, bool deposit) external view returns (uint256) {
+        return _calcTokenAmount(_asArray(amounts), deposit);
+    }
+
+    function _asArray(uint256[3] memory _amounts) internal pure returns (uint256[] memory amounts) {
+        amounts = new uint256[](3);
+        amounts[0] = _amounts[0];
+        amounts[1] = _amounts[1];
+        amounts[2] = _amounts[2];
+    }
+}
@@ -0,0 +1,35 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+
+// Test token for the local (non-fork) stack. Anybody can mint, only the minter
+// (the mock curve pool for LP tokens) can burn.
+contract MockERC20 is ERC20 {
+    address public minter;
+
+    constructor(
+        string memory _name,
+        string memory _symbol,
+        uint8 _decimals
+    ) public ERC20(_name, _symbol) {
+        _setupDecimals(_decimals);
+        minter = msg.sender;
+    }
+
+    function setMinter(address _minter) external {
+        require(msg.sender == minter, "!minter");
+        minter = _minter;
+    }
+
+    function mint(address _to, uint256 _amount) external {
+        _mint(_to, _amount);
+    }
+
+    function burnFrom(address _from, uint256 _amount) external {
+        require(msg.sender == minter, "!minter");
+        _burn(_from, _amount);
+    }
+}
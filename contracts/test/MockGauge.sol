@@ -0,0 +1,64 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+
+// Curve LiquidityGauge stand-in for the local (non-fork) stack. LP is held 1:1;
+// accrue() credits CRV per staked LP (what time does on mainnet), which the minter
+// mints to the staker, as Minter.mint(gauge) does with integrate_fraction.
+contract MockGauge {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    IERC20 public lp_token;
+    address public minter;
+
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+
+    // CRV per 1e18 LP staked, since deployment
+    uint256 public integral;
+    mapping(address => uint256) public integralOf;
+    // CRV earned and not minted yet
+    mapping(address => uint256) public claimable;
+
+    constructor(address _lp_token, address _minter) public {
+        lp_token = IERC20(_lp_token);
+        minter = _minter;
+    }
+
+    function _checkpoint(address _addr) internal {
+        claimable[_addr] = claimable[_addr].add(balanceOf[_addr].mul(integral.sub(integralOf[_addr])).div(1e18));
+        integralOf[_addr] = integral;
+    }
+
+    function accrue(uint256 _crvPerLp) external {
+        integral = integral.add(_crvPerLp);
+    }
+
+    function deposit(uint256 _value) external {
+        _checkpoint(msg.sender);
+        lp_token.safeTransferFrom(msg.sender, address(this), _value);
+        balanceOf[msg.sender] = balanceOf[msg.sender].add(_value);
+        totalSupply = totalSupply.add(_value);
+    }
+
+    function withdraw(uint256 _value) external {
+        _checkpoint(msg.sender);
+        balanceOf[msg.sender] = balanceOf[msg.sender].sub(_value);
+        totalSupply = totalSupply.sub(_value);
+        lp_token.safeTransfer(msg.sender, _value);
+    }
+
+    // CRV owed to `_addr`, reset: only the minter mints it
+    function collect(address _addr) external returns (uint256 _crv) {
+        require(msg.sender == minter, "!minter");
+        _checkpoint(_addr);
+        _crv = claimable[_addr];
+        claimable[_addr] = 0;
+    }
+}
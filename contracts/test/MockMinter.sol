@@ -0,0 +1,23 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "./MockERC20.sol";
+import "./MockGauge.sol";
+
+
+// Curve Minter stand-in: mints the CRV a MockGauge owes the caller.
+contract MockMinter {
+    address public token;
+
+    constructor(address _token) public {
+        token = _token;
+    }
+
+    function mint(address _gauge) external {
+        uint256 _crv = MockGauge(_gauge).collect(msg.sender);
+        if (_crv > 0) {
+            MockERC20(token).mint(msg.sender, _crv);
+        }
+    }
+}
@@ -0,0 +1,69 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "./MockERC20.sol";
+
+
+// Stand-in for the Uniswap v2 router (mainnet 0x7a250d5630B4cF539739dF2C5dAcD4c659F2488D)
+// at fixed prices: wei of ETH per whole token, no reserves or fees. Swaps keep the
+// input and mint the output (a MockERC20). Anybody can set prices.
+contract MockUniswapRouter {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    address public immutable weth;
+    mapping(address => uint256) public ethPerToken;
+
+    constructor(address _weth) public {
+        weth = _weth;
+    }
+
+    function setPrice(address _token, uint256 _ethPerToken) external {
+        ethPerToken[_token] = _ethPerToken;
+    }
+
+    function _toEth(address _token, uint256 _amount) internal view returns (uint256) {
+        if (_token == weth) {
+            return _amount;
+        }
+        require(ethPerToken[_token] > 0, "!price");
+        return _amount.mul(ethPerToken[_token]).div(10 ** uint256(ERC20(_token).decimals()));
+    }
+
+    function _fromEth(address _token, uint256 _eth) internal view returns (uint256) {
+        if (_token == weth) {
+            return _eth;
+        }
+        require(ethPerToken[_token] > 0, "!price");
+        return _eth.mul(10 ** uint256(ERC20(_token).decimals())).div(ethPerToken[_token]);
+    }
+
+    // first to last token of `path`, whatever is in between
+    function getAmountsOut(uint256 amountIn, address[] memory path) public view returns (uint256[] memory amounts) {
+        require(path.length >= 2, "!path");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        amounts[path.length - 1] = _fromEth(path[path.length - 1], _toEth(path[0], amountIn));
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "EXPIRED");
+        amounts = getAmountsOut(amountIn, path);
+        uint256 amountOut = amounts[path.length - 1];
+        require(amountOut > 0 && amountOut >= amountOutMin, "INSUFFICIENT_OUTPUT_AMOUNT");
+        IERC20(path[0]).safeTransferFrom(msg.sender, address(this), amountIn);
+        MockERC20(path[path.length - 1]).mint(to, amountOut);
+    }
+}
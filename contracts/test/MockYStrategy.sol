@@ -0,0 +1,63 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./MockERC20.sol";
+import "./MockYVault.sol";
+
+
+// Strategy behind a MockYVault. harvest() mints `yieldPerHarvest` bps of the vault's
+// balance into the vault (minus fees), which is what moves getPricePerFullShare.
+contract MockYStrategy {
+    using SafeMath for uint256;
+
+    uint256 constant public FEE_DENOMINATOR = 10000;
+
+    address public vault;
+    address public want;
+    address public governance;
+
+    uint256 public strategistReward = 1000;
+    uint256 public treasuryFee = 500;
+    uint256 public withdrawalFee = 50;
+    uint256 public yieldPerHarvest = 50;
+
+    constructor(address _vault) public {
+        vault = _vault;
+        want = address(MockYVault(_vault).token());
+        governance = msg.sender;
+    }
+
+    modifier onlyGovernance() {
+        require(msg.sender == governance, "!governance");
+        _;
+    }
+
+    function setStrategistReward(uint256 _strategistReward) external onlyGovernance {
+        strategistReward = _strategistReward;
+    }
+
+    function setTreasuryFee(uint256 _treasuryFee) external onlyGovernance {
+        treasuryFee = _treasuryFee;
+    }
+
+    function setWithdrawalFee(uint256 _withdrawalFee) external onlyGovernance {
+        withdrawalFee = _withdrawalFee;
+    }
+
+    function setYieldPerHarvest(uint256 _yieldPerHarvest) external onlyGovernance {
+        yieldPerHarvest = _yieldPerHarvest;
+    }
+
+    function harvest() external onlyGovernance {
+        uint256 _yield = IERC20(want).balanceOf(vault).mul(yieldPerHarvest).div(FEE_DENOMINATOR);
+        uint256 _fee = _yield.mul(strategistReward.add(treasuryFee)).div(FEE_DENOMINATOR);
+        MockERC20(want).mint(vault, _yield.sub(_fee));
+        if (_fee > 0) {
+            MockERC20(want).mint(governance, _fee);
+        }
+    }
+}
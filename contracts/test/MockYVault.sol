@@ -0,0 +1,84 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+
+interface IMockYStrategy {
+    function withdrawalFee() external view returns (uint256);
+}
+
+
+// v1 yVault stand-in for the local (non-fork) stack. Funds stay in the vault, the
+// attached strategy only carries the withdrawal fee and simulates yield on harvest.
+contract MockYVault is ERC20 {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 constant public FEE_DENOMINATOR = 10000;
+
+    IERC20 public token;
+    address public governance;
+    address public strategy;
+
+    constructor(address _token) public ERC20(
+        string(abi.encodePacked("yearn ", ERC20(_token).name())),
+        string(abi.encodePacked("y", ERC20(_token).symbol()))
+    ) {
+        _setupDecimals(ERC20(_token).decimals());
+        token = IERC20(_token);
+        governance = msg.sender;
+    }
+
+    function setStrategy(address _strategy) external {
+        require(msg.sender == governance, "!governance");
+        strategy = _strategy;
+    }
+
+    function balance() public view returns (uint256) {
+        return token.balanceOf(address(this));
+    }
+
+    function getPricePerFullShare() public view returns (uint256) {
+        if (totalSupply() == 0) {
+            return 1e18;
+        }
+        return balance().mul(1e18).div(totalSupply());
+    }
+
+    function depositAll() external {
+        deposit(token.balanceOf(msg.sender));
+    }
+
+    function deposit(uint256 _amount) public {
+        uint256 _pool = balance();
+        token.safeTransferFrom(msg.sender, address(this), _amount);
+        uint256 shares = 0;
+        if (totalSupply() == 0) {
+            shares = _amount;
+        } else {
+            shares = (_amount.mul(totalSupply())).div(_pool);
+        }
+        _mint(msg.sender, shares);
+    }
+
+    function withdrawAll() external {
+        withdraw(balanceOf(msg.sender));
+    }
+
+    function withdraw(uint256 _shares) public {
+        uint256 r = (balance().mul(_shares)).div(totalSupply());
+        _burn(msg.sender, _shares);
+
+        if (strategy != address(0)) {
+            uint256 _fee = r.mul(IMockYStrategy(strategy).withdrawalFee()).div(FEE_DENOMINATOR);
+            token.safeTransfer(governance, _fee);
+            r = r.sub(_fee);
+        }
+        token.safeTransfer(msg.sender, r);
+    }
+}
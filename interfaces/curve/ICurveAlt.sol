@@ -11,12 +11,16 @@ interface ICurveAlt {
         uint256 min_mint_amount
     ) external;
 
+    function calc_token_amount(uint256[2] calldata amounts, bool deposit) external view returns (uint256);
+
     function remove_liquidity_imbalance(uint256[4] calldata amounts, uint256 max_burn_amount) external;
 
     function remove_liquidity(uint256 _amount, uint256[4] calldata amounts) external;
 
     function remove_liquidity_one_coin(uint256 _token_amount, int128, uint256 min_amount) external;
 
+    function calc_withdraw_one_coin(uint256 _token_amount, int128 i) external view returns (uint256);
+
     function exchange(
         int128 from,
         int128 to,
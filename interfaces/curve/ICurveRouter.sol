@@ -0,0 +1,16 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.6.12;
+
+// contracts/CurveRouter.sol; callers have to be allowed by its governance
+interface ICurveRouter {
+    function quoteEnter(address strategy, uint256 amount) external view returns (uint256 path, uint256 lp);
+
+    function quoteExit(address strategy, uint256 lp) external view returns (uint256 path, uint256 out);
+
+    // want from msg.sender in, its target LP out
+    function enter(uint256 amount, uint256 minLp) external returns (uint256 lp);
+
+    // target LP from msg.sender in, its want out
+    function exit(uint256 lp, uint256 minOut) external returns (uint256 out);
+}
@@ -0,0 +1,10 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.6.12;
+
+interface IMinter {
+    // mint the CRV `gauge` owes msg.sender
+    function mint(address gauge) external;
+
+    function token() external view returns (address);
+}
@@ -0,0 +1,683 @@
+"""
+Backtests: replay a strategy's harvests over historical pool data.
+
+    rows = backtest.load("history.csv")
+    results = backtest.sweep(rows, {"dai_3pool": 1_000_000, "dai_musd": 1_000_000})
+    for result in results.values():
+        print(result.strategy, result.apy, result.max_drawdown, result.withdrawal_loss)
+
+    BACKTEST_DATA=history.parquet brownie run backtest
+
+`rows` are observations (daily, say) with integer values as read on chain:
+  - `timestamp`
+  - for every pool a route goes through, `<pool>_virtual_price`, `<pool>_supply`,
+    `<pool>_amp` (A_precise for metapools), `<pool>_fee` and `<pool>_balance_<i>`
+  - `<pool>_price_per_share`: getPricePerFullShare of the v1 vault holding the
+    pool's LP token, for the last pool of a route
+  - optionally `gas_price` (wei) and `<want>_price` (ETH wei per whole want token)
+    to price harvests
+  - for the gauge backend (`gauge=True`, StrategyCurveGauge), `<pool>_gauge_integral`:
+    the gauge's integrate_inv_supply (CRV per 1e18 working balance, cumulative) for
+    the last pool of a route, and `crv_price` (ETH wei per CRV). The price per share
+    columns aren't needed there.
+CSV is read as is, Parquet needs pyarrow.
+
+The strategy side replays StrategyCurveLP: prepareReturn values the position at
+the row's prices and withdraws the profit through `_withdrawSome` (target vault,
+metapool, base pool, each remove_liquidity_one_coin quoted by `scripts/stableswap.py`
+on the row's balances), adjustPosition deposits the vault's credit back with
+`slip` protection. A harvest whose deposit mints less than that reverts, as it
+would on chain, and is counted as failed. The vault side is a v2 vault with one
+strategy and no fees. The strategy's trades move the pools within a harvest, not
+in the rows after it.
+
+With `gauge=True` the position is staked in the last pool's gauge instead: LP 1:1,
+no withdrawal fee, and CRV accruing at the unboosted 40% of the gauge rate, sold
+for want (two uniswap hops at 0.3%) at every harvest. `compare` runs both backends.
+"""
+import csv
+import os
+from copy import copy
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from scripts.stableswap import PRECISION, Pool
+
+DENOMINATOR = 10000
+MAX_PROBES = 8
+MAX_BPS = 10000
+# share of a gauge's rate earned without veCRV boost (LiquidityGauge.TOKENLESS_PRODUCTION)
+TOKENLESS_PRODUCTION = 40
+# CRV -> WETH -> want
+SWAP_FEE_BPS = 30
+SWAP_HOPS = 2
+YEAR = 365 * 24 * 3600
+WEEK = 7 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class Route:
+    """StrategyCurveLP.Route, with pools named by their column prefix."""
+
+    want: str
+    base: str
+    # decimals of the base pool's coins
+    base_decimals: Tuple[int, ...]
+    base_index: int
+    base_a_precision: int = 1
+    meta: Optional[str] = None
+    # decimals of the metapool's coin (the base LP, last, is rated at the base virtual price)
+    meta_decimals: int = 18
+    meta_index: int = 1
+    meta_a_precision: int = 100
+
+    @property
+    def decimals(self):
+        return self.base_decimals[self.base_index]
+
+    @property
+    def want_scale(self):
+        return 10 ** (18 - self.decimals)
+
+    @property
+    def last(self):
+        """Pool whose LP token the target vault holds."""
+        return self.meta or self.base
+
+
+THREE_POOL = (18, 6, 6)
+
+# the registry's strategy configs (tests/registry.py)
+ROUTES = {
+    "dai_3pool": Route("dai", "three_pool", THREE_POOL, 0),
+    "usdc_3pool": Route("usdc", "three_pool", THREE_POOL, 1),
+    "dai_musd": Route("dai", "three_pool", THREE_POOL, 0, meta="musd_pool"),
+    "dai_gusd": Route(
+        "dai", "three_pool", THREE_POOL, 0, meta="gusd_pool", meta_decimals=2
+    ),
+    "wbtc_sbtc": Route("wbtc", "sbtc_pool", (8, 8, 18), 1),
+    "usdc_musd": Route("usdc", "three_pool", THREE_POOL, 1, meta="musd_pool"),
+}
+
+# whole want tokens `main` deposits into each strategy
+DEFAULT_DEPOSITS = {
+    "dai_3pool": 1_000_000,
+    "usdc_3pool": 1_000_000,
+    "dai_musd": 1_000_000,
+    "dai_gusd": 1_000_000,
+    "wbtc_sbtc": 100,
+    "usdc_musd": 1_000_000,
+}
+
+
+class Revert(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Prices:
+    base_virtual_price: int
+    # 0 without a metapool
+    meta_virtual_price: int
+    price_per_share: int
+
+
+@dataclass
+class Position:
+    want: int = 0
+    base_lp: int = 0
+    meta_lp: int = 0
+    # target vault shares (gauge balance with the gauge backend)
+    shares: int = 0
+    # CRV earned in the gauge, not sold yet
+    crv: int = 0
+
+
+@dataclass(frozen=True)
+class Result:
+    strategy: str
+    start: int
+    end: int
+    deposit: int
+    # vault total assets at each row, after its harvest if any
+    values: Tuple[int, ...]
+    apy: float
+    max_drawdown: float
+    harvests: int
+    failed_harvests: int
+    profit: int
+    loss: int
+    # part of `loss` (or of the gross profit) lost unwinding through the pools
+    withdrawal_loss: int
+    # ETH wei, 0 without a `gas_price` column
+    harvest_cost: int
+    # None without a `<want>_price` column
+    harvest_cost_in_want: Optional[int]
+    net_apy: Optional[float]
+
+    @property
+    def final_value(self):
+        return self.values[-1]
+
+
+def _int(value):
+    return int(Decimal(str(value)))
+
+
+def load(path) -> List[Dict[str, int]]:
+    """Rows of a CSV or Parquet file, as ints, by timestamp."""
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet
+
+        records = pyarrow.parquet.read_table(path).to_pylist()
+    else:
+        with open(path, newline="") as f:
+            records = list(csv.DictReader(f))
+    rows = [
+        {k: _int(v) for k, v in record.items() if v not in (None, "")}
+        for record in records
+    ]
+    return sorted(rows, key=lambda row: row["timestamp"])
+
+
+def prices(route, row, gauge=False):
+    return Prices(
+        base_virtual_price=row[f"{route.base}_virtual_price"],
+        meta_virtual_price=row[f"{route.meta}_virtual_price"] if route.meta else 0,
+        # gauge balances are LP, 1:1
+        price_per_share=PRECISION if gauge else row[f"{route.last}_price_per_share"],
+    )
+
+
+def crv_to_want(route, row, crv):
+    """Want for `crv` sold through uniswap at the row's prices, None without prices."""
+    crv_price, want_price = row.get("crv_price"), row.get(f"{route.want}_price")
+    if not crv_price or not want_price:
+        return None
+    out = crv * crv_price * 10 ** route.decimals // (PRECISION * want_price)
+    for _ in range(SWAP_HOPS):
+        out = out * (MAX_BPS - SWAP_FEE_BPS) // MAX_BPS
+    return out
+
+
+def pool(row, prefix, rates, a_precision):
+    return Pool(
+        balances=tuple(row[f"{prefix}_balance_{i}"] for i in range(len(rates))),
+        rates=tuple(rates),
+        amp=row[f"{prefix}_amp"],
+        fee=row[f"{prefix}_fee"],
+        supply=row[f"{prefix}_supply"],
+        a_precision=a_precision,
+    )
+
+
+def _moved(pool, i, amount, supply_change):
+    balances = list(pool.balances)
+    balances[i] += amount
+    return pool.with_balances(balances, pool.supply + supply_change)
+
+
+class Strategy:
+    """StrategyCurveLP's accounting, against one row's pools and prices."""
+
+    def __init__(
+        self,
+        route,
+        position,
+        row,
+        slip=100,
+        withdrawal_fee=0,
+        max_impact=DENOMINATOR,
+        want_float=0,
+        quote_slippage=False,
+        min_invest=0,
+        gauge=False,
+    ):
+        self.route = route
+        self.position = position
+        self.row = row
+        self.gauge = gauge
+        self.p = prices(route, row, gauge)
+        self.slip = slip
+        self.max_impact = max_impact
+        self.want_float = want_float
+        self.quote_slippage = quote_slippage
+        self.min_invest = min_invest
+        # v1 target vault withdrawal fee, bps
+        self.withdrawal_fee = 0 if gauge else withdrawal_fee
+        self.base_pool = pool(
+            row,
+            route.base,
+            [10 ** (36 - d) for d in route.base_decimals],
+            route.base_a_precision,
+        )
+        self.meta_pool = None
+        if route.meta:
+            rates = [10 ** (36 - route.meta_decimals), self.p.base_virtual_price]
+            self.meta_pool = pool(row, route.meta, rates, route.meta_a_precision)
+
+    def lp_price(self):
+        return (
+            self.p.meta_virtual_price if self.route.meta else self.p.base_virtual_price
+        )
+
+    def estimated_total_assets(self):
+        return estimated_total_assets(self.route, self.position, self.p)
+
+    def claim_rewards(self):
+        """StrategyCurveGauge._claimRewards: CRV earned into want, when it can be priced."""
+        if not self.gauge or self.position.crv == 0:
+            return
+        out = crv_to_want(self.route, self.row, self.position.crv)
+        if out:
+            self.position.want += out
+            self.position.crv = 0
+
+    def prepare_return(self, debt_outstanding, debt):
+        """(profit, loss, debt payment, withdrawal loss)"""
+        self.claim_rewards()
+        profit = loss = debt_payment = withdrawal_loss = 0
+        if debt_outstanding > 0:
+            freed, loss = self.liquidate_position(debt_outstanding)
+            debt_payment = min(freed, debt_outstanding)
+
+        current = self.estimated_total_assets()
+        if current > debt:
+            profit = current - debt
+        if debt > current:
+            loss = debt - current
+
+        want_balance = self.position.want
+        to_free = debt_payment + profit
+        if to_free > want_balance:
+            _, withdrawal_loss, _ = self.withdraw_some(to_free - want_balance)
+            if withdrawal_loss < profit:
+                profit -= withdrawal_loss
+            else:
+                loss += withdrawal_loss - profit
+                profit = 0
+
+            want_balance = self.position.want
+            if want_balance < profit:
+                profit = want_balance
+                debt_payment = 0
+            elif want_balance < debt_payment + profit:
+                debt_payment = want_balance - profit
+        return profit, loss, debt_payment, withdrawal_loss
+
+    def adjust_position(self, debt_outstanding, total_debt):
+        route, position = self.route, self.position
+        if debt_outstanding >= position.want:
+            return
+        available = position.want - debt_outstanding
+        float_ = total_debt * self.want_float // DENOMINATOR
+        if available <= float_:
+            return
+        available -= float_
+        if available < self.min_invest:
+            return
+        amounts = [
+            available if k == route.base_index else 0 for k in range(self.base_pool.n)
+        ]
+        if self.quote_slippage:
+            v = self.base_pool.calc_token_amount(amounts, True)
+        else:
+            v = available * route.want_scale * PRECISION // self.p.base_virtual_price
+        minted = self.base_pool.add_liquidity(amounts)
+        if minted < v * (DENOMINATOR - self.slip) // DENOMINATOR:
+            raise Revert("Slippage screwed you")
+        self.base_pool = _moved(self.base_pool, route.base_index, available, minted)
+        position.want -= available
+        position.base_lp += minted
+
+        if route.meta:
+            amounts = [
+                position.base_lp if k == route.meta_index else 0 for k in range(2)
+            ]
+            if self.quote_slippage:
+                v = self.meta_pool.calc_token_amount(amounts, True)
+            else:
+                v = (
+                    position.base_lp
+                    * self.p.base_virtual_price
+                    // self.p.meta_virtual_price
+                )
+            minted = self.meta_pool.add_liquidity(amounts)
+            if minted < v * (DENOMINATOR - self.slip) // DENOMINATOR:
+                raise Revert("Slippage screwed you")
+            self.meta_pool = _moved(
+                self.meta_pool, route.meta_index, position.base_lp, minted
+            )
+            position.base_lp = 0
+            position.meta_lp += minted
+
+        # depositAll
+        if route.meta:
+            position.shares += position.meta_lp * PRECISION // self.p.price_per_share
+            position.meta_lp = 0
+        else:
+            position.shares += position.base_lp * PRECISION // self.p.price_per_share
+            position.base_lp = 0
+
+    def liquidate_position(self, amount_needed):
+        if self.position.want < amount_needed:
+            _, _, deferred = self.withdraw_some(amount_needed - self.position.want)
+            amount_needed -= deferred
+        if self.position.want >= amount_needed:
+            return amount_needed, 0
+        return self.position.want, amount_needed - self.position.want
+
+    def withdraw_some(self, amount):
+        """(liquidated, loss, deferred) freeing `amount` want, within `max_impact`"""
+        route, position = self.route, self.position
+        before = position.want
+        lp_price = self.lp_price()
+        lp_needed = amount * route.want_scale * PRECISION // lp_price
+        lp_idle = position.meta_lp if route.meta else position.base_lp
+
+        deferred = 0
+        if self.max_impact < DENOMINATOR:
+            lp_available = min(
+                lp_needed,
+                lp_idle + position.shares * self.p.price_per_share // PRECISION,
+            )
+            lp_held_back = lp_available - self.tranche(lp_available, lp_price)
+            if lp_held_back > 0:
+                deferred = min(
+                    lp_held_back * lp_price // PRECISION // route.want_scale, amount
+                )
+                amount -= deferred
+                lp_needed -= lp_held_back
+
+        if lp_needed > lp_idle:
+            shares = min(
+                (lp_needed - lp_idle) * PRECISION // self.p.price_per_share,
+                position.shares,
+            )
+            lp = shares * self.p.price_per_share // PRECISION
+            lp -= lp * self.withdrawal_fee // MAX_BPS
+            position.shares -= shares
+            if route.meta:
+                position.meta_lp += lp
+            else:
+                position.base_lp += lp
+
+        if route.meta and position.meta_lp > 0:
+            received = self.meta_pool.calc_withdraw_one_coin(
+                position.meta_lp, route.meta_index
+            )
+            self.meta_pool = _moved(
+                self.meta_pool, route.meta_index, -received, -position.meta_lp
+            )
+            position.base_lp += received
+            position.meta_lp = 0
+        if position.base_lp > 0:
+            received = self.base_pool.calc_withdraw_one_coin(
+                position.base_lp, route.base_index
+            )
+            self.base_pool = _moved(
+                self.base_pool, route.base_index, -received, -position.base_lp
+            )
+            position.want += received
+            position.base_lp = 0
+
+        freed = position.want - before
+        if freed >= amount:
+            return amount, 0, deferred
+        return freed, amount - freed, deferred
+
+    def tranche(self, lp, lp_price):
+        for _ in range(MAX_PROBES):
+            if lp == 0 or self.withdraw_impact(lp, lp_price) <= self.max_impact:
+                return lp
+            lp //= 2
+        return 0
+
+    def withdraw_impact(self, lp, lp_price):
+        """bps lost taking `lp` target LP out to want, against the virtual price"""
+        value = lp * lp_price // PRECISION // self.route.want_scale
+        if value == 0:
+            return 0
+        out = lp
+        if self.route.meta:
+            out = self.meta_pool.calc_withdraw_one_coin(out, self.route.meta_index)
+        out = self.base_pool.calc_withdraw_one_coin(out, self.route.base_index)
+        return 0 if out >= value else (value - out) * DENOMINATOR // value
+
+
+def estimated_total_assets(route, position, p):
+    stake = position.shares * p.price_per_share // PRECISION
+    value = position.base_lp * p.base_virtual_price
+    if route.meta:
+        value += (stake + position.meta_lp) * p.meta_virtual_price
+    else:
+        value += stake * p.base_virtual_price
+    return position.want + value // PRECISION // route.want_scale
+
+
+def run(
+    route,
+    rows,
+    deposit,
+    harvest_interval=WEEK,
+    slip=100,
+    debt_ratio=MAX_BPS,
+    harvest_gas=0,
+    withdrawal_fee=0,
+    max_impact=DENOMINATOR,
+    want_float=0,
+    quote_slippage=False,
+    min_invest=0,
+    gauge=False,
+    flows=None,
+    strategy_id="",
+):
+    """
+    Deposit `deposit` (want wei) into the vault at the first row and harvest every
+    `harvest_interval` seconds after it. `harvest_gas` is what a harvest costs, see
+    the gas benchmarks (tests/benchmarks) for the strategy's `harvest_profit`.
+    `slip`, `max_impact`, `want_float`, `quote_slippage` and `min_invest` (want wei)
+    are the strategy's tunables. `gauge` replays StrategyCurveGauge instead of the
+    v1 target vault backend.
+
+    `flows` ({timestamp: want wei}) are later deposits into the vault (> 0) and
+    withdrawals from it (< 0), applied at the first row at or after their time.
+    Deposits sit idle in the vault until the next harvest; withdrawals beyond the
+    vault's idle want go through the strategy's liquidatePosition. APY and
+    drawdown are time weighted, so flows don't count as yield.
+    """
+    flows = sorted((flows or {}).items())
+    tunables = (
+        slip,
+        withdrawal_fee,
+        max_impact,
+        want_float,
+        quote_slippage,
+        min_invest,
+        gauge,
+    )
+    integral_column = f"{route.last}_gauge_integral"
+    last_integral = None
+    position = Position()
+    idle, total_debt = deposit, 0
+    values = []
+    # time weighted growth of the vault's assets, gross and net of harvest cost
+    index, net_index = [], []
+    growth = net_growth = 1.0
+    previous = deposit
+    harvests = failed = 0
+    total_profit = total_loss = total_withdrawal_loss = cost = 0
+    cost_in_want = 0
+    priced = True
+    last_harvest = None
+
+    for row in rows:
+        if gauge:
+            # CRV for the stake held since the previous row
+            integral = row[integral_column]
+            if last_integral is not None:
+                earned = position.shares * (integral - last_integral) // PRECISION
+                position.crv += earned * TOKENLESS_PRODUCTION // 100
+            last_integral = integral
+
+        flow = 0
+        while flows and flows[0][0] <= row["timestamp"]:
+            flow += flows.pop(0)[1]
+        if flow > 0:
+            idle += flow
+        elif flow < 0:
+            # Vault.withdraw: idle want first, then the strategy
+            needed = min(-flow - idle, total_debt) if -flow > idle else 0
+            loss = 0
+            if needed > 0:
+                strategy = Strategy(route, position, row, *tunables)
+                freed, loss = strategy.liquidate_position(needed)
+                position.want -= freed
+                idle += freed
+                total_debt -= freed + loss
+                total_loss += loss
+                total_withdrawal_loss += loss
+            # the withdrawer takes the loss, and gets less when max_impact defers part
+            # of the withdrawal: what leaves the vault on their behalf is paid + loss
+            paid = min(-flow - loss, idle)
+            idle -= paid
+            flow = -(paid + loss)
+
+        row_cost = 0
+        if last_harvest is None or row["timestamp"] - last_harvest >= harvest_interval:
+            last_harvest = row["timestamp"]
+            harvests += 1
+            strategy = Strategy(route, copy(position), row, *tunables)
+            try:
+                # BaseStrategy.harvest and Vault.report
+                limit = debt_ratio * (idle + total_debt) // MAX_BPS
+                profit, loss, debt_payment, withdrawal_loss = strategy.prepare_return(
+                    max(total_debt - limit, 0), total_debt
+                )
+                strategy.position.want -= profit + debt_payment
+                new_idle = idle + profit + debt_payment
+                new_debt = total_debt - loss - debt_payment
+                limit = debt_ratio * (new_idle + new_debt) // MAX_BPS
+                credit = min(max(limit - new_debt, 0), new_idle)
+                strategy.position.want += credit
+                new_idle -= credit
+                new_debt += credit
+                strategy.adjust_position(max(new_debt - limit, 0), new_debt)
+            except Revert:
+                failed += 1
+            else:
+                position, idle, total_debt = strategy.position, new_idle, new_debt
+                total_profit += profit
+                total_loss += loss
+                total_withdrawal_loss += withdrawal_loss
+
+            gas_cost = harvest_gas * row.get("gas_price", 0)
+            cost += gas_cost
+            want_price = row.get(f"{route.want}_price")
+            if want_price:
+                row_cost = gas_cost * 10 ** route.decimals // want_price
+                cost_in_want += row_cost
+            else:
+                priced = False
+
+        value = idle + estimated_total_assets(
+            route, position, prices(route, row, gauge)
+        )
+        values.append(value)
+        if previous + flow > 0:
+            growth *= value / (previous + flow)
+            net_growth *= (value - row_cost) / (previous + flow)
+        index.append(growth)
+        net_index.append(net_growth)
+        previous = value
+
+    start, end = rows[0]["timestamp"], rows[-1]["timestamp"]
+    return Result(
+        strategy=strategy_id,
+        start=start,
+        end=end,
+        deposit=deposit,
+        values=tuple(values),
+        apy=_apy(growth, end - start),
+        max_drawdown=max_drawdown(index),
+        harvests=harvests,
+        failed_harvests=failed,
+        profit=total_profit,
+        loss=total_loss,
+        withdrawal_loss=total_withdrawal_loss,
+        harvest_cost=cost,
+        harvest_cost_in_want=cost_in_want if priced else None,
+        net_apy=_apy(net_growth, end - start) if priced else None,
+    )
+
+
+def _apy(growth, elapsed):
+    if elapsed <= 0 or growth <= 0:
+        return 0.0
+    return growth ** (YEAR / elapsed) - 1
+
+
+def max_drawdown(values):
+    """Largest fall from a running peak, as a fraction of the peak."""
+    peak, worst = 0, 0.0
+    for value in values:
+        peak = max(peak, value)
+        if peak:
+            worst = max(worst, 1 - value / peak)
+    return worst
+
+
+def sweep(rows, deposits, routes=ROUTES, **kwargs):
+    """`run` for every strategy id in `deposits` (whole want tokens)."""
+    return {
+        strategy_id: run(
+            routes[strategy_id],
+            rows,
+            int(amount * 10 ** routes[strategy_id].decimals),
+            strategy_id=strategy_id,
+            **kwargs,
+        )
+        for strategy_id, amount in deposits.items()
+    }
+
+
+def compare(rows, deposits, routes=ROUTES, vault_gas=0, gauge_gas=0, **kwargs):
+    """
+    {strategy id: (v1 target vault result, gauge result)}. `vault_gas` and `gauge_gas`
+    are each backend's harvest gas, see `harvest_profit` and `gauge_harvest_profit`
+    in the gas benchmarks.
+    """
+    vault = sweep(rows, deposits, routes, harvest_gas=vault_gas, **kwargs)
+    gauge = sweep(rows, deposits, routes, harvest_gas=gauge_gas, gauge=True, **kwargs)
+    return {
+        strategy_id: (vault[strategy_id], gauge[strategy_id])
+        for strategy_id in deposits
+    }
+
+
+def main():
+    rows = load(os.environ["BACKTEST_DATA"])
+    columns = set(rows[0])
+    # strategies the data has every pool of
+    deposits = {
+        strategy_id: amount
+        for strategy_id, amount in DEFAULT_DEPOSITS.items()
+        if f"{ROUTES[strategy_id].last}_price_per_share" in columns
+        and f"{ROUTES[strategy_id].base}_virtual_price" in columns
+    }
+    for result in sweep(rows, deposits).values():
+        print(
+            f"{result.strategy}: apy {result.apy:.2%}, max drawdown {result.max_drawdown:.2%}, "
+            f"{result.harvests} harvests ({result.failed_harvests} failed), "
+            f"withdrawal loss {result.withdrawal_loss / 10 ** ROUTES[result.strategy].decimals:.2f}"
+        )
+    gauged = {
+        strategy_id: amount
+        for strategy_id, amount in deposits.items()
+        if f"{ROUTES[strategy_id].last}_gauge_integral" in columns
+    }
+    for strategy_id, (vault, gauge) in compare(rows, gauged).items():
+        print(
+            f"{strategy_id}: gauge apy {gauge.apy:.2%} against {vault.apy:.2%} through the target vault"
+        )
@@ -0,0 +1,208 @@
+"""
+Batch quoting on top of `scripts/stableswap.py`: the result of a single sided
+add_liquidity / remove_liquidity_one_coin for thousands of sizes at once.
+
+The exact path runs the StableSwap iterations on NumPy object arrays of python
+ints, so every size matches `stableswap.Pool` (and the pool) to the wei. The float
+path runs the same iterations in float64, then re-quotes `verify` of the sizes
+exactly and fails if they are off by more than `rtol`. Use it to scan, and the
+exact path to size the transaction you send.
+
+    pool = stableswap.from_contract(three_pool, crv3, 3)
+    amounts = [int(x) * 10 ** 18 for x in np.linspace(1, 5_000_000, 5000)]
+    impact = deposit_impact(pool, 0, amounts)
+    size = max_size(amounts, impact, 0.001)
+"""
+import numpy as np
+
+from scripts.stableswap import FEE_DENOMINATOR, MAX_ITERATIONS, PRECISION
+
+
+def _batch(values, dtype):
+    return np.array(
+        [int(v) for v in values] if dtype is object else values, dtype=dtype
+    )
+
+
+def get_D(xp, amp, a_precision=1):
+    """`stableswap.get_D` for every row of `xp` (batch x coins)."""
+    n = xp.shape[1]
+    S = xp.sum(axis=1)
+    D = S.copy()
+    Ann = amp * n
+    active = (S != 0).astype(bool)
+    for _ in range(MAX_ITERATIONS):
+        idx = np.nonzero(active)[0]
+        if len(idx) == 0:
+            break
+        d, x, s = D[idx], xp[idx], S[idx]
+        D_P = d.copy()
+        for k in range(n):
+            D_P = _div(D_P * d, x[:, k] * n)
+        new = _div(
+            (_div(Ann * s, a_precision) + D_P * n) * d,
+            _div((Ann - a_precision) * d, a_precision) + (n + 1) * D_P,
+        )
+        D[idx] = new
+        # rows stop iterating independently, like the contract does per call
+        active[idx[_converged(new, d)]] = False
+    return D
+
+
+def get_y_D(amp, i, xp, D, a_precision=1):
+    """`stableswap.get_y_D` for every row of `xp` against the matching `D`."""
+    n = xp.shape[1]
+    Ann = amp * n
+    c = D.copy()
+    S_ = np.zeros_like(D)
+    for k in range(n):
+        if k == i:
+            continue
+        S_ = S_ + xp[:, k]
+        c = _div(c * D, xp[:, k] * n)
+    c = _div(c * D * a_precision, Ann * n)
+    b = S_ + _div(D * a_precision, Ann)
+
+    y = D.copy()
+    active = np.ones(len(D), dtype=bool)
+    for _ in range(MAX_ITERATIONS):
+        idx = np.nonzero(active)[0]
+        if len(idx) == 0:
+            break
+        prev = y[idx]
+        new = _div(prev * prev + c[idx], 2 * prev + b[idx] - D[idx])
+        y[idx] = new
+        active[idx[_converged(new, prev)]] = False
+    return y
+
+
+def _converged(new, prev):
+    if new.dtype == object:
+        return (abs(new - prev) <= 1).astype(bool)
+    # float64 can't resolve 1 wei at 1e18+ magnitudes
+    return abs(new - prev) <= abs(prev) * 1e-15 + 1
+
+
+def _div(a, b):
+    # floor division on both paths: small amounts of low decimal coins (gUSD has 2)
+    # are rounded by the pool, and the float path has to round them the same way
+    if isinstance(a, np.ndarray) and a.dtype == object:
+        return a // b
+    return np.floor(a / b)
+
+
+def _xp(pool, dtype, rows):
+    xp = np.array([pool.xp()] * rows, dtype=object)
+    return xp if dtype is object else xp.astype(np.float64)
+
+
+def _fee(pool):
+    return pool.fee * pool.n // (4 * (pool.n - 1))
+
+
+def deposit_quotes(pool, i, amounts, dtype=object):
+    """LP tokens minted by add_liquidity of `amounts` of coin `i`, fees included."""
+    amounts = _batch(amounts, dtype)
+    rows = len(amounts)
+    rates = pool.rates
+    old = np.array(
+        [pool.balances] * rows, dtype=object if dtype is object else np.float64
+    )
+    new = old.copy()
+    new[:, i] = new[:, i] + amounts
+
+    def xp(balances):
+        return np.stack(
+            [_div(balances[:, k] * rates[k], PRECISION) for k in range(pool.n)], axis=1
+        )
+
+    D0 = get_D(xp(old), pool.amp, pool.a_precision)
+    D1 = get_D(xp(new), pool.amp, pool.a_precision)
+    fee = _fee(pool)
+    charged = new.copy()
+    for k in range(pool.n):
+        ideal = _div(D1 * old[:, k], D0)
+        charged[:, k] = new[:, k] - _div(fee * abs(ideal - new[:, k]), FEE_DENOMINATOR)
+    D2 = get_D(xp(charged), pool.amp, pool.a_precision)
+    return _div(pool.supply * (D2 - D0), D0)
+
+
+def withdraw_quotes(pool, i, token_amounts, dtype=object):
+    """Coin `i` paid out by remove_liquidity_one_coin of `token_amounts` LP tokens."""
+    token_amounts = _batch(token_amounts, dtype)
+    rows = len(token_amounts)
+    xp = _xp(pool, dtype, rows)
+    D0 = get_D(xp, pool.amp, pool.a_precision)
+    D1 = D0 - _div(token_amounts * D0, pool.supply)
+    new_y = get_y_D(pool.amp, i, xp, D1, pool.a_precision)
+
+    fee = _fee(pool)
+    reduced = xp.copy()
+    for k in range(pool.n):
+        if k == i:
+            expected = _div(xp[:, k] * D1, D0) - new_y
+        else:
+            expected = xp[:, k] - _div(xp[:, k] * D1, D0)
+        reduced[:, k] = xp[:, k] - _div(fee * expected, FEE_DENOMINATOR)
+
+    dy = reduced[:, i] - get_y_D(pool.amp, i, reduced, D1, pool.a_precision)
+    return _div((dy - 1) * PRECISION, pool.rates[i])
+
+
+def float_quotes(quote, pool, i, amounts, verify=16, rtol=1e-9):
+    """
+    float64 fast path of `deposit_quotes` / `withdraw_quotes`. Re-quotes `verify`
+    evenly spread sizes exactly and returns (quotes, max relative error seen),
+    raising if that error is above `rtol`.
+    """
+    amounts = list(amounts)
+    quotes = quote(pool, i, amounts, dtype=np.float64)
+    picks = sorted(
+        set(np.linspace(0, len(amounts) - 1, min(verify, len(amounts))).astype(int))
+    )
+    exact = quote(pool, i, [amounts[p] for p in picks])
+    errors = [
+        abs(float(quotes[p]) - int(e)) / max(int(e), 1) for p, e in zip(picks, exact)
+    ]
+    error = max(errors)
+    if error > rtol:
+        raise ValueError(
+            f"float quotes off by {error:.3g} (> {rtol:g}), use the exact path"
+        )
+    return quotes, error
+
+
+def _quotes(quote, pool, i, amounts, fast):
+    if fast:
+        try:
+            return float_quotes(quote, pool, i, amounts)[0]
+        except ValueError:
+            # tiny sizes: D1 - D0 cancels out most of float64's precision
+            pass
+    return quote(pool, i, amounts).astype(float)
+
+
+def deposit_impact(pool, i, amounts, fast=True):
+    """Fraction of value lost depositing each of `amounts`, at the pool's virtual price."""
+    minted = _quotes(deposit_quotes, pool, i, amounts, fast)
+    value_in = (
+        np.array([int(a) for a in amounts], dtype=float) * pool.rates[i] / PRECISION
+    )
+    return 1 - minted * pool.virtual_price / PRECISION / value_in
+
+
+def withdraw_impact(pool, i, token_amounts, fast=True):
+    """Fraction of value lost withdrawing each of `token_amounts` LP tokens as coin `i`."""
+    received = _quotes(withdraw_quotes, pool, i, token_amounts, fast)
+    value_in = (
+        np.array([int(a) for a in token_amounts], dtype=float)
+        * pool.virtual_price
+        / PRECISION
+    )
+    return 1 - received * pool.rates[i] / PRECISION / value_in
+
+
+def max_size(amounts, impact, max_impact):
+    """Largest of `amounts` whose impact is within `max_impact` (0 if none is)."""
+    ok = np.nonzero(np.asarray(impact) <= max_impact)[0]
+    return int(max(int(amounts[k]) for k in ok)) if len(ok) else 0
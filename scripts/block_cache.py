@@ -0,0 +1,153 @@
+"""
+Per-block cache for view calls.
+
+    cache = BlockCache(maxsize=4096)
+    strategy = cache.wrap(Contract(address))
+    with cache.pinned():
+        strategy.estimatedTotalAssets()  # eth_call
+        strategy.estimatedTotalAssets()  # memory
+    cache.stats()  # {"hits": 1, "misses": 1, ...}
+
+Results are keyed by (contract, selector, args, block) and every call is made at
+an explicit block number, so a cached result is exactly what the chain returned at
+that block. The head is looked up per call, or once for the duration of
+`pinned()`, and calls without a block read at it. When the head moves on, results
+read at the old head are dropped. When the last head seen is no longer on the
+chain (chain.revert in tests, a reorg), everything is: the head's hash is kept
+and checked against the new head's parent, so a block re-mined at the same height
+is caught too.
+Least recently used entries are evicted beyond `maxsize`.
+"""
+from collections import OrderedDict
+
+from brownie import web3
+from brownie.network.contract import ContractCall
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if hasattr(value, "address"):
+        return str(value.address)
+    return value
+
+
+class BlockCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        # keys read at the head, dropped once the head moves
+        self.at_head = set()
+        self.head_block = None
+        self.head_hash = None
+        self.pinned_block = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def head(self):
+        if self.pinned_block is not None:
+            return self.pinned_block
+        block = web3.eth.getBlock("latest")
+        self._observe(block.number, block.hash, block.parentHash)
+        return self.head_block
+
+    def _observe(self, block, block_hash, parent_hash):
+        if self.head_block is not None and (block, block_hash) != (
+            self.head_block,
+            self.head_hash,
+        ):
+            if self._extends_head(block, parent_hash):
+                for key in self.at_head:
+                    if self.entries.pop(key, None) is not None:
+                        self.invalidations += 1
+            else:
+                self.invalidations += len(self.entries)
+                self.entries.clear()
+            self.at_head.clear()
+        self.head_block, self.head_hash = block, block_hash
+
+    def _extends_head(self, block, parent_hash):
+        """Whether the last head seen is still an ancestor of `block`."""
+        if block <= self.head_block:
+            # gone back, or the same height with another hash
+            return False
+        if block == self.head_block + 1:
+            return parent_hash == self.head_hash
+        return web3.eth.getBlock(self.head_block).hash == self.head_hash
+
+    def pinned(self):
+        """Context manager: every head call inside it reads one block."""
+        return _Pinned(self)
+
+    def call(self, method, *args, block_identifier=None):
+        """`method(*args)` (a brownie ContractCall) at `block_identifier`, or at the head."""
+        at_head = block_identifier is None
+        # the head is checked for explicit blocks too, so a reorg drops them
+        head = self.head()
+        block = head if at_head else block_identifier
+        key = (str(method._address), method.signature, _freeze(args), block)
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        result = method.call(*args, block_identifier=block)
+        self.entries[key] = result
+        if at_head:
+            self.at_head.add(key)
+        while len(self.entries) > self.maxsize:
+            evicted, _ = self.entries.popitem(last=False)
+            self.at_head.discard(evicted)
+            self.evictions += 1
+        return result
+
+    def wrap(self, contract):
+        """`contract` with its view methods served through the cache."""
+        return CachedContract(contract, self)
+
+    def clear(self):
+        self.entries.clear()
+        self.at_head.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self.entries),
+        }
+
+
+class _Pinned:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __enter__(self):
+        self.cache.pinned_block = None
+        self.cache.pinned_block = self.cache.head()
+        return self.cache.pinned_block
+
+    def __exit__(self, *exc):
+        self.cache.pinned_block = None
+
+
+class CachedContract:
+    def __init__(self, contract, cache):
+        self._contract = contract
+        self._cache = cache
+
+    def __getattr__(self, name):
+        attr = getattr(self._contract, name)
+        # only view methods (ContractCall) are cached, transactions pass through
+        if isinstance(attr, ContractCall):
+            return lambda *args, block_identifier=None: self._cache.call(
+                attr, *args, block_identifier=block_identifier
+            )
+        return attr
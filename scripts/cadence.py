@@ -0,0 +1,144 @@
+"""
+Harvest cadence and `slip` search on top of `scripts/backtest.py`.
+
+    rows = backtest.load("history.csv")
+    ranked = cadence.optimize(rows, {"dai_3pool": 1_000_000}, harvest_gas={"dai_3pool": gas})
+    ranked["dai_3pool"][0]  # best Candidate(harvest_interval=..., slip=..., net_apy=...)
+
+    BACKTEST_DATA=history.csv CADENCE_OUT=cadence.json brownie run cadence
+
+Every (strategy, interval, slip) is one backtest, run on a process pool. Harvests
+trade gas and the round trip of the profit through the pools against the time
+vault deposits (`flows`) sit idle until the next harvest, so without flows or gas
+prices the search has little to trade off. Candidates are ranked by net APY (APY
+when the data has no price for the want), the tightest `slip` first among equals:
+in a replay a looser slip never pays more, on chain it leaves more to sandwiches.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from scripts import backtest
+
+DAY = 24 * 3600
+INTERVALS = [DAY, 2 * DAY, 3 * DAY, 5 * DAY, 7 * DAY, 14 * DAY, 30 * DAY]
+SLIPS = [10, 25, 50, 100, 200]
+
+
+@dataclass(frozen=True)
+class Candidate:
+    strategy: str
+    harvest_interval: int
+    slip: int
+    apy: float
+    net_apy: Optional[float]
+    max_drawdown: float
+    harvests: int
+    failed_harvests: int
+    withdrawal_loss: int
+    harvest_cost: int
+
+    @property
+    def score(self):
+        return self.apy if self.net_apy is None else self.net_apy
+
+
+# set once per worker process, rows are too large to send with every job
+_rows = None
+
+
+def _init(rows):
+    global _rows
+    _rows = rows
+
+
+def _run(job):
+    strategy_id, deposit, interval, slip, kwargs = job
+    result = backtest.run(
+        backtest.ROUTES[strategy_id],
+        _rows,
+        deposit,
+        harvest_interval=interval,
+        slip=slip,
+        strategy_id=strategy_id,
+        **kwargs,
+    )
+    return Candidate(
+        strategy=strategy_id,
+        harvest_interval=interval,
+        slip=slip,
+        apy=result.apy,
+        net_apy=result.net_apy,
+        max_drawdown=result.max_drawdown,
+        harvests=result.harvests,
+        failed_harvests=result.failed_harvests,
+        withdrawal_loss=result.withdrawal_loss,
+        harvest_cost=result.harvest_cost,
+    )
+
+
+def optimize(
+    rows,
+    deposits,
+    harvest_gas,
+    intervals=INTERVALS,
+    slips=SLIPS,
+    flows=None,
+    max_workers=None,
+):
+    """
+    {strategy id: candidates, best first} for the strategies in `deposits` (whole
+    want tokens). `harvest_gas` and `flows` ({timestamp: whole tokens}) are per
+    strategy id.
+    """
+    flows = flows or {}
+    jobs = []
+    for strategy_id, amount in deposits.items():
+        unit = 10 ** backtest.ROUTES[strategy_id].decimals
+        kwargs = {
+            "harvest_gas": harvest_gas.get(strategy_id, 0),
+            "flows": {t: int(a * unit) for t, a in flows.get(strategy_id, {}).items()},
+        }
+        for interval in intervals:
+            for slip in slips:
+                jobs.append((strategy_id, int(amount * unit), interval, slip, kwargs))
+
+    with ProcessPoolExecutor(max_workers, initializer=_init, initargs=(rows,)) as pool:
+        candidates = list(pool.map(_run, jobs, chunksize=max(len(jobs) // 64, 1)))
+
+    ranked = {strategy_id: [] for strategy_id in deposits}
+    for candidate in candidates:
+        ranked[candidate.strategy].append(candidate)
+    for strategy_candidates in ranked.values():
+        strategy_candidates.sort(key=lambda c: (-c.score, c.slip, c.harvest_interval))
+    return ranked
+
+
+def main():
+    rows = backtest.load(os.environ["BACKTEST_DATA"])
+    gas = int(os.environ.get("CADENCE_HARVEST_GAS", 0))
+    deposits = {
+        strategy_id: amount
+        for strategy_id, amount in backtest.DEFAULT_DEPOSITS.items()
+        if f"{backtest.ROUTES[strategy_id].last}_price_per_share" in rows[0]
+        and f"{backtest.ROUTES[strategy_id].base}_virtual_price" in rows[0]
+    }
+    ranked = optimize(rows, deposits, {strategy_id: gas for strategy_id in deposits})
+    best = {
+        strategy_id: asdict(candidates[0]) for strategy_id, candidates in ranked.items()
+    }
+    for strategy_id, candidate in best.items():
+        print(
+            f"{strategy_id}: harvest every {candidate['harvest_interval'] / DAY:g} days, "
+            f"slip {candidate['slip']}, apy {candidate['apy']:.2%}"
+            + (
+                ""
+                if candidate["net_apy"] is None
+                else f", net {candidate['net_apy']:.2%}"
+            )
+        )
+    if os.environ.get("CADENCE_OUT"):
+        with open(os.environ["CADENCE_OUT"], "w") as f:
+            json.dump(best, f, indent=2)
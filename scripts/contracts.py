@@ -0,0 +1,16 @@
+"""
+Contract objects from addresses the scripts read off a strategy (its vault, want,
+pools).
+
+`Contract(address)` only knows deployments brownie saved and, on networks with an
+explorer, verified sources, so it fails for everything deployed on a development
+chain or a fork during the session. `contract_at` returns the object brownie
+already holds for the address (deployed or loaded in this session) first.
+"""
+from brownie import Contract
+from brownie.network.state import _find_contract
+
+
+def contract_at(address):
+    """Brownie contract at `address`, this session's object for it if there is one."""
+    return _find_contract(str(address)) or Contract(str(address))
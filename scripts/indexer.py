@@ -0,0 +1,292 @@
+"""
+Event indexer: vault and strategy logs into a local SQLite store.
+
+    INDEXER_ADDRESSES=<vault>,<strategy>,... INDEXER_FROM=<block> brownie run indexer --network mainnet
+
+    indexer = Indexer(web3, addresses, build_abis(), "events.sqlite", from_block=11_000_000)
+    indexer.sync()                         # from the checkpoints up to head - confirmations
+    indexer.query("StrategyReported")      # [{"block": ..., "address": ..., "gain": ..., ...}]
+    indexer.to_parquet("reports.parquet", "StrategyReported")
+
+Harvested, StrategyReported, Deposit, Withdraw and Transfer logs of the given
+addresses are fetched with one eth_getLogs per block range, for every address and
+event at once. A range the node refuses (too many results, timeout) is split in
+half until it goes through, and the next range is half as long; after a range
+goes through whole, the next one is twice as long, up to `max_span`. Any other
+error is raised.
+
+Logs are decoded with the ABIs of the brownie build: `build/contracts` and, for
+the v2 Vault, the yearn-vaults dependency's build. Events none of the ABIs
+declare are not fetched.
+
+Every range is written together with the checkpoints of the addresses (the last
+block indexed for each) in one transaction, so an interrupted sync resumes where
+it stopped. Addresses added later are indexed from `from_block`; logs already
+stored are not stored twice. Blocks younger than `confirmations` are left for a
+later sync, so reorgs don't leave stale logs behind.
+"""
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from eth_abi import decode_abi, decode_single
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from requests.exceptions import Timeout
+
+EVENTS = ("Harvested", "StrategyReported", "Deposit", "Withdraw", "Transfer")
+BUILD = Path(__file__).parent.parent / "build" / "contracts"
+DB = Path(__file__).parent.parent / "events.sqlite"
+CONFIRMATIONS = 12
+SPAN = 10_000
+MAX_SPAN = 100_000
+# what nodes answer an eth_getLogs range that is too long with: a JSON-RPC error
+# with one of these codes or messages (infura, alchemy, geth, erigon), or a timeout
+RANGE_ERROR_CODES = (-32005,)
+RANGE_ERROR_MESSAGES = (
+    "more than",
+    "too many",
+    "limit exceeded",
+    "response size exceeded",
+    "block range",
+    "range is too large",
+    "timeout",
+    "timed out",
+)
+
+
+def range_refused(exc):
+    """Whether `exc` is a node refusing an eth_getLogs range as too long (or too slow)."""
+    if isinstance(exc, Timeout):
+        return True
+    error = exc.args[0] if exc.args else None
+    if isinstance(error, dict):
+        if error.get("code") in RANGE_ERROR_CODES:
+            return True
+        error = error.get("message", "")
+    message = str(error).lower()
+    return any(m in message for m in RANGE_ERROR_MESSAGES)
+
+
+def build_abis(*paths):
+    """ABIs of the contract artifacts under brownie build folders (default: this project's)."""
+    abis = []
+    for path in paths or (BUILD,):
+        for artifact in sorted(Path(path).rglob("*.json")):
+            abi = json.loads(artifact.read_text()).get("abi")
+            if abi:
+                abis.append(abi)
+    return abis
+
+
+def event_abis(abis, names=EVENTS):
+    """topic0 -> event ABI, for the named events in `abis`."""
+    events = {}
+    for abi in abis:
+        for item in abi:
+            if (
+                item.get("type") == "event"
+                and item["name"] in names
+                and not item.get("anonymous")
+            ):
+                events.setdefault("0x" + event_abi_to_log_topic(item).hex(), item)
+    return events
+
+
+def _bytes(value):
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
+
+
+def _hex(value):
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
+
+
+def _plain(type_, value):
+    # JSON friendly values: checksummed addresses, hex bytes
+    if type_ == "address":
+        return to_checksum_address(value)
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_plain(type_.rsplit("[", 1)[0], v) for v in value]
+    return value
+
+
+def decode(log, event):
+    """Arguments of `log`, by name."""
+    inputs = event["inputs"]
+    indexed = [i for i in inputs if i["indexed"]]
+    plain = [i for i in inputs if not i["indexed"]]
+    values = {}
+    for item, topic in zip(indexed, log["topics"][1:]):
+        if item["type"] in ("string", "bytes") or item["type"].endswith("]"):
+            # dynamic indexed values are only there as their hash
+            values[item["name"]] = _hex(topic)
+        else:
+            values[item["name"]] = _plain(
+                item["type"], decode_single(item["type"], _bytes(topic))
+            )
+    data = decode_abi([i["type"] for i in plain], _bytes(log["data"]))
+    for item, value in zip(plain, data):
+        values[item["name"]] = _plain(item["type"], value)
+    return {item["name"]: values[item["name"]] for item in inputs}
+
+
+class Indexer:
+    def __init__(
+        self,
+        web3,
+        addresses,
+        abis,
+        path=DB,
+        from_block=0,
+        confirmations=CONFIRMATIONS,
+        span=SPAN,
+        max_span=MAX_SPAN,
+    ):
+        self.web3 = web3
+        self.addresses = [to_checksum_address(str(a)) for a in addresses]
+        self.topics = event_abis(abis)
+        self.from_block = from_block
+        self.confirmations = confirmations
+        self.span = span
+        self.max_span = max_span
+        self.requests = 0
+        self.splits = 0
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                block INTEGER, log_index INTEGER, tx TEXT, address TEXT, event TEXT, args TEXT,
+                PRIMARY KEY (block, log_index)
+            );
+            CREATE INDEX IF NOT EXISTS events_by_name ON events (event, address, block);
+            CREATE TABLE IF NOT EXISTS checkpoints (address TEXT PRIMARY KEY, block INTEGER);
+            """
+        )
+
+    def checkpoints(self):
+        """address -> last block indexed for it"""
+        stored = dict(self.db.execute("SELECT address, block FROM checkpoints"))
+        return {a: stored.get(a, self.from_block - 1) for a in self.addresses}
+
+    def fetch(self, start, end):
+        """Logs of blocks [start, end], halving the range while the node refuses it."""
+        self.requests += 1
+        try:
+            return self.web3.eth.getLogs(
+                {
+                    "address": self.addresses,
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "topics": [list(self.topics)],
+                }
+            )
+        except (ValueError, Timeout) as exc:
+            if start == end or not range_refused(exc):
+                raise
+            self.splits += 1
+            middle = (start + end) // 2
+            return self.fetch(start, middle) + self.fetch(middle + 1, end)
+
+    def store(self, logs, end):
+        rows = []
+        for log in logs:
+            event = self.topics[_hex(log["topics"][0])]
+            rows.append(
+                (
+                    log["blockNumber"],
+                    log["logIndex"],
+                    _hex(log["transactionHash"]),
+                    to_checksum_address(log["address"]),
+                    event["name"],
+                    json.dumps(decode(log, event)),
+                )
+            )
+        checkpoints = [(a, max(block, end)) for a, block in self.checkpoints().items()]
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", checkpoints
+            )
+
+    def sync(self, to_block=None):
+        """Index up to `to_block` (default: head less confirmations). Returns the logs fetched."""
+        if to_block is None:
+            to_block = self.web3.eth.blockNumber - self.confirmations
+        start = min(self.checkpoints().values()) + 1
+        fetched = 0
+        while start <= to_block:
+            end = min(start + self.span - 1, to_block)
+            splits = self.splits
+            logs = self.fetch(start, end)
+            self.store(logs, end)
+            fetched += len(logs)
+            if self.splits == splits:
+                self.span = min(self.span * 2, self.max_span)
+            else:
+                self.span = max(self.span // 2, 1)
+            start = end + 1
+        return fetched
+
+    def query(self, event, address=None):
+        """Stored `event` logs, optionally of one address, in chain order."""
+        sql = "SELECT block, log_index, tx, address, args FROM events WHERE event = ?"
+        params = [event]
+        if address is not None:
+            sql += " AND address = ?"
+            params.append(to_checksum_address(str(address)))
+        rows = self.db.execute(sql + " ORDER BY block, log_index", params)
+        return [
+            {
+                "block": block,
+                "log_index": log_index,
+                "tx": tx,
+                "address": address,
+                **json.loads(args),
+            }
+            for block, log_index, tx, address, args in rows
+        ]
+
+    def to_parquet(self, path, event, address=None):
+        """Write stored `event` logs to Parquet, one column per argument. Needs pyarrow."""
+        import pyarrow
+        import pyarrow.parquet
+
+        rows = self.query(event, address)
+        columns = {
+            name: [row[name] for row in rows] for name in (rows[0] if rows else {})
+        }
+        for name, values in columns.items():
+            # uint256 amounts don't fit an int64 column: those go in as decimal strings
+            if any(
+                isinstance(v, int) and not -(2 ** 63) <= v < 2 ** 63 for v in values
+            ):
+                columns[name] = [str(v) for v in values]
+        pyarrow.parquet.write_table(pyarrow.table(columns), str(path))
+        return len(rows)
+
+
+def main():
+    from brownie import network, web3
+    from brownie._config import _get_data_folder
+
+    print(f"You are using the '{network.show_active()}' network")
+    vaults = _get_data_folder().joinpath(
+        "packages", "iearn-finance", "yearn-vaults@0.3.0", "build", "contracts"
+    )
+    indexer = Indexer(
+        web3,
+        os.environ["INDEXER_ADDRESSES"].split(","),
+        build_abis(BUILD, vaults),
+        os.environ.get("INDEXER_DB", DB),
+        from_block=int(os.environ.get("INDEXER_FROM", 0)),
+    )
+    fetched = indexer.sync()
+    print(
+        f"{fetched} logs fetched in {indexer.requests} eth_getLogs ({indexer.splits} ranges split)"
+    )
@@ -0,0 +1,231 @@
+"""
+Keeper: watches strategies and harvests the ones worth harvesting.
+
+    brownie run keeper --network mainnet
+
+Strategy addresses come from KEEPER_STRATEGIES (comma separated), the account
+from KEEPER_ACCOUNT (a brownie account id). Every poll, the state of all
+strategies is read concurrently: assets vs debt, debt outstanding, last report
+and the cost of a harvest at the current gas price. A strategy is harvested when
+  - it has not reported for longer than its maxReportDelay, or
+  - what the harvest moves (profit, credit the vault has for it and debt the
+    vault wants back), priced in ETH, is `profit_factor` times the harvest's gas
+    cost, as in StrategyCurveLP.harvestTrigger. Dust credit or debt waits.
+Brownie calls block, so reads run on a thread pool; transactions go through a
+single worker so the account's nonces stay in order. With a `Preflight`
+(scripts/preflight.py), harvests are simulated first and only sent if they succeed;
+with KEEPER_TUNE=1 a harvest reverting on slippage is sent with the settings the
+pre-flight suggests, if the account may set them.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+from brownie import Contract, accounts, interface, network, web3
+
+from scripts.contracts import contract_at
+from scripts.preflight import Preflight
+
+UNISWAP_ROUTER = "0x7a250d5630B4cF539739dF2C5dAcD4c659F2488D"
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+POLL_SECONDS = 60
+PROFIT_FACTOR = 5
+# reads in flight at once, across all strategies
+MAX_READS = 32
+
+
+@dataclass(frozen=True)
+class StrategyState:
+    strategy: str
+    name: str
+    want: str
+    total_assets: int
+    total_debt: int
+    debt_outstanding: int
+    credit_available: int
+    last_report: int
+    max_report_delay: int
+    gas_price: int
+    harvest_gas: int
+    # ETH per whole want token, in wei
+    want_price: int
+    decimals: int
+
+    @property
+    def profit(self):
+        return max(self.total_assets - self.total_debt, 0)
+
+    def in_eth(self, amount):
+        return amount * self.want_price // 10 ** self.decimals
+
+    @property
+    def profit_in_eth(self):
+        return self.in_eth(self.profit)
+
+    @property
+    def harvest_cost(self):
+        return self.harvest_gas * self.gas_price
+
+
+def uniswap_price(want, decimals):
+    """ETH (wei) for one whole `want` token, from the uniswap v2 router."""
+    if want == WETH:
+        return 10 ** 18
+    return interface.Uni(UNISWAP_ROUTER).getAmountsOut(10 ** decimals, [want, WETH])[-1]
+
+
+class Keeper:
+    def __init__(
+        self,
+        account,
+        strategies,
+        price=uniswap_price,
+        profit_factor=PROFIT_FACTOR,
+        poll=POLL_SECONDS,
+        dry_run=False,
+        preflight=None,
+    ):
+        self.account = account
+        self.strategies = list(strategies)
+        self.price = price
+        self.profit_factor = profit_factor
+        self.poll = poll
+        self.dry_run = dry_run
+        self.preflight = preflight
+        self.reads = ThreadPoolExecutor(MAX_READS)
+        self.sends = ThreadPoolExecutor(1)
+        # strategy -> (vault, want, want decimals): fixed for a strategy, so resolved once
+        # here rather than on the event loop every tick
+        self.contracts = {s.address: self._contracts(s) for s in self.strategies}
+
+    @staticmethod
+    def _contracts(strategy):
+        want = contract_at(strategy.want())
+        return contract_at(strategy.vault()), want, want.decimals()
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.reads, partial(fn, *args)
+        )
+
+    async def read(self, strategy):
+        vault, want, decimals = self.contracts[strategy.address]
+        (
+            name,
+            total_assets,
+            params,
+            debt_outstanding,
+            credit_available,
+            max_report_delay,
+            gas_price,
+            harvest_gas,
+        ) = await asyncio.gather(
+            self._call(strategy.name),
+            self._call(strategy.estimatedTotalAssets),
+            self._call(vault.strategies, strategy),
+            self._call(vault.debtOutstanding, strategy),
+            self._call(vault.creditAvailable, strategy),
+            self._call(strategy.maxReportDelay),
+            self._call(lambda: web3.eth.gasPrice),
+            self._call(strategy.harvest.estimate_gas, {"from": self.account}),
+        )
+        want_price = await self._call(self.price, want.address, decimals)
+        return StrategyState(
+            strategy=strategy.address,
+            name=name,
+            want=want.address,
+            total_assets=total_assets,
+            total_debt=params.dict()["totalDebt"],
+            debt_outstanding=debt_outstanding,
+            credit_available=credit_available,
+            last_report=params.dict()["lastReport"],
+            max_report_delay=max_report_delay,
+            gas_price=gas_price,
+            harvest_gas=harvest_gas,
+            want_price=want_price,
+            decimals=decimals,
+        )
+
+    def should_harvest(self, state, now):
+        """(harvest?, reason), `now` being the latest block's timestamp"""
+        if now - state.last_report > state.max_report_delay:
+            return True, "max report delay"
+        moved = {
+            "debt outstanding": state.debt_outstanding,
+            "credit available": state.credit_available,
+            "profitable": state.profit,
+        }
+        if state.in_eth(sum(moved.values())) > self.profit_factor * state.harvest_cost:
+            # named after what the harvest mostly moves
+            return True, max(moved, key=moved.get)
+        return False, "not profitable"
+
+    async def harvest(self, strategy):
+        loop = asyncio.get_running_loop()
+        if self.preflight is not None:
+            return await loop.run_in_executor(
+                self.sends, partial(self.preflight.harvest, strategy)
+            )
+        return await loop.run_in_executor(
+            self.sends, partial(strategy.harvest, {"from": self.account})
+        )
+
+    async def tick(self):
+        """Read every strategy, harvest those due. Returns {address: (harvested, reason)}."""
+        now, *states = await asyncio.gather(
+            self._call(lambda: web3.eth.getBlock("latest").timestamp),
+            *(self.read(s) for s in self.strategies),
+            return_exceptions=True,
+        )
+        if isinstance(now, Exception):
+            raise now
+
+        decisions = {}
+        due = []
+        for strategy, state in zip(self.strategies, states):
+            if isinstance(state, Exception):
+                decisions[strategy.address] = (False, f"read failed: {state!r}")
+                continue
+            harvest, reason = self.should_harvest(state, now)
+            decisions[strategy.address] = (harvest, reason)
+            if harvest:
+                due.append(strategy)
+            print(
+                f"{state.name} [{strategy.address}]: {'harvest' if harvest else 'skip'} ({reason})"
+            )
+
+        if not self.dry_run:
+            results = await asyncio.gather(
+                *(self.harvest(s) for s in due), return_exceptions=True
+            )
+            for strategy, result in zip(due, results):
+                if isinstance(result, Exception):
+                    decisions[strategy.address] = (False, f"harvest failed: {result!r}")
+                elif self.preflight is not None and not result.sent:
+                    decisions[strategy.address] = (
+                        False,
+                        f"harvest reverts: {result.reason}",
+                    )
+        return decisions
+
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            await self.tick()
+            await asyncio.sleep(max(self.poll - (time.monotonic() - started), 0))
+
+
+def main():
+    print(f"You are using the '{network.show_active()}' network")
+    account = accounts.load(os.environ["KEEPER_ACCOUNT"])
+    strategies = [
+        Contract(address) for address in os.environ["KEEPER_STRATEGIES"].split(",")
+    ]
+    dry_run = os.environ.get("KEEPER_DRY_RUN", "").lower() in ("1", "true")
+    tune = os.environ.get("KEEPER_TUNE", "").lower() in ("1", "true")
+    preflight = Preflight(account, tune=tune)
+    asyncio.run(Keeper(account, strategies, dry_run=dry_run, preflight=preflight).run())
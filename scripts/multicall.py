@@ -0,0 +1,134 @@
+"""
+Batched reads: the state of N strategies in one Multicall eth_call per block.
+
+    reader = StrategyReader(Multicall.at(MULTICALL), strategies)
+    for snap in reader.snapshot():
+        print(snap.strategy, snap.estimated_total_assets, snap.total_debt)
+
+Each strategy's route (vault, pools, target vault) is read once when the reader
+is built; every `snapshot` after that is a single `aggregate` call, pinned to
+one block. The local chain uses the stand-in in contracts/test/Multicall.sol.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from brownie import ZERO_ADDRESS, interface
+
+from scripts.contracts import contract_at
+
+# MakerDAO Multicall on mainnet
+MULTICALL = "0xeefBa1e63905eF1D7ACbA5a8513c70307C1cE441"
+
+
+@dataclass(frozen=True)
+class StrategySnapshot:
+    block: int
+    strategy: str
+    vault: str
+    balance_of_want: int
+    balance_of_stake: int
+    # value of the LP tokens held outside the target vault, in want
+    balance_of_pool: int
+    estimated_total_assets: int
+    total_debt: int
+    last_report: int
+    base_virtual_price: int
+    # None without a metapool
+    meta_virtual_price: Optional[int]
+    price_per_share: int
+
+
+class Batch:
+    """Brownie contract calls queued up and run through one `aggregate`."""
+
+    def __init__(self, multicall):
+        self.multicall = multicall
+        self.calls = []
+
+    def add(self, method, *args):
+        self.calls.append((method, args))
+        return len(self.calls) - 1
+
+    def run(self, block_identifier=None):
+        """(block number, decoded results in the order they were added)"""
+        encoded = [
+            (method._address, method.encode_input(*args)) for method, args in self.calls
+        ]
+        kwargs = (
+            {} if block_identifier is None else {"block_identifier": block_identifier}
+        )
+        block, data = self.multicall.aggregate.call(encoded, **kwargs)
+        return (
+            block,
+            [method.decode_output(ret) for (method, _), ret in zip(self.calls, data)],
+        )
+
+
+class StrategyReader:
+    def __init__(self, multicall, strategies):
+        self.multicall = multicall
+        self.strategies = list(strategies)
+        self.routes = [self._route(s) for s in self.strategies]
+
+    @staticmethod
+    def _route(strategy):
+        meta_pool = strategy.metaPool()
+        return {
+            "vault": contract_at(strategy.vault()),
+            "base_pool": interface.ICurve(strategy.basePool()),
+            "meta_pool": None
+            if meta_pool == ZERO_ADDRESS
+            else interface.ICurve(meta_pool),
+            "target_vault": interface.Vault(strategy.targetVault()),
+        }
+
+    def snapshot(self, block_identifier=None) -> List[StrategySnapshot]:
+        batch = Batch(self.multicall)
+        slots = []
+        for strategy, route in zip(self.strategies, self.routes):
+            slots.append(
+                {
+                    "balance_of_want": batch.add(strategy.balanceOfWant),
+                    "balance_of_stake": batch.add(strategy.balanceOfStake),
+                    "balance_of_pool": batch.add(strategy.balanceOfPool, 0),
+                    "estimated_total_assets": batch.add(strategy.estimatedTotalAssets),
+                    "params": batch.add(route["vault"].strategies, strategy),
+                    "base_virtual_price": batch.add(
+                        route["base_pool"].get_virtual_price
+                    ),
+                    "meta_virtual_price": (
+                        batch.add(route["meta_pool"].get_virtual_price)
+                        if route["meta_pool"]
+                        else None
+                    ),
+                    "price_per_share": batch.add(
+                        route["target_vault"].getPricePerFullShare
+                    ),
+                }
+            )
+
+        block, results = batch.run(block_identifier)
+        snapshots = []
+        for strategy, route, slot in zip(self.strategies, self.routes, slots):
+            params = results[slot["params"]]
+            snapshots.append(
+                StrategySnapshot(
+                    block=block,
+                    strategy=strategy.address,
+                    vault=route["vault"].address,
+                    balance_of_want=results[slot["balance_of_want"]],
+                    balance_of_stake=results[slot["balance_of_stake"]],
+                    balance_of_pool=results[slot["balance_of_pool"]],
+                    estimated_total_assets=results[slot["estimated_total_assets"]],
+                    total_debt=params.dict()["totalDebt"],
+                    last_report=params.dict()["lastReport"],
+                    base_virtual_price=results[slot["base_virtual_price"]],
+                    meta_virtual_price=(
+                        None
+                        if slot["meta_virtual_price"] is None
+                        else results[slot["meta_virtual_price"]]
+                    ),
+                    price_per_share=results[slot["price_per_share"]],
+                )
+            )
+        return snapshots
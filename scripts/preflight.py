@@ -0,0 +1,381 @@
+"""
+Pre-flight for keeper transactions: simulate first, broadcast only what succeeds.
+
+    preflight = Preflight(account)
+    preflight.harvest(strategy)
+    preflight.withdraw(vault, shares, max_loss=1)
+
+Every transaction is first run as an eth_call against the pending block. A
+revert is reported with its decoded reason and nothing is sent; a success is
+reported with its projected gas and sent with that gas (plus a margin).
+
+A reverting transaction is retried with adjusted parameters before giving up:
+  - a harvest reverting on a pool's minimum mint: the slip the deposit needs,
+    with quoteSlippage as it is and turned on, is worked out off-chain from
+    stableswap models of the route's pools (up to `max_slip`). Each candidate is
+    tried as an eth_call of the harvest with the strategy's packed tunables
+    overridden, where the node takes state overrides (geth, erigon; not ganache).
+    The first one going through is reported as `outcome.suggested`, or the first
+    candidate, unverified, where overrides aren't there. Nothing is changed
+    on-chain: a keeper doesn't loosen a strategy's guard on its own. With
+    `tune=True`, an account that may set them (strategist, governance) applies
+    the suggestion, harvests and puts the settings back right after, three
+    transactions. `max_slip` defaults to the strategies' own default slip (1%).
+  - vault.withdraw reverting: maxLoss doubled up to `max_loss_limit`.
+With dry_run, nothing is sent.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from brownie import ZERO_ADDRESS, web3
+from eth_abi import decode_abi
+
+from scripts import stableswap
+from scripts.contracts import contract_at
+
+# Error(string)
+ERROR_SELECTOR = "0x08c379a0"
+# revert reasons of a pool's (or the router's) minimum LP check on deposit
+SLIPPAGE_REASONS = ("Slippage screw", "!minLp")
+# StrategyCurveLP's default slip
+MAX_SLIP = 100
+MAX_LOSS = 100
+DENOMINATOR = 10_000
+# gas sent on top of the projection, in percent
+GAS_MARGIN = 20
+# StrategyCurveLP's tunables, packed into BaseStrategy's emergencyExit slot:
+# (getter, byte offset, bytes), see tests/test_storage_layout.py
+TUNABLES = (
+    ("emergencyExit", 0, 1),
+    ("slip", 1, 2),
+    ("maxImpact", 3, 2),
+    ("wantFloat", 5, 2),
+    ("quoteSlippage", 7, 1),
+    ("minInvest", 8, 16),
+)
+# slots searched for them
+LAYOUT_SLOTS = 32
+
+
+@dataclass(frozen=True)
+class Simulation:
+    ok: bool
+    gas: Optional[int] = None
+    reason: Optional[str] = None
+
+
+@dataclass
+class Outcome:
+    label: str
+    simulations: List[Simulation] = field(default_factory=list)
+    # adjustments made, in order, e.g. "quoteSlippage on", "slip 20", "maxLoss 4"
+    adjustments: List[str] = field(default_factory=list)
+    # settings a reverting harvest would go through with, e.g. {"quoteSlippage": True, "slip": 40}
+    suggested: Dict[str, Any] = field(default_factory=dict)
+    # whether a harvest simulated with `suggested` went through, or only the models say so
+    verified: bool = False
+    tx: Any = None
+
+    @property
+    def sent(self):
+        return self.tx is not None
+
+    @property
+    def reason(self):
+        return self.simulations[-1].reason if self.simulations else None
+
+
+def decode_revert(data):
+    """Reason string of ABI encoded Error(string) revert data, None for anything else."""
+    if not isinstance(data, str) or not data.startswith(ERROR_SELECTOR):
+        return None
+    try:
+        return decode_abi(["string"], bytes.fromhex(data[len(ERROR_SELECTOR) :]))[0]
+    except Exception:
+        return None
+
+
+def revert_reason(exc):
+    """Revert reason out of the error a node returned for an eth_call or estimate."""
+    error = exc.args[0] if exc.args else None
+    if not isinstance(error, dict):
+        # geth style, or a web3 ContractLogicError: "execution reverted: <reason>"
+        message = str(error or exc)
+        return message.split("reverted: ", 1)[1] if "reverted: " in message else None
+    data = error.get("data")
+    if isinstance(data, str):
+        return decode_revert(data)
+    if isinstance(data, dict):
+        # ganache: {txhash: {"error": "revert", "reason": ..., "return": ...}, "stack": ..., "name": ...}
+        for value in data.values():
+            if isinstance(value, dict) and ("reason" in value or "return" in value):
+                return value.get("reason") or decode_revert(value.get("return"))
+    message = error.get("message", "")
+    return message.split("revert ", 1)[1] if "revert " in message else None
+
+
+def simulate(fn, *args, sender, overrides=None):
+    """eth_call of `fn(*args)` from `sender` against the pending block, and its gas.
+
+    With state `overrides` ({address: {"stateDiff": {slot: value}}}), only the call
+    runs: nodes don't estimate gas over them.
+    """
+    tx = {"from": str(sender), "to": fn._address, "data": fn.encode_input(*args)}
+    try:
+        if overrides:
+            web3.eth.call(tx, "pending", overrides)
+            return Simulation(True)
+        web3.eth.call(tx, "pending")
+        gas = web3.eth.estimateGas(tx, "pending")
+    except ValueError as exc:
+        return Simulation(False, reason=revert_reason(exc))
+    return Simulation(True, gas=gas)
+
+
+def _short(minted, expected):
+    # bps `minted` falls short of `expected`, rounded up
+    return max(-(-(expected - minted) * DENOMINATOR // expected), 0) if expected else 0
+
+
+def deposit_shortfall(strategy, amount):
+    """
+    bps the LP minted by depositing `amount` want along `strategy`'s route falls
+    short of the expected amount its minimums are taken from, without and with
+    quoteSlippage: the smallest `slip` each needs. From stableswap models of the
+    route's pools at their current state; None for routes through a router, which
+    the models don't follow, and when nothing is deposited.
+    """
+    if amount == 0 or strategy.router() != ZERO_ADDRESS:
+        return None
+    base = stableswap.from_contract(
+        contract_at(strategy.basePool()), strategy.baseLp(), strategy.baseCoins()
+    )
+    amounts = [0] * base.n
+    amounts[strategy.baseIndex()] = amount
+    minted = base.add_liquidity(amounts)
+    legs = [
+        (
+            minted,
+            amount * strategy.wantScale() * stableswap.PRECISION // base.virtual_price,
+        ),
+        (minted, base.calc_token_amount(amounts, True)),
+    ]
+    if strategy.metaPool() != ZERO_ADDRESS:
+        meta = stableswap.from_contract(
+            contract_at(strategy.metaPool()), strategy.metaLp(), 2
+        )
+        meta_amounts = [0, 0]
+        meta_amounts[strategy.metaIndex()] = minted
+        meta_minted = meta.add_liquidity(meta_amounts)
+        legs += [
+            (meta_minted, minted * base.virtual_price // meta.virtual_price),
+            (meta_minted, meta.calc_token_amount(meta_amounts, True)),
+        ]
+    unquoted = max(_short(*leg) for leg in legs[0::2])
+    quoted = max(_short(*leg) for leg in legs[1::2])
+    return unquoted, quoted
+
+
+def investable(strategy):
+    """
+    Want the next harvest deposits, roughly: the strategy's balance and the vault's
+    credit, less the debt the vault wants back and the float.
+    """
+    vault = contract_at(strategy.vault())
+    amount = contract_at(strategy.want()).balanceOf(strategy) + vault.creditAvailable(
+        strategy
+    )
+    amount -= vault.debtOutstanding(strategy)
+    amount -= (
+        vault.strategies(strategy).dict()["totalDebt"]
+        * strategy.wantFloat()
+        // DENOMINATOR
+    )
+    return max(amount, 0)
+
+
+def tunables_slot(strategy):
+    """(slot, word) of `strategy`'s packed tunables, None when no slot holds what the getters return."""
+    expected = {name: int(getattr(strategy, name)()) for name, _, _ in TUNABLES}
+    for slot in range(LAYOUT_SLOTS):
+        word = int(web3.eth.getStorageAt(strategy.address, slot).hex(), 16)
+        if all(
+            (word >> 8 * offset) & ((1 << 8 * size) - 1) == expected[name]
+            for name, offset, size in TUNABLES
+        ):
+            return slot, word
+    return None
+
+
+def with_settings(word, settings):
+    """The tunables' slot `word` with `settings` ({getter: value}) written into it."""
+    for name, offset, size in TUNABLES:
+        if name in settings:
+            mask = ((1 << 8 * size) - 1) << 8 * offset
+            word = (word & ~mask) | (int(settings[name]) << 8 * offset)
+    return word
+
+
+def overrides_work(strategy, slot, word):
+    """Whether the node runs eth_call over state overrides, probed on `strategy`'s slip."""
+    if "TestRPC/v2." in web3.clientVersion:
+        # ganache 6 (ganache-core 2) has no state overrides
+        return False
+    probe = strategy.slip() ^ 1
+    call = {"to": strategy.address, "data": strategy.slip.encode_input()}
+    try:
+        result = web3.eth.call(
+            call,
+            "pending",
+            _override(strategy, slot, with_settings(word, {"slip": probe})),
+        )
+    except (ValueError, TypeError):
+        return False
+    return int(result.hex(), 16) == probe
+
+
+def _override(strategy, slot, word):
+    return {strategy.address: {"stateDiff": {f"0x{slot:064x}": f"0x{word:064x}"}}}
+
+
+def describe(settings):
+    return [
+        f"quoteSlippage {'on' if value else 'off'}"
+        if name == "quoteSlippage"
+        else f"{name} {value}"
+        for name, value in settings.items()
+    ]
+
+
+class Preflight:
+    def __init__(
+        self,
+        account,
+        max_slip=MAX_SLIP,
+        max_loss_limit=MAX_LOSS,
+        dry_run=False,
+        tune=False,
+    ):
+        self.account = account
+        self.max_slip = max_slip
+        self.max_loss_limit = max_loss_limit
+        self.dry_run = dry_run
+        # apply a harvest's suggested settings on-chain for it (and put them back)
+        self.tune = tune
+
+    def _try(self, outcome, fn, *args):
+        simulation = simulate(fn, *args, sender=self.account)
+        outcome.simulations.append(simulation)
+        if simulation.ok:
+            print(f"{outcome.label}: ok, {simulation.gas} gas")
+            if not self.dry_run:
+                gas_limit = simulation.gas * (100 + GAS_MARGIN) // 100
+                outcome.tx = fn(*args, {"from": self.account, "gas_limit": gas_limit})
+        else:
+            print(
+                f"{outcome.label}: reverts ({simulation.reason or 'no reason'}), not sent"
+            )
+        return simulation.ok
+
+    def send(self, fn, *args, label=None):
+        """Simulate `fn(*args)` and send it if it succeeds."""
+        outcome = Outcome(label or fn._name)
+        self._try(outcome, fn, *args)
+        return outcome
+
+    def _may_tune(self, strategy):
+        return str(self.account) in (strategy.strategist(), strategy.governance())
+
+    def candidates(self, strategy):
+        """Settings ({getter: value}) to retry a harvest reverting on slippage with, tightest first."""
+        slip, quoted = strategy.slip(), strategy.quoteSlippage()
+        short = deposit_shortfall(strategy, investable(strategy))
+        found = []
+        for mode in [quoted] if quoted else [False, True]:
+            # the slip the models give, then doubled up to max_slip for what they miss
+            value = slip if short is None else max(short[mode], slip)
+            while value <= self.max_slip:
+                settings = {"quoteSlippage": mode} if mode != quoted else {}
+                if value != slip:
+                    settings["slip"] = value
+                if settings and settings not in found:
+                    found.append(settings)
+                if value == self.max_slip:
+                    break
+                value = min(max(value, 1) * 2, self.max_slip)
+        return sorted(found, key=lambda settings: settings.get("slip", slip))
+
+    def suggest(self, outcome, strategy):
+        """Set `outcome.suggested` to settings the reverted harvest goes through with."""
+        candidates = self.candidates(strategy)
+        layout = tunables_slot(strategy) if candidates else None
+        if layout is not None and overrides_work(strategy, *layout):
+            slot, word = layout
+            for settings in candidates:
+                overrides = _override(strategy, slot, with_settings(word, settings))
+                simulation = simulate(
+                    strategy.harvest, sender=self.account, overrides=overrides
+                )
+                outcome.simulations.append(simulation)
+                if simulation.ok:
+                    outcome.suggested, outcome.verified = settings, True
+                    break
+        elif candidates:
+            outcome.suggested = candidates[0]
+
+        if outcome.suggested:
+            checked = (
+                "simulated"
+                if outcome.verified
+                else "stableswap models only, not simulated"
+            )
+            print(
+                f"{outcome.label}: goes through with {', '.join(describe(outcome.suggested))} ({checked})"
+            )
+        else:
+            print(
+                f"{outcome.label}: no setting up to slip {self.max_slip} goes through"
+            )
+
+    def harvest(self, strategy):
+        outcome = Outcome(f"harvest {strategy.address}")
+        if self._try(outcome, strategy.harvest):
+            return outcome
+        if not any(r in (outcome.reason or "") for r in SLIPPAGE_REASONS):
+            return outcome
+        self.suggest(outcome, strategy)
+        if (
+            outcome.suggested
+            and self.tune
+            and not self.dry_run
+            and self._may_tune(strategy)
+        ):
+            self._tuned_harvest(outcome, strategy)
+        return outcome
+
+    def _tuned_harvest(self, outcome, strategy):
+        setters = {"slip": strategy.setSlip, "quoteSlippage": strategy.setQuoteSlippage}
+        original = {name: getattr(strategy, name)() for name in outcome.suggested}
+        try:
+            for name, value in outcome.suggested.items():
+                adjustment = describe({name: value})[0]
+                if not self.send(setters[name], value, label=adjustment).sent:
+                    return
+                outcome.adjustments.append(adjustment)
+            self._try(outcome, strategy.harvest)
+        finally:
+            # the adjustments were for this harvest only
+            for name, value in original.items():
+                if getattr(strategy, name)() != value:
+                    self.send(setters[name], value, label=describe({name: value})[0])
+
+    def withdraw(self, vault, shares, max_loss=1, recipient=None):
+        recipient = recipient or self.account
+        withdraw = vault.withdraw["uint256,address,uint256"]
+        outcome = Outcome(f"withdraw {shares} from {vault.address}")
+        while not self._try(outcome, withdraw, shares, recipient, max_loss):
+            if self.dry_run or max_loss >= self.max_loss_limit:
+                break
+            max_loss = min(max(max_loss, 1) * 2, self.max_loss_limit)
+            outcome.adjustments.append(f"maxLoss {max_loss}")
+        return outcome
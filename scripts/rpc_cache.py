@@ -0,0 +1,222 @@
+"""
+Recording JSON-RPC proxy for mainnet fork runs.
+
+    python scripts/rpc_cache.py                 # 127.0.0.1:8546 -> infura, recording
+    python scripts/rpc_cache.py --offline       # replay only, no upstream
+    brownie test --network cached-mainnet-fork
+
+The cached-mainnet-fork network (brownie-config.yml; add it with `brownie networks
+add`, see there) forks through the proxy at the pinned block; mainnet-fork itself
+still forks infura directly. State at or
+before that block never changes, so every eth_getStorageAt / eth_getCode /
+eth_getBalance / eth_getTransactionCount / eth_call / eth_getBlockByNumber
+ganache makes for it is stored in an SQLite file (`.rpc_cache.sqlite`) the first
+time and answered from it after that. Requests for later or symbolic blocks
+("latest") go upstream every time. Once a suite has run, it runs again with
+--offline and no archive node.
+
+Not a brownie script: it has to be up before brownie starts ganache.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import yaml
+
+CONFIG = Path(__file__).parent.parent / "brownie-config.yml"
+CACHE = Path(__file__).parent.parent / ".rpc_cache.sqlite"
+PORT = 8546
+# the network forking through the proxy
+NETWORK = "cached-mainnet-fork"
+
+# method -> position of its block parameter
+BLOCK_PARAM = {
+    "eth_getStorageAt": 2,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getTransactionCount": 1,
+    "eth_call": 1,
+    "eth_getBlockByNumber": 0,
+}
+# the same for every block
+CONSTANT = {"eth_chainId", "net_version"}
+# passed back for a request the upstream answer has nothing for
+UNEXPECTED = {"code": -32603, "message": "no response from upstream"}
+
+
+def fork_block(config=CONFIG, network=NETWORK):
+    """Block `network` is pinned to in brownie-config.yml."""
+    settings = yaml.safe_load(Path(config).read_text())["networks"][network][
+        "cmd_settings"
+    ]
+    return int(settings["fork"].rsplit("@", 1)[1])
+
+
+class RecordingProxy:
+    def __init__(self, upstream, cache_path, pinned_block, offline=False):
+        self.upstream = upstream
+        self.pinned_block = pinned_block
+        self.offline = offline
+        self.db = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, result TEXT)"
+        )
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, request):
+        method, params = request.get("method"), request.get("params") or []
+        if method in CONSTANT:
+            return True
+        if method not in BLOCK_PARAM or len(params) <= BLOCK_PARAM[method]:
+            return False
+        block = params[BLOCK_PARAM[method]]
+        return (
+            isinstance(block, str)
+            and block.startswith("0x")
+            and int(block, 16) <= self.pinned_block
+        )
+
+    @staticmethod
+    def key(request):
+        return json.dumps(
+            [request["method"], request.get("params") or []], sort_keys=True
+        )
+
+    def lookup(self, request):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT result FROM responses WHERE key = ?", (self.key(request),)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def store(self, request, result):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?)",
+                (self.key(request), json.dumps(result)),
+            )
+            self.db.commit()
+
+    def forward(self, requests):
+        if self.offline:
+            return [
+                {
+                    "jsonrpc": "2.0",
+                    "id": r.get("id"),
+                    "error": {"code": -32000, "message": "not cached (offline)"},
+                }
+                for r in requests
+            ]
+        body = json.dumps(requests).encode()
+        request = urllib.request.Request(
+            self.upstream, body, {"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=120) as response:
+            responses = json.loads(response.read())
+        if not isinstance(responses, list):
+            # a batch the node rejects as a whole is answered with one error object
+            error = responses.get("error") if isinstance(responses, dict) else None
+            responses = [
+                {"jsonrpc": "2.0", "id": r.get("id"), "error": error or UNEXPECTED}
+                for r in requests
+            ]
+        # batch responses may come back in any order
+        by_id = {r.get("id"): r for r in responses}
+        return [
+            by_id.get(r.get("id"))
+            or {"jsonrpc": "2.0", "id": r.get("id"), "error": UNEXPECTED}
+            for r in requests
+        ]
+
+    def handle(self, payload):
+        """JSON-RPC response(s) for a request or a batch."""
+        batch = isinstance(payload, list)
+        requests = payload if batch else [payload]
+        responses = [None] * len(requests)
+        missing = []
+        for i, request in enumerate(requests):
+            result = self.lookup(request) if self.cacheable(request) else None
+            if result is None:
+                missing.append(i)
+            else:
+                self.hits += 1
+                responses[i] = {
+                    "jsonrpc": "2.0",
+                    "id": request.get("id"),
+                    "result": result,
+                }
+
+        if missing:
+            forwarded = self.forward([requests[i] for i in missing])
+            for i, response in zip(missing, forwarded):
+                request = requests[i]
+                if self.cacheable(request):
+                    self.misses += 1
+                    if "result" in response and response["result"] is not None:
+                        self.store(request, response["result"])
+                responses[i] = response
+        return responses if batch else responses[0]
+
+    def serve(self, host="127.0.0.1", port=PORT):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                body = json.dumps(proxy.handle(payload)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--upstream",
+        help="archive node URL (default: infura with WEB3_INFURA_PROJECT_ID)",
+    )
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--cache", default=str(CACHE))
+    parser.add_argument(
+        "--offline", action="store_true", help="answer from the cache only"
+    )
+    args = parser.parse_args()
+
+    upstream = (
+        args.upstream
+        or f"https://mainnet.infura.io/v3/{os.environ.get('WEB3_INFURA_PROJECT_ID', '')}"
+    )
+    proxy = RecordingProxy(upstream, args.cache, fork_block(), args.offline)
+    server = proxy.serve(port=args.port)
+    print(
+        f"forwarding 127.0.0.1:{args.port} to {'nothing (offline)' if args.offline else upstream}"
+    )
+    print(f"caching block <= {proxy.pinned_block} in {args.cache}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{proxy.hits} hits, {proxy.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Integer-exact StableSwap math, ported from curve's vyper pools (3pool, sBTC and
+the mUSD / gUSD metapools).
+
+Given a pool's balances, rates, A, fee and LP supply, `Pool` quotes
+add_liquidity, calc_token_amount and remove_liquidity_one_coin to the wei, so
+keepers can size deposits and withdrawals without an eth_call per probe.
+
+Rates are `10 ** (36 - decimals)` per coin. For a metapool the last coin is the
+base pool's LP token, rated at the base pool's virtual price. Mainnet metapools
+cache that price for 10 minutes, so pass the cached `base_virtual_price()` when
+quoting them.
+
+Metapools keep A scaled by A_PRECISION (100); `amp` is always the scaled value
+(`A_precise()`) and `a_precision` the scale, 1 for 3pool and sBTC.
+"""
+from dataclasses import dataclass, replace
+from typing import List, Sequence, Tuple
+
+FEE_DENOMINATOR = 10 ** 10
+PRECISION = 10 ** 18
+MAX_ITERATIONS = 255
+
+ERC20_ABI = [
+    {
+        "name": "decimals",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "name": "totalSupply",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+BASE_POOL_ABI = [
+    {
+        "name": "get_virtual_price",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+def get_D(xp: Sequence[int], amp: int, a_precision: int = 1) -> int:
+    n = len(xp)
+    S = sum(xp)
+    if S == 0:
+        return 0
+
+    D = S
+    Ann = amp * n
+    for _ in range(MAX_ITERATIONS):
+        D_P = D
+        for x in xp:
+            D_P = D_P * D // (x * n)
+        D_prev = D
+        D = (
+            (Ann * S // a_precision + D_P * n)
+            * D
+            // ((Ann - a_precision) * D // a_precision + (n + 1) * D_P)
+        )
+        if abs(D - D_prev) <= 1:
+            break
+    return D
+
+
+def _solve_y(b: int, c: int, D: int) -> int:
+    y = D
+    for _ in range(MAX_ITERATIONS):
+        y_prev = y
+        y = (y * y + c) // (2 * y + b - D)
+        if abs(y - y_prev) <= 1:
+            break
+    return y
+
+
+def get_y(
+    i: int, j: int, x: int, xp: Sequence[int], amp: int, a_precision: int = 1
+) -> int:
+    """Balance of coin `j` (in xp units) keeping D constant when coin `i` is `x`."""
+    assert i != j, "same coin"
+    n = len(xp)
+    D = get_D(xp, amp, a_precision)
+    Ann = amp * n
+    c = D
+    S_ = 0
+    for k in range(n):
+        if k == i:
+            _x = x
+        elif k != j:
+            _x = xp[k]
+        else:
+            continue
+        S_ += _x
+        c = c * D // (_x * n)
+    c = c * D * a_precision // (Ann * n)
+    return _solve_y(S_ + D * a_precision // Ann, c, D)
+
+
+def get_y_D(amp: int, i: int, xp: Sequence[int], D: int, a_precision: int = 1) -> int:
+    """Balance of coin `i` (in xp units) for invariant `D`, the other balances fixed."""
+    n = len(xp)
+    Ann = amp * n
+    c = D
+    S_ = 0
+    for k in range(n):
+        if k == i:
+            continue
+        S_ += xp[k]
+        c = c * D // (xp[k] * n)
+    c = c * D * a_precision // (Ann * n)
+    return _solve_y(S_ + D * a_precision // Ann, c, D)
+
+
+@dataclass(frozen=True)
+class Pool:
+    balances: Tuple[int, ...]
+    rates: Tuple[int, ...]
+    amp: int
+    fee: int
+    supply: int
+    a_precision: int = 1
+
+    @property
+    def n(self) -> int:
+        return len(self.balances)
+
+    def xp(self, balances: Sequence[int] = None) -> List[int]:
+        balances = self.balances if balances is None else balances
+        return [
+            rate * balance // PRECISION for rate, balance in zip(self.rates, balances)
+        ]
+
+    def D(self, balances: Sequence[int] = None) -> int:
+        return get_D(self.xp(balances), self.amp, self.a_precision)
+
+    @property
+    def virtual_price(self) -> int:
+        return self.D() * PRECISION // self.supply
+
+    def calc_token_amount(self, amounts: Sequence[int], deposit: bool = True) -> int:
+        """LP tokens minted (burned) for `amounts`, without fees, as the pool's view does."""
+        sign = 1 if deposit else -1
+        D0 = self.D()
+        D1 = self.D([b + sign * a for b, a in zip(self.balances, amounts)])
+        diff = D1 - D0 if deposit else D0 - D1
+        return diff * self.supply // D0
+
+    def add_liquidity(self, amounts: Sequence[int]) -> int:
+        """LP tokens add_liquidity mints for `amounts`, imbalance fees included."""
+        new_balances = [b + a for b, a in zip(self.balances, amounts)]
+        if self.supply == 0:
+            return self.D(new_balances)
+        D0 = self.D()
+        D1 = self.D(new_balances)
+        assert D1 > D0, "D1 <= D0"
+
+        fee = self.fee * self.n // (4 * (self.n - 1))
+        charged = []
+        for old, new in zip(self.balances, new_balances):
+            ideal = D1 * old // D0
+            charged.append(new - fee * abs(ideal - new) // FEE_DENOMINATOR)
+        D2 = self.D(charged)
+        return self.supply * (D2 - D0) // D0
+
+    def calc_withdraw_one_coin(self, token_amount: int, i: int) -> int:
+        return self._calc_withdraw_one_coin(token_amount, i)[0]
+
+    def _calc_withdraw_one_coin(self, token_amount: int, i: int) -> Tuple[int, int]:
+        xp = self.xp()
+        D0 = get_D(xp, self.amp, self.a_precision)
+        D1 = D0 - token_amount * D0 // self.supply
+        new_y = get_y_D(self.amp, i, xp, D1, self.a_precision)
+        dy_0 = (xp[i] - new_y) * PRECISION // self.rates[i]
+
+        fee = self.fee * self.n // (4 * (self.n - 1))
+        xp_reduced = []
+        for j, x in enumerate(xp):
+            if j == i:
+                dx_expected = x * D1 // D0 - new_y
+            else:
+                dx_expected = x - x * D1 // D0
+            xp_reduced.append(x - fee * dx_expected // FEE_DENOMINATOR)
+
+        dy = xp_reduced[i] - get_y_D(self.amp, i, xp_reduced, D1, self.a_precision)
+        # withdraw less to account for rounding errors
+        dy = (dy - 1) * PRECISION // self.rates[i]
+        return dy, dy_0 - dy
+
+    def with_balances(self, balances: Sequence[int], supply: int = None) -> "Pool":
+        return replace(
+            self,
+            balances=tuple(balances),
+            supply=self.supply if supply is None else supply,
+        )
+
+
+def from_contract(pool, lp_token, n_coins: int, base_virtual_price: int = None) -> Pool:
+    """Snapshot a deployed pool and its LP token (brownie contracts / addresses) into a `Pool`."""
+    # brownie only here: the math above runs without it (batch_quote, backtest, cadence)
+    from brownie import Contract
+
+    coins = [pool.coins(i) for i in range(n_coins)]
+    rates = [
+        10 ** (36 - Contract.from_abi("ERC20", c, ERC20_ABI).decimals()) for c in coins
+    ]
+    base_pool = pool.base_pool() if hasattr(pool, "base_pool") else None
+    if base_pool and int(base_pool, 16):
+        if base_virtual_price is None:
+            base_virtual_price = Contract.from_abi(
+                "BasePool", base_pool, BASE_POOL_ABI
+            ).get_virtual_price()
+        rates[-1] = base_virtual_price
+
+    if hasattr(pool, "A_precise"):
+        amp, a_precision = pool.A_precise(), 100
+    else:
+        amp, a_precision = pool.A(), 1
+
+    return Pool(
+        balances=tuple(pool.balances(i) for i in range(n_coins)),
+        rates=tuple(rates),
+        amp=amp,
+        fee=pool.fee(),
+        supply=Contract.from_abi("ERC20", str(lp_token), ERC20_ABI).totalSupply(),
+        a_precision=a_precision,
+    )
@@ -0,0 +1,16 @@
+import pytest
+
+from gas_report import GasReport
+
+
+@pytest.fixture(scope="session")
+def gas_report(request):
+    report_path = request.config.getoption("gas_report")
+    baseline_path = request.config.getoption("gas_baseline")
+    if not report_path and not baseline_path:
+        pytest.skip("gas benchmarks only run with --gas-report and/or --gas-baseline")
+
+    report = GasReport(baseline_path, request.config.getoption("gas_tolerance"))
+    yield report
+    if report_path:
+        report.write(report_path)
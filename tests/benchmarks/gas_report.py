@@ -0,0 +1,109 @@
+"""
+Gas table for the benchmark suite.
+
+The table maps strategy config id -> TVL multiplier -> action -> gas used, and is
+written as JSON so it can be diffed and stored as a baseline. When a baseline is
+given, `GasRecorder.check` fails the benchmark if an action costs more than
+`tolerance` percent above it, or if the baseline has no entry for it: a baseline
+missing actions is re-recorded, not passed over.
+
+The baseline CI checks against is `tests/benchmarks/gas_baseline.json`; record it
+(again) on the development network with
+
+    brownie test tests/benchmarks --network development --gas-report tests/benchmarks/gas_baseline.json
+
+Two tables, e.g. recorded on a commit and its parent, compare side by side:
+
+    python tests/benchmarks/gas_report.py before.json after.json
+"""
+import json
+import sys
+from pathlib import Path
+
+
+class GasReport:
+    def __init__(self, baseline_path=None, tolerance=0.0):
+        self.table = {}
+        self.baseline = None
+        self.tolerance = tolerance
+        if baseline_path:
+            self.baseline = json.loads(Path(baseline_path).read_text())
+
+    def recorder(self, config_id, tvl):
+        return GasRecorder(self, config_id, str(tvl))
+
+    def write(self, path):
+        Path(path).write_text(json.dumps(self.table, indent=2, sort_keys=True) + "\n")
+
+
+class GasRecorder:
+    def __init__(self, report, config_id, tvl):
+        self.report = report
+        self.config_id = config_id
+        self.tvl = tvl
+        self.recorded = report.table.setdefault(config_id, {}).setdefault(tvl, {})
+
+    def record(self, action, tx):
+        self.recorded[action] = tx.gas_used
+        return tx
+
+    def record_gas(self, action, gas):
+        # for calls that aren't sent, e.g. a view's `estimate_gas()`
+        self.recorded[action] = gas
+        return gas
+
+    def regressions(self):
+        baseline = (
+            (self.report.baseline or {}).get(self.config_id, {}).get(self.tvl, {})
+        )
+        limit = 1 + self.report.tolerance / 100
+        return {
+            action: (baseline[action], used)
+            for action, used in self.recorded.items()
+            if action in baseline and used > baseline[action] * limit
+        }
+
+    def missing(self):
+        baseline = (
+            (self.report.baseline or {}).get(self.config_id, {}).get(self.tvl, {})
+        )
+        return sorted(action for action in self.recorded if action not in baseline)
+
+    def check(self):
+        if self.report.baseline is None:
+            return
+        missing = self.missing()
+        assert (
+            not missing
+        ), f"no gas baseline for {self.config_id} tvl{self.tvl}: " + ", ".join(missing)
+        regressions = self.regressions()
+        assert not regressions, "gas regressions (baseline, now): " + ", ".join(
+            f"{action} {before} -> {after}"
+            for action, (before, after) in regressions.items()
+        )
+
+
+def compare(before, after):
+    """(config id, tvl, action, gas before, gas after) for every action in both tables."""
+    return [
+        (config_id, tvl, action, used, after[config_id][tvl][action])
+        for config_id, levels in sorted(before.items())
+        for tvl, actions in sorted(levels.items(), key=lambda item: int(item[0]))
+        for action, used in sorted(actions.items())
+        if action in after.get(config_id, {}).get(tvl, {})
+    ]
+
+
+def main(before_path, after_path):
+    before, after = (json.loads(Path(p).read_text()) for p in (before_path, after_path))
+    print(
+        f"{'config':<12} {'tvl':>4} {'action':<28} {'before':>9} {'after':>9} {'change':>8}"
+    )
+    for config_id, tvl, action, old, new in compare(before, after):
+        print(
+            f"{config_id:<12} {tvl:>4} {action:<28} {old:>9} {new:>9} {(new - old) / old:>8.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,172 @@
+"""
+Gas benchmarks: every strategy config goes through a fixed scenario at several TVL
+levels and the gas of each step is recorded.
+
+    brownie test tests/benchmarks --network development --gas-baseline tests/benchmarks/gas_baseline.json --gas-tolerance 1
+    brownie test tests/benchmarks --network development --gas-report tests/benchmarks/gas_baseline.json
+
+The first is the check against the committed baseline, the second records it
+again (commit it with a change that moves gas on purpose).
+
+Before/after a change: record `--gas-report before.json` on the parent commit and
+`--gas-report after.json` on the change, then
+`python tests/benchmarks/gas_report.py before.json after.json`.
+
+Run serially (no -n), the report is collected in one process. `test_withdraw_oracle_reads`
+and `test_config_reads` need no options: they check from the trace that a withdrawal
+reads each price once and that config getters read no storage.
+"""
+import pytest
+
+# multiples of the registry deposits
+TVL_MULTIPLIERS = [1, 10, 50]
+
+
+@pytest.fixture(params=TVL_MULTIPLIERS, ids=[f"tvl{m}" for m in TVL_MULTIPLIERS])
+def gas(request, gas_report, setup, users):
+    multiplier = request.param
+    for user, amount in zip(users, setup.amounts):
+        if multiplier > 1:
+            setup.pool.fund(setup.want, user, amount * (multiplier - 1))
+        setup.vault.deposit(amount * multiplier, {"from": user})
+    yield gas_report.recorder(setup.config.id, multiplier)
+
+
+def test_operation_gas(chain, gov, alice, setup, gas):
+    vault, strategy = setup.vault, setup.strategy
+
+    gas.record("harvest_initial", strategy.harvest({"from": gov}))
+    # config addresses (immutables) and the packed slip slot, outside harvest / withdraw
+    gas.record_gas(
+        "view_estimated_total_assets", strategy.estimatedTotalAssets.estimate_gas()
+    )
+    # a new value: writing the stored one back would only price a no-op SSTORE
+    gas.record("set_slip", strategy.setSlip(strategy.slip() // 2, {"from": gov}))
+
+    chain.sleep(3600 * 24 * 7)
+    chain.mine(1)
+    setup.pool.targetVaultStrat.harvest({"from": setup.pool.targetVaultStratOwner})
+    gas.record("harvest_profit", strategy.harvest({"from": gov}))
+
+    max_loss = setup.config.max_loss
+    gas.record(
+        "withdraw_partial",
+        vault.withdraw(vault.balanceOf(alice) // 4, alice, max_loss, {"from": alice}),
+    )
+    gas.record(
+        "withdraw_full",
+        vault.withdraw(vault.balanceOf(alice), alice, max_loss, {"from": alice}),
+    )
+
+    gas.check()
+
+
+def test_want_float_gas(chain, gov, strategist, setup, gas):
+    # profits reported out of the float skip the target vault and pool round trip
+    strategy = setup.strategy
+    strategy.setWantFloat(100, {"from": strategist})
+    strategy.harvest({"from": gov})
+
+    # the first profit harvest builds the float, the second one runs off it
+    for action in ("harvest_profit_float_first", "harvest_profit_float"):
+        chain.sleep(3600 * 24 * 7)
+        chain.mine(1)
+        setup.pool.targetVaultStrat.harvest({"from": setup.pool.targetVaultStratOwner})
+        gas.record(action, strategy.harvest({"from": gov}))
+
+    gas.check()
+
+
+@pytest.fixture(params=TVL_MULTIPLIERS, ids=[f"tvl{m}" for m in TVL_MULTIPLIERS])
+def gauge_gas(request, gas_report, gauge_setup, users):
+    # the same deposits into the gauge backend; recorded next to the target vault's actions
+    multiplier = request.param
+    for user, amount in zip(users, gauge_setup.amounts):
+        gauge_setup.pool.fund(
+            gauge_setup.want,
+            user,
+            amount * multiplier - gauge_setup.want.balanceOf(user),
+        )
+        gauge_setup.vault.deposit(amount * multiplier, {"from": user})
+    yield gas_report.recorder(gauge_setup.config.id, multiplier)
+
+
+def test_gauge_operation_gas(chain, gov, alice, gauge_setup, gauge_gas):
+    vault, strategy = gauge_setup.vault, gauge_setup.strategy
+
+    gauge_gas.record("gauge_harvest_initial", strategy.harvest({"from": gov}))
+
+    chain.sleep(3600 * 24 * 7)
+    chain.mine(1)
+    gauge_setup.earn()
+    gauge_gas.record("gauge_harvest_profit", strategy.harvest({"from": gov}))
+
+    max_loss = gauge_setup.config.max_loss
+    gauge_gas.record(
+        "gauge_withdraw_partial",
+        vault.withdraw(vault.balanceOf(alice) // 4, alice, max_loss, {"from": alice}),
+    )
+    gauge_gas.record(
+        "gauge_withdraw_full",
+        vault.withdraw(vault.balanceOf(alice), alice, max_loss, {"from": alice}),
+    )
+
+    gauge_gas.check()
+
+
+def test_emergency_exit_gas(gov, setup, gas):
+    strategy = setup.strategy
+    strategy.harvest({"from": gov})
+
+    strategy.setEmergencyExit({"from": gov})
+    gas.record("harvest_emergency_exit", strategy.harvest({"from": gov}))
+
+    gas.check()
+
+
+def test_migrate_gas(gov, guardian, setup, gas):
+    vault, strategy = setup.vault, setup.strategy
+    strategy.harvest({"from": gov})
+
+    newstrategy = guardian.deploy(setup.Strategy, vault, *setup.args)
+    gas.record("migrate", vault.migrateStrategy(strategy, newstrategy, {"from": gov}))
+
+    gas.check()
+
+
+ORACLE_READS = ["get_virtual_price", "getPricePerFullShare"]
+
+
+def test_withdraw_oracle_reads(alice, gov, setup):
+    # strategies read every price once per withdrawal and thread it through
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[1], {"from": alice})
+    strategy.harvest({"from": gov})
+
+    tx = vault.withdraw(
+        vault.balanceOf(alice) // 2, alice, setup.config.max_loss, {"from": alice}
+    )
+
+    reads = {}
+    for call in tx.subcalls:
+        function = call.get("function", "").split("(")[0]
+        if call["from"] == strategy.address and function in ORACLE_READS:
+            key = (call["to"], function)
+            reads[key] = reads.get(key, 0) + 1
+    assert reads and max(reads.values()) == 1, reads
+
+
+def test_config_reads(gov, setup):
+    # config addresses are immutables: their getters don't read storage
+    # (the tunables' shared slot is checked in tests/test_storage_layout.py)
+    strategy = setup.strategy
+    for getter in (
+        strategy.basePool,
+        strategy.metaPool,
+        strategy.targetVault,
+        strategy.wantScale,
+    ):
+        tx = getter.transact({"from": gov})
+        assert not [step for step in tx.trace if step["op"] == "SLOAD"], getter.abi[
+            "name"
+        ]
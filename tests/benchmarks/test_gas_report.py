@@ -0,0 +1,48 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from gas_report import GasReport, compare
+
+
+def test_compare():
+    before = {
+        "dai_musd": {
+            "1": {"harvest_initial": 1000, "withdraw_full": 500},
+            "10": {"migrate": 300},
+        }
+    }
+    after = {
+        "dai_musd": {
+            "1": {"harvest_initial": 900, "harvest_profit": 700},
+            "10": {"migrate": 330},
+        }
+    }
+    assert compare(before, after) == [
+        ("dai_musd", "1", "harvest_initial", 1000, 900),
+        ("dai_musd", "10", "migrate", 300, 330),
+    ]
+
+
+def test_check_against_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"dai_musd": {"1": {"harvest_initial": 1000}}}))
+    report = GasReport(baseline, tolerance=1)
+
+    gas = report.recorder("dai_musd", 1)
+    gas.record("harvest_initial", SimpleNamespace(gas_used=1010))
+    gas.check()
+    gas.record("harvest_initial", SimpleNamespace(gas_used=1011))
+    with pytest.raises(AssertionError, match="harvest_initial 1000 -> 1011"):
+        gas.check()
+
+    # actions without a baseline entry fail instead of passing unchecked
+    for config_id, tvl in (("dai_musd", 1), ("dai_musd", 10), ("wbtc_sbtc", 1)):
+        gas = report.recorder(config_id, tvl)
+        gas.record_gas("view_estimated_total_assets", 30000)
+        with pytest.raises(AssertionError, match="no gas baseline"):
+            gas.check()
+
+    # without a baseline, only the table is recorded
+    GasReport().recorder("dai_musd", 1).check()
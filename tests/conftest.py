@@ -1,118 +1,394 @@
+"""
+Shared fixture layer for the strategy suites.
+
+Pools, target vaults, the yearn v2 vault and the strategy under test are deployed
+(or, on mainnet-fork, loaded and funded from whales) once per session. The
+`isolation` fixture snapshots the chain after that setup and reverts to it after
+every test, so scenario tests only pay for what they do themselves.
+
+Under xdist (`brownie test -n auto --dist loadgroup`) every worker runs its own
+chain on its own port (brownie offsets the port by the worker id), forked from the
+block pinned in brownie-config.yml, so all workers see identical state and accounts.
+
+What gets deployed is described in tests/registry.py; tests requesting `setup`
+run once per strategy config. On the development network the curve / yearn
+contracts come from tests/mocks.py.
+"""
+from types import SimpleNamespace
+
 import pytest
-from brownie import config
+from brownie import ZERO_ADDRESS, Contract, config, network
 
+import mocks
+import registry
 
-@pytest.fixture
-def andre(accounts):
-    # Andre, giver of tokens, and maker of yield
-    yield accounts[0]
+MAX_UINT256 = 2 ** 256 - 1
 
 
-@pytest.fixture
-def token(andre, Token):
-    yield andre.deploy(Token)
+def is_fork():
+    return network.show_active().endswith("-fork")
 
 
-@pytest.fixture
-def gov(accounts):
-    # yearn multis... I mean YFI governance. I swear!
-    yield accounts[1]
+@pytest.fixture(scope="module")
+def module_isolation():
+    # overrides brownie's, which resets the chain and would throw away everything the
+    # session scoped fixtures below deployed. Kept as a (no-op) fixture because xdist
+    # workers only accept tests that use module_isolation; per-test isolation is
+    # done by `isolation`.
+    yield
 
 
-@pytest.fixture
-def rewards(gov):
-    yield gov  # TODO: Add rewards contract
+@pytest.fixture(autouse=True)
+def isolation(module_isolation, chain):
+    # Session fixtures must be requested as arguments (not via getfixturevalue inside
+    # a test) so pytest sets them up before this snapshot is taken.
+    chain.snapshot()
+    yield
+    chain.revert()
 
 
-@pytest.fixture
-def guardian(accounts):
-    # YFI Whale, probably
+# roles, using the account indices the strategy suites have always used
+
+
+@pytest.fixture(scope="session")
+def rewards(accounts):
     yield accounts[2]
 
 
-@pytest.fixture
-def vault(pm, gov, rewards, guardian, token):
-    Vault = pm(config["dependencies"][0]).Vault
-    vault = guardian.deploy(Vault, token, gov, rewards, "", "")
-    yield vault
+@pytest.fixture(scope="session")
+def gov(accounts):
+    yield accounts[3]
+
+
+@pytest.fixture(scope="session")
+def guardian(accounts):
+    yield accounts[4]
+
+
+@pytest.fixture(scope="session")
+def bob(accounts):
+    yield accounts[5]
+
 
+@pytest.fixture(scope="session")
+def alice(accounts):
+    yield accounts[6]
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def strategist(accounts):
-    # You! Our new Strategist!
-    yield accounts[3]
+    yield accounts[7]
+
 
+@pytest.fixture(scope="session")
+def tinytim(accounts):
+    yield accounts[8]
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def keeper(accounts):
     # This is our trusty bot!
-    yield accounts[4]
+    yield accounts[9]
 
 
-@pytest.fixture
-def strategy(strategist, keeper, vault, Strategy):
-    strategy = strategist.deploy(Strategy, vault)
-    strategy.setKeeper(keeper)
-    yield strategy
+# strategy configs, see tests/registry.py
 
 
-@pytest.fixture
-def nocoiner(accounts):
-    # Has no tokens (DeFi is a ponzi scheme!)
-    yield accounts[5]
+def pytest_addoption(parser):
+    parser.addoption(
+        "--strategies",
+        action="store",
+        default=None,
+        help="Comma separated strategy config ids to test (see tests/registry.py)",
+    )
+    # gas benchmarks, see tests/benchmarks
+    parser.addoption(
+        "--gas-report",
+        action="store",
+        default=None,
+        help="Write the gas table as JSON to this path",
+    )
+    parser.addoption(
+        "--gas-baseline",
+        action="store",
+        default=None,
+        help="Fail benchmarks that use more gas than this JSON table",
+    )
+    parser.addoption(
+        "--gas-tolerance",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Allowed gas increase over the baseline, in %",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "strategy_config" in metafunc.fixturenames:
+        configs = registry.select(metafunc.config.getoption("strategies"))
+        metafunc.parametrize(
+            "strategy_config", configs, ids=[c.id for c in configs], scope="session"
+        )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # with `-n <workers> --dist loadgroup` all tests of one strategy config go to the
+    # same worker, so each worker only deploys the setups it actually runs. Runs
+    # before xdist's own hook, which turns the mark into the scheduling group.
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and "strategy_config" in callspec.params:
+            item.add_marker(
+                pytest.mark.xdist_group(name=callspec.params["strategy_config"].id)
+            )
+
+
+# pool chains: the curve pool(s), target v1 vault and the means to fund users
+
+
+def fork_funder(whales):
+    # whales: token address -> account holding plenty of it
+    def fund(token, to, amount):
+        token.transfer(to, amount, {"from": whales[token.address]})
+
+    return fund
+
+
+def mock_funder(token, to, amount):
+    token.mint(to, amount, {"from": to})
+
+
+def load_pool_chain(cfg, base, gov, accounts):
+    if is_fork():
+        pool = Contract(cfg.pool, owner=gov)
+        lp = Contract(cfg.lp, owner=gov)
+        targetVault = Contract(cfg.target_vault, owner=gov)
+        # without an address, the v1 strategy is whatever the controller routes the LP to
+        targetVaultStrat = Contract(
+            cfg.target_strategy or Contract(targetVault.controller()).strategies(lp),
+            owner=gov,
+        )
+        targetVaultStratOwner = accounts.at(targetVaultStrat.governance(), force=True)
+        coins = {symbol: Contract(address, owner=gov) for symbol, address in cfg.coins}
+        fund = fork_funder(
+            {
+                coins[symbol].address: accounts.at(whale, force=True)
+                for symbol, whale in cfg.whales
+            }
+        )
+    else:
+        deploy = getattr(mocks, cfg.mock)
+        local = deploy(gov, base, *cfg.meta_coin) if base else deploy(gov)
+        pool, lp = local.pool, local.lp
+        targetVault, targetVaultStrat = mocks.deploy_target_vault(gov, lp)
+        targetVaultStratOwner = gov
+        coins = {symbol: getattr(local, symbol) for symbol, _ in cfg.coins}
+        fund = mock_funder
+
+    if base:
+        coins = {**base.coins, **coins}
+        fund = base.fund
+
+    return SimpleNamespace(
+        id=cfg.id,
+        base=base,
+        pool=pool,
+        lp=lp,
+        coins=coins,
+        targetVault=targetVault,
+        targetVaultStrat=targetVaultStrat,
+        targetVaultStratOwner=targetVaultStratOwner,
+        fund=fund,
+    )
+
+
+@pytest.fixture(scope="session")
+def pool_chains(gov, accounts):
+    # pool id -> pool chain, loaded once and shared by every strategy investing through it
+    loaded = {}
+
+    def get(pool_id):
+        if pool_id not in loaded:
+            cfg = registry.POOLS[pool_id]
+            base = get(cfg.base) if cfg.base else None
+            loaded[pool_id] = load_pool_chain(cfg, base, gov, accounts)
+        return loaded[pool_id]
+
+    yield get
+
+
+@pytest.fixture(scope="session")
+def multicall(gov):
+    # the stand-in works on mainnet-fork as well
+    yield mocks.deploy_multicall(gov)
+
+
+# strategy setup: v2 vault + strategy, users funded and approved, target strategy fees off
+
+
+def curve_route(cfg, pool):
+    # StrategyCurveLP.Route: (basePool, baseCoins, baseIndex, baseLp, metaPool, metaIndex, metaLp, targetVault)
+    pool_cfg = registry.POOLS[pool.id]
+    if pool.base:
+        # want -> base pool -> metapool (base LP is its last coin) -> target vault
+        base_cfg = registry.POOLS[pool.base.id]
+        return (
+            pool.base.pool,
+            base_cfg.n_coins,
+            cfg.coin_index,
+            pool.base.lp,
+            pool.pool,
+            pool_cfg.n_coins - 1,
+            pool.lp,
+            pool.targetVault,
+        )
+    # want -> pool -> target vault
+    return (
+        pool.pool,
+        pool_cfg.n_coins,
+        cfg.coin_index,
+        pool.lp,
+        ZERO_ADDRESS,
+        0,
+        ZERO_ADDRESS,
+        pool.targetVault,
+    )
+
+
+def strategy_args(cfg, pool, want):
+    # constructor arguments after the vault
+    if cfg.contract == "StrategyCurveLP":
+        return [curve_route(cfg, pool), cfg.id]
+    # the named strategies keep their original constructors, by pool chain shape
+    if pool.base:
+        return [
+            want,
+            pool.base.pool,
+            pool.targetVault,
+            pool.base.lp,
+            pool.lp,
+            pool.pool,
+        ]
+    return [want, pool.pool, pool.targetVault, pool.lp]
+
+
+def deploy_vault(pm, want, gov, rewards):
+    Vault = pm(config["dependencies"][0]).Vault
+    vault = Vault.deploy({"from": gov})
+    vault.initialize(want, gov, rewards, "", "", {"from": gov})
+    vault.setDepositLimit(MAX_UINT256, {"from": gov})
+    return vault
+
+
+@pytest.fixture(scope="session")
+def users(bob, alice, tinytim):
+    yield [bob, alice, tinytim]
+
+
+@pytest.fixture(scope="session")
+def setup(
+    request, strategy_config, pool_chains, pm, gov, rewards, guardian, strategist, users
+):
+    cfg = strategy_config
+    pool = pool_chains(cfg.pool)
+    want = pool.coins[cfg.want]
+    Strategy = request.getfixturevalue(cfg.contract)
+    args = strategy_args(cfg, pool, want)
+
+    vault = deploy_vault(pm, want, gov, rewards)
+    strategy = guardian.deploy(Strategy, vault, *args)
+    strategy.setStrategist(strategist, {"from": guardian})
+    vault.addStrategy(strategy, 10_000, 0, 0, {"from": gov})
+
+    amounts = cfg.amounts()
+    for user, amount in zip(users, amounts):
+        pool.fund(want, user, amount)
+        want.approve(vault, MAX_UINT256, {"from": user})
+
+    owner = pool.targetVaultStratOwner
+    pool.targetVaultStrat.setStrategistReward(0, {"from": owner})
+    pool.targetVaultStrat.setTreasuryFee(0, {"from": owner})
+    pool.targetVaultStrat.setWithdrawalFee(0, {"from": owner})
+
+    yield SimpleNamespace(
+        config=cfg,
+        vault=vault,
+        strategy=strategy,
+        want=want,
+        pool=pool,
+        amounts=amounts,
+        Strategy=Strategy,
+        args=args,
+    )
+
+
+# gauge backend: the setup's route staking in the pool's curve gauge instead of the v1 target vault
+
+# CRV credited per 1e18 staked LP by `earn` locally: 0.5%, with CRV priced like want
+GAUGE_CRV_PER_LP = 5 * 10 ** 15
+
+
+@pytest.fixture(scope="session")
+def gauge_setup(
+    setup, pm, gov, rewards, guardian, strategist, users, StrategyCurveGauge
+):
+    gauge_address = registry.POOLS[setup.pool.id].gauge
+    if gauge_address is None:
+        pytest.skip(f"no gauge for {setup.pool.id}")
+
+    if is_fork():
+        minter = Contract(registry.CURVE_MINTER, owner=gov)
+        gauge = Contract(gauge_address, owner=gov)
+    else:
+        minter = mocks.deploy_minter(gov)
+        gauge = mocks.deploy_gauge(gov, setup.pool.lp, minter)
+
+    vault = deploy_vault(pm, setup.want, gov, rewards)
+    s = setup.strategy
+    route = (
+        s.basePool(),
+        s.baseCoins(),
+        s.baseIndex(),
+        s.baseLp(),
+        s.metaPool(),
+        s.metaIndex(),
+        s.metaLp(),
+        gauge,
+    )
+    args = [route, minter, f"{setup.config.id}_gauge"]
+    strategy = guardian.deploy(StrategyCurveGauge, vault, *args)
+    strategy.setStrategist(strategist, {"from": guardian})
+    vault.addStrategy(strategy, 10_000, 0, 0, {"from": gov})
+
+    if is_fork():
+        # CRV is sold on uniswap, as on mainnet; the gauge accrues with time
+        def earn():
+            pass
+
+    else:
+        # CRV and want both at 1 ETH
+        router = mocks.deploy_price_router(gov, strategy.weth())
+        router.setPrice(minter.token(), 10 ** 18, {"from": gov})
+        router.setPrice(setup.want, 10 ** 18, {"from": gov})
+        strategy.setPriceRouter(router, {"from": strategist})
+
+        def earn():
+            gauge.accrue(GAUGE_CRV_PER_LP, {"from": gov})
 
+    for user in users:
+        setup.want.approve(vault, MAX_UINT256, {"from": user})
 
-@pytest.fixture
-def pleb(accounts, andre, token, vault):
-    # Small fish in a big pond
-    a = accounts[6]
-    # Has 0.01% of tokens (heard about this new DeFi thing!)
-    bal = token.totalSupply() // 10000
-    token.transfer(a, bal, {"from": andre})
-    # Unlimited Approvals
-    token.approve(vault, 2 ** 256 - 1, {"from": a})
-    # Deposit half their stack
-    vault.deposit(bal // 2, {"from": a})
-    yield a
-
-
-@pytest.fixture
-def chad(accounts, andre, token, vault):
-    # Just here to have fun!
-    a = accounts[7]
-    # Has 0.1% of tokens (somehow makes money trying every new thing)
-    bal = token.totalSupply() // 1000
-    token.transfer(a, bal, {"from": andre})
-    # Unlimited Approvals
-    token.approve(vault, 2 ** 256 - 1, {"from": a})
-    # Deposit half their stack
-    vault.deposit(bal // 2, {"from": a})
-    yield a
-
-
-@pytest.fixture
-def greyhat(accounts, andre, token, vault):
-    # Chaotic evil, will eat you alive
-    a = accounts[8]
-    # Has 1% of tokens (earned them the *hard way*)
-    bal = token.totalSupply() // 100
-    token.transfer(a, bal, {"from": andre})
-    # Unlimited Approvals
-    token.approve(vault, 2 ** 256 - 1, {"from": a})
-    # Deposit half their stack
-    vault.deposit(bal // 2, {"from": a})
-    yield a
-
-
-@pytest.fixture
-def whale(accounts, andre, token, vault):
-    # Totally in it for the tech
-    a = accounts[9]
-    # Has 10% of tokens (was in the ICO)
-    bal = token.totalSupply() // 10
-    token.transfer(a, bal, {"from": andre})
-    # Unlimited Approvals
-    token.approve(vault, 2 ** 256 - 1, {"from": a})
-    # Deposit half their stack
-    vault.deposit(bal // 2, {"from": a})
-    yield a
+    yield SimpleNamespace(
+        config=setup.config,
+        vault=vault,
+        strategy=strategy,
+        want=setup.want,
+        pool=setup.pool,
+        gauge=gauge,
+        crv=minter.token(),
+        amounts=setup.amounts,
+        Strategy=StrategyCurveGauge,
+        args=args,
+        earn=earn,
+    )
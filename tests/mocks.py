@@ -0,0 +1,118 @@
+"""
+Local stand-ins for the mainnet contracts the strategies are built on.
+
+Everything here deploys from `contracts/test`, so it works on a plain development
+chain without a mainnet fork. Pools are seeded with deep liquidity so strategy sized
+deposits see realistic (small) price impact.
+"""
+from types import SimpleNamespace
+
+from brownie import (
+    ZERO_ADDRESS,
+    MockCurvePool2,
+    MockCurvePool3,
+    MockERC20,
+    MockGauge,
+    MockMinter,
+    MockUniswapRouter,
+    MockYStrategy,
+    MockYVault,
+    Multicall,
+)
+
+# curve defaults: 0.04% fee, FEE_DENOMINATOR = 1e10
+POOL_FEE = 4000000
+SEED_USD = 10_000_000
+SEED_BTC = 10_000
+
+
+def deploy_token(owner, name, symbol, decimals):
+    return MockERC20.deploy(name, symbol, decimals, {"from": owner})
+
+
+def seed_pool(owner, pool, coins, amounts):
+    for coin, amount in zip(coins, amounts):
+        # LP tokens of a base pool (3Crv) are already held by `owner` from seeding it
+        if coin.balanceOf(owner) < amount:
+            coin.mint(owner, amount - coin.balanceOf(owner), {"from": owner})
+        coin.approve(pool, amount, {"from": owner})
+    pool.add_liquidity(amounts, 0, {"from": owner})
+
+
+def deploy_three_pool(owner):
+    dai = deploy_token(owner, "Dai Stablecoin", "DAI", 18)
+    usdc = deploy_token(owner, "USD Coin", "USDC", 6)
+    usdt = deploy_token(owner, "Tether USD", "USDT", 6)
+    crv3 = deploy_token(owner, "Curve.fi DAI/USDC/USDT", "3Crv", 18)
+    pool = MockCurvePool3.deploy(
+        [dai, usdc, usdt], crv3, 2000, POOL_FEE, ZERO_ADDRESS, {"from": owner}
+    )
+    crv3.setMinter(pool, {"from": owner})
+    seed_pool(
+        owner,
+        pool,
+        [dai, usdc, usdt],
+        [SEED_USD * 10 ** c.decimals() for c in (dai, usdc, usdt)],
+    )
+    return SimpleNamespace(dai=dai, usdc=usdc, usdt=usdt, lp=crv3, pool=pool)
+
+
+def deploy_meta_pool(owner, base, name, symbol, decimals):
+    # metapool of `symbol` against 3Crv, e.g. mUSD/3Crv
+    coin = deploy_token(owner, name, symbol, decimals)
+    lp = deploy_token(owner, f"Curve.fi {symbol}/3Crv", f"{symbol}3CRV", 18)
+    pool = MockCurvePool2.deploy(
+        [coin, base.lp], lp, 100, POOL_FEE, base.pool, {"from": owner}
+    )
+    lp.setMinter(pool, {"from": owner})
+    seed_pool(
+        owner,
+        pool,
+        [coin, base.lp],
+        [SEED_USD // 2 * 10 ** decimals, SEED_USD // 2 * 10 ** 18],
+    )
+    return SimpleNamespace(coin=coin, lp=lp, pool=pool)
+
+
+def deploy_sbtc_pool(owner):
+    renbtc = deploy_token(owner, "renBTC", "renBTC", 8)
+    wbtc = deploy_token(owner, "Wrapped BTC", "WBTC", 8)
+    sbtc = deploy_token(owner, "Synth sBTC", "sBTC", 18)
+    lp = deploy_token(owner, "Curve.fi renBTC/wBTC/sBTC", "crvRenWSBTC", 18)
+    pool = MockCurvePool3.deploy(
+        [renbtc, wbtc, sbtc], lp, 100, POOL_FEE, ZERO_ADDRESS, {"from": owner}
+    )
+    lp.setMinter(pool, {"from": owner})
+    seed_pool(
+        owner,
+        pool,
+        [renbtc, wbtc, sbtc],
+        [SEED_BTC * 10 ** c.decimals() for c in (renbtc, wbtc, sbtc)],
+    )
+    return SimpleNamespace(renbtc=renbtc, wbtc=wbtc, sbtc=sbtc, lp=lp, pool=pool)
+
+
+def deploy_target_vault(owner, lp):
+    # v1 yVault for `lp` plus the harvestable strategy behind it
+    vault = MockYVault.deploy(lp, {"from": owner})
+    strategy = MockYStrategy.deploy(vault, {"from": owner})
+    vault.setStrategy(strategy, {"from": owner})
+    return vault, strategy
+
+
+def deploy_multicall(owner):
+    return Multicall.deploy({"from": owner})
+
+
+def deploy_price_router(owner, weth):
+    # `weth` is only a name here: priced at 1 ETH, never called
+    return MockUniswapRouter.deploy(weth, {"from": owner})
+
+
+def deploy_minter(owner):
+    crv = deploy_token(owner, "Curve DAO Token", "CRV", 18)
+    return MockMinter.deploy(crv, {"from": owner})
+
+
+def deploy_gauge(owner, lp, minter):
+    return MockGauge.deploy(lp, minter, {"from": owner})
@@ -0,0 +1,190 @@
+"""
+Declarative registry of the strategies under test.
+
+`POOLS` describes each pool chain a strategy invests through: the mainnet addresses
+and whales used on mainnet-fork, and the mock used on the development network.
+`STRATEGIES` describes each strategy configuration on top of a pool chain. The
+operation / shutdown / migration suites are parametrized over `STRATEGIES`; select
+a subset with `brownie test --strategies dai_musd,wbtc_sbtc` (or `-k`).
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    id: str
+    # curve pool, LP token, v1 target vault and (optionally) the target vault's strategy.
+    # Without a strategy address it is looked up through the vault's controller.
+    pool: str
+    lp: str
+    target_vault: str
+    target_strategy: Optional[str]
+    # token symbol -> mainnet address, for the coins strategies use as want
+    coins: Tuple[Tuple[str, str], ...]
+    # token symbol -> account holding plenty of it on mainnet
+    whales: Tuple[Tuple[str, str], ...]
+    # tests/mocks.py function deploying the local stand-in
+    mock: str
+    n_coins: int = 3
+    # pool this one is a metapool of (its LP token is the last coin)
+    base: Optional[str] = None
+    # (name, symbol, decimals) of the metapool coin for the local mock
+    meta_coin: Optional[Tuple[str, str, int]] = None
+    # curve gauge of the LP token, for StrategyCurveGauge
+    gauge: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StrategyConfig:
+    id: str
+    contract: str
+    pool: str
+    want: str
+    decimals: int
+    # deposits of bob, alice and tinytim, in whole want tokens (floats allowed)
+    deposits: Tuple[float, float, float]
+    # maxLoss (bps) users accept on vault.withdraw
+    max_loss: int = 150
+    # on mainnet-fork the sBTC target vault yields less than the vault's debt grows,
+    # so price per share only has to move, not rise
+    fork_profit: bool = True
+    # index of want in the base pool, only for generic StrategyCurveLP routes
+    coin_index: Optional[int] = None
+
+    def amounts(self):
+        return [int(d * 10 ** self.decimals) for d in self.deposits]
+
+
+THREE_POOL = "0xbEbc44782C7dB0a1A60Cb6fe97d0b483032FF1C7"
+# mints the CRV of every gauge
+CURVE_MINTER = "0xd061D61a4d941c39E5453435B6345Dc261C2fcE0"
+
+POOLS = {
+    p.id: p
+    for p in [
+        PoolConfig(
+            id="three_pool",
+            mock="deploy_three_pool",
+            pool=THREE_POOL,
+            lp="0x6c3F90f043a72FA612cbac8115EE7e52BDe6E490",  # 3Crv
+            target_vault="0x9cA85572E6A3EbF24dEDd195623F188735A5179f",  # y3Crv
+            target_strategy=None,
+            coins=(
+                ("dai", "0x6B175474E89094C44Da98b954EedeAC495271d0F"),
+                ("usdc", "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"),
+            ),
+            # the pool itself holds plenty of every coin
+            whales=(("dai", THREE_POOL), ("usdc", THREE_POOL)),
+            gauge="0xbFcF63294aD7105dEa65aA58F8AE5BE2D9d0952A",
+        ),
+        PoolConfig(
+            id="musd_pool",
+            mock="deploy_meta_pool",
+            pool="0x8474DdbE98F5aA3179B3B3F5942D724aFcdec9f6",
+            lp="0x1AEf73d49Dedc4b1778d0706583995958Dc862e6",  # musdCrv
+            target_vault="0x0FCDAeDFb8A7DfDa2e9838564c5A1665d856AFDF",
+            target_strategy="0xBA0c07BBE9C22a1ee33FE988Ea3763f21D0909a0",
+            coins=(),
+            whales=(),
+            n_coins=2,
+            base="three_pool",
+            meta_coin=("mStable USD", "mUSD", 18),
+            gauge="0x5f626c30EC1215f4EdCc9982265E8b1F411D1352",
+        ),
+        PoolConfig(
+            id="gusd_pool",
+            mock="deploy_meta_pool",
+            pool="0x4f062658EaAF2C1ccf8C8e36D6824CDf41167956",
+            lp="0xD2967f45c4f384DEEa880F807Be904762a3DeA07",  # gusdCrv
+            target_vault="0xcC7E70A958917cCe67B4B87a8C30E6297451aE98",
+            target_strategy="0xD42eC70A590C6bc11e9995314fdbA45B4f74FABb",
+            coins=(),
+            whales=(),
+            n_coins=2,
+            base="three_pool",
+            meta_coin=("Gemini dollar", "GUSD", 2),
+            gauge="0xC5cfaDA84E902aD92DD40194f0883ad49639b023",
+        ),
+        PoolConfig(
+            id="sbtc_pool",
+            mock="deploy_sbtc_pool",
+            pool="0x7fC77b5c7614E1533320Ea6DDc2Eb61fa00A9714",
+            lp="0x075b1bb99792c9E1041bA13afEf80C91a1e70fB3",  # sbtcCRV
+            target_vault="0x7Ff566E1d69DEfF32a7b244aE7276b9f90e9D0f6",  # ysBTC
+            target_strategy="0x6D6c1AD13A5000148Aa087E7CbFb53D402c81341",
+            coins=(("wbtc", "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599"),),
+            # curve renbtc pool (lots of wbtc)
+            whales=(("wbtc", "0x93054188d876f558f4a66b2ef1d97d16edf0895b"),),
+            gauge="0x705350c4BcD35c9441419DdD5d2f097d7a55410F",
+        ),
+    ]
+}
+
+STRATEGIES = {
+    s.id: s
+    for s in [
+        StrategyConfig(
+            id="dai_3pool",
+            contract="StrategyDAI3Poolv2",
+            pool="three_pool",
+            want="dai",
+            decimals=18,
+            deposits=(1000, 4000, 10),
+        ),
+        StrategyConfig(
+            id="usdc_3pool",
+            contract="StrategyUSDC3Poolv2",
+            pool="three_pool",
+            want="usdc",
+            decimals=6,
+            deposits=(1000, 4000, 10),
+        ),
+        StrategyConfig(
+            id="dai_musd",
+            contract="StrategyDAImUSDv2",
+            pool="musd_pool",
+            want="dai",
+            decimals=18,
+            deposits=(1000, 4000, 10),
+        ),
+        StrategyConfig(
+            id="dai_gusd",
+            contract="StrategyDAIgUSDv2",
+            pool="gusd_pool",
+            want="dai",
+            decimals=18,
+            deposits=(1000, 4000, 10),
+        ),
+        StrategyConfig(
+            id="wbtc_sbtc",
+            contract="StrategyWBTCsBTCv2",
+            pool="sbtc_pool",
+            want="wbtc",
+            decimals=8,
+            deposits=(1, 10, 0.01),
+            max_loss=75,
+            fork_profit=False,
+        ),
+        # a leg without a contract of its own: the generic route engine
+        StrategyConfig(
+            id="usdc_musd",
+            contract="StrategyCurveLP",
+            pool="musd_pool",
+            want="usdc",
+            decimals=6,
+            deposits=(1000, 4000, 10),
+            coin_index=1,
+        ),
+    ]
+}
+
+
+def select(ids=None):
+    """Strategy configs to test, optionally limited to a comma separated list of ids."""
+    if not ids:
+        return list(STRATEGIES.values())
+    unknown = [i for i in ids.split(",") if i not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategy config(s): {', '.join(unknown)}")
+    return [STRATEGIES[i] for i in ids.split(",")]
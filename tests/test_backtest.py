@@ -0,0 +1,220 @@
+import csv
+
+import pytest
+
+from scripts import backtest
+from scripts.stableswap import Pool
+
+DAY = 24 * 3600
+START = 1_600_000_000
+
+
+THREE_POOL = (10_030_000 * 10 ** 18, 10_000_000 * 10 ** 6, 9_500_000 * 10 ** 6)
+MUSD_POOL = (5_000_000 * 10 ** 18, 4_900_000 * 10 ** 18)
+
+
+def supply(balances, rates, amp, virtual_price, a_precision=1):
+    """LP supply at which the pool's virtual price is `virtual_price`"""
+    return Pool(balances, rates, amp, 0, 1, a_precision).D() * 10 ** 18 // virtual_price
+
+
+def history(days, pps_growth=0.1, dip=None, amp=2000):
+    """Daily rows for 3pool and the mUSD metapool, target vaults growing `pps_growth` a year."""
+    rows = []
+    for day in range(days):
+        virtual_price = 10 ** 18 + day * 10 ** 13
+        pps = int(10 ** 18 * (1 + pps_growth) ** (day / 365))
+        if dip and dip[0] <= day < dip[1]:
+            pps = pps * 95 // 100
+        rows.append(
+            {
+                "timestamp": START + day * DAY,
+                "three_pool_virtual_price": virtual_price,
+                "three_pool_balance_0": THREE_POOL[0],
+                "three_pool_balance_1": THREE_POOL[1],
+                "three_pool_balance_2": THREE_POOL[2],
+                "three_pool_supply": supply(
+                    THREE_POOL, (10 ** 18, 10 ** 30, 10 ** 30), amp, virtual_price
+                ),
+                "three_pool_amp": amp,
+                "three_pool_fee": 4000000,
+                "three_pool_price_per_share": pps,
+                "musd_pool_virtual_price": virtual_price,
+                "musd_pool_balance_0": MUSD_POOL[0],
+                "musd_pool_balance_1": MUSD_POOL[1],
+                "musd_pool_supply": supply(
+                    MUSD_POOL, (10 ** 18, virtual_price), 10000, virtual_price, 100
+                ),
+                "musd_pool_amp": 10000,
+                "musd_pool_fee": 4000000,
+                "musd_pool_price_per_share": pps,
+                "gas_price": 50 * 10 ** 9,
+                "dai_price": 2 * 10 ** 15,
+            }
+        )
+    return rows
+
+
+@pytest.mark.parametrize(
+    "strategy_id", ["dai_3pool", "usdc_3pool", "dai_musd", "usdc_musd"]
+)
+def test_yield(strategy_id):
+    result = backtest.sweep(history(366), {strategy_id: 100_000})[strategy_id]
+
+    assert result.harvests == 53
+    assert result.failed_harvests == 0
+    assert result.loss == 0
+    # 10% from the target vault and ~0.4% from the pools' virtual price, less the
+    # fees of unwinding each week's profit
+    assert 0.1 < result.apy < 0.105
+    assert result.withdrawal_loss > 0
+    assert result.max_drawdown < 0.01
+
+
+def test_drawdown():
+    result = backtest.sweep(history(366, dip=(100, 110)), {"dai_3pool": 100_000})[
+        "dai_3pool"
+    ]
+    assert 0.04 < result.max_drawdown < 0.06
+    assert result.loss > 0
+
+
+def test_slip_reverts():
+    # DAI into a DAI heavy pool mints less than its virtual price value
+    result = backtest.sweep(history(30), {"dai_3pool": 100_000}, slip=0)["dai_3pool"]
+    assert result.failed_harvests == result.harvests
+    assert set(result.values) == {result.deposit}
+    assert result.apy == 0
+
+
+def test_harvest_cost():
+    rows = history(366)
+    result = backtest.sweep(rows, {"dai_3pool": 100_000}, harvest_gas=500_000)[
+        "dai_3pool"
+    ]
+    assert result.harvest_cost == 53 * 500_000 * 50 * 10 ** 9
+    assert result.harvest_cost_in_want == 53 * 500_000 * 50 * 10 ** 9 * 10 ** 18 // (
+        2 * 10 ** 15
+    )
+    assert result.net_apy < result.apy
+
+    # no price for usdc
+    result = backtest.sweep(rows, {"usdc_3pool": 100_000}, harvest_gas=500_000)[
+        "usdc_3pool"
+    ]
+    assert result.harvest_cost_in_want is None and result.net_apy is None
+
+
+def test_load_csv(tmp_path):
+    rows = history(30)
+    path = tmp_path / "history.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(reversed(rows))
+    assert backtest.load(path) == rows
+
+
+def test_flows():
+    rows = history(366)
+    flows = {
+        START + 100 * DAY: 50_000 * 10 ** 18,
+        START + 200 * DAY: -120_000 * 10 ** 18,
+    }
+    result = backtest.run(
+        backtest.ROUTES["dai_3pool"], rows, 100_000 * 10 ** 18, flows=flows
+    )
+    plain = backtest.run(backtest.ROUTES["dai_3pool"], rows, 100_000 * 10 ** 18)
+
+    # withdrawing more than the vault's idle want unwinds part of the position
+    assert result.withdrawal_loss > plain.withdrawal_loss
+    assert result.values[200] < plain.values[200]
+    # flows move the value, not the time weighted yield
+    assert abs(result.apy - plain.apy) < 0.005
+
+
+def test_max_impact_defers_withdrawals():
+    # a low A pool and a whale exit of 60% of its DAI
+    rows = history(366, amp=20)
+    flows = {START + 100 * DAY: -6_000_000 * 10 ** 18}
+    args = (backtest.ROUTES["dai_3pool"], rows, 10_000_000 * 10 ** 18)
+    # entering a low A pool costs more than the default slip
+    one_shot = backtest.run(*args, flows=flows, slip=backtest.DENOMINATOR)
+    bounded = backtest.run(*args, flows=flows, slip=backtest.DENOMINATOR, max_impact=50)
+
+    assert bounded.withdrawal_loss < one_shot.withdrawal_loss
+    # the rest stays invested
+    assert bounded.values[100] > one_shot.values[100]
+
+
+def test_want_float_skips_round_trips():
+    rows = history(366)
+    args = (backtest.ROUTES["dai_musd"], rows, 100_000 * 10 ** 18)
+    plain = backtest.run(*args)
+    # a week of profit at ~10% a year fits in 0.5%
+    floated = backtest.run(*args, want_float=50)
+
+    assert plain.withdrawal_loss > 0
+    assert floated.withdrawal_loss == 0
+    assert floated.profit > 0
+
+
+def test_quote_slippage():
+    rows = history(30, amp=20)
+    route = backtest.ROUTES["dai_3pool"]
+    # DAI into a DAI heavy, low A pool: more than 0.1% under its virtual price value,
+    # within 0.1% of the pool's own quote
+    assert backtest.run(route, rows, 100_000 * 10 ** 18, slip=10).failed_harvests > 0
+    assert (
+        backtest.run(
+            route, rows, 100_000 * 10 ** 18, slip=10, quote_slippage=True
+        ).failed_harvests
+        == 0
+    )
+
+
+def test_min_invest_batches_deposits():
+    rows = history(60)
+    flows = {START + day * DAY: 100 * 10 ** 18 for day in range(1, 60)}
+    args = (backtest.ROUTES["dai_3pool"], rows, 100_000 * 10 ** 18)
+    plain = backtest.run(*args, harvest_interval=DAY, flows=flows)
+    batched = backtest.run(
+        *args, harvest_interval=DAY, flows=flows, min_invest=1000 * 10 ** 18
+    )
+
+    # batched inflows only go in every tenth day, the rest waits as want
+    assert batched.values[-1] > 100_000 * 10 ** 18
+    assert batched.apy < plain.apy
+
+
+def with_gauge(rows, crv_per_lp_year, crv_price=2 * 10 ** 15):
+    """`rows` with 3pool's gauge paying `crv_per_lp_year` CRV per LP (before the 40% unboosted share)."""
+    for day, row in enumerate(rows):
+        row["three_pool_gauge_integral"] = int(crv_per_lp_year * 10 ** 18) * day // 365
+        if crv_price:
+            row["crv_price"] = crv_price
+    return rows
+
+
+def test_gauge_backend():
+    # 25% a year in CRV at the gauge rate, 10% at the strategy's unboosted share, CRV priced as DAI
+    rows = with_gauge(history(366, pps_growth=0.0), 0.25)
+    vault, gauge = backtest.compare(rows, {"dai_3pool": 100_000}, withdrawal_fee=50)[
+        "dai_3pool"
+    ]
+
+    assert gauge.failed_harvests == 0 and gauge.loss == 0
+    # compounded weekly, plus the pools' virtual price, less the swap fees
+    assert 0.1 < gauge.apy < 0.11
+    # profit comes from selling CRV, only the virtual price gain is unwound through the pools
+    assert gauge.withdrawal_loss < vault.withdrawal_loss / 10
+    assert vault.apy < 0.01
+
+    # without a CRV price the rewards stay unsold
+    unpriced = backtest.run(
+        backtest.ROUTES["dai_3pool"],
+        with_gauge(history(366), 0.25, None),
+        10 ** 23,
+        gauge=True,
+    )
+    assert unpriced.apy < 0.01
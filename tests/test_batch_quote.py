@@ -0,0 +1,71 @@
+import pytest
+
+from scripts import batch_quote
+from scripts.stableswap import Pool
+
+POOLS = {
+    # 3pool shaped, DAI heavy
+    "three_pool": Pool(
+        balances=(10_030_000 * 10 ** 18, 10_000_000 * 10 ** 6, 9_500_000 * 10 ** 6),
+        rates=(10 ** 18, 10 ** 30, 10 ** 30),
+        amp=2000,
+        fee=4000000,
+        supply=29_400_000 * 10 ** 18,
+    ),
+    # gUSD (2 decimals) against 3Crv, A_PRECISION scaled
+    "meta_pool": Pool(
+        balances=(5_000_000 * 10 ** 2, 4_900_000 * 10 ** 18),
+        rates=(10 ** 34, 1_020_000_000_000_000_000),
+        amp=10000,
+        fee=4000000,
+        supply=9_950_000 * 10 ** 18,
+        a_precision=100,
+    ),
+}
+
+
+def one_coin(pool, i, amount):
+    return [amount if k == i else 0 for k in range(pool.n)]
+
+
+@pytest.mark.parametrize("pool_id", POOLS)
+def test_exact_batch_matches_scalar(pool_id):
+    pool = POOLS[pool_id]
+    for i in range(pool.n):
+        amounts = [pool.balances[i] // f for f in (10 ** 5, 10 ** 3, 10, 2)]
+        assert list(batch_quote.deposit_quotes(pool, i, amounts)) == [
+            pool.add_liquidity(one_coin(pool, i, a)) for a in amounts
+        ]
+        token_amounts = [pool.supply // f for f in (10 ** 9, 10 ** 5, 10, 3)]
+        assert list(batch_quote.withdraw_quotes(pool, i, token_amounts)) == [
+            pool.calc_withdraw_one_coin(a, i) for a in token_amounts
+        ]
+
+
+@pytest.mark.parametrize("pool_id", POOLS)
+def test_float_path_within_bound(pool_id):
+    pool = POOLS[pool_id]
+    amounts = [pool.balances[0] * k // 1000 for k in range(1, 501)]
+    quotes, error = batch_quote.float_quotes(
+        batch_quote.deposit_quotes, pool, 0, amounts, verify=len(amounts)
+    )
+    assert error <= 1e-9
+    assert len(quotes) == len(amounts)
+
+
+def test_float_path_rejects_cancellation():
+    # one wei against a ten million coin pool: D1 - D0 is below float64 resolution
+    pool = POOLS["three_pool"]
+    with pytest.raises(ValueError):
+        batch_quote.float_quotes(batch_quote.deposit_quotes, pool, 0, [1, 2, 3])
+
+
+def test_impact_and_max_size():
+    pool = POOLS["three_pool"]
+    amounts = [k * 10 ** 22 for k in range(1, 201)]
+    impact = batch_quote.deposit_impact(pool, 0, amounts)
+    # depositing more of the heavy coin only gets worse
+    assert all(a <= b for a, b in zip(impact, impact[1:]))
+    size = batch_quote.max_size(amounts, impact, impact[99])
+    assert size == amounts[99]
+    assert batch_quote.max_size(amounts, impact, -1) == 0
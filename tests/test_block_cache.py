@@ -0,0 +1,93 @@
+from scripts.block_cache import BlockCache
+
+
+def test_repeated_calls_hit(gov, bob, setup):
+    setup.vault.deposit(setup.amounts[0], {"from": bob})
+    setup.strategy.harvest({"from": gov})
+
+    cache = BlockCache()
+    strategy = cache.wrap(setup.strategy)
+    vault = cache.wrap(setup.vault)
+    with cache.pinned():
+        assert strategy.estimatedTotalAssets() == setup.strategy.estimatedTotalAssets()
+        strategy.estimatedTotalAssets()
+        vault.pricePerShare()
+        vault.pricePerShare()
+        # a contract and its address freeze to the same key: one entry
+        vault.strategies(setup.strategy)
+        vault.strategies(setup.strategy.address)
+
+    assert cache.stats() == {
+        "hits": 3,
+        "misses": 3,
+        "evictions": 0,
+        "invalidations": 0,
+        "size": 3,
+    }
+
+
+def test_new_block_invalidates(chain, gov, bob, setup):
+    cache = BlockCache()
+    vault = cache.wrap(setup.vault)
+    assert vault.totalAssets() == 0
+
+    setup.vault.deposit(setup.amounts[0], {"from": bob})
+    assert vault.totalAssets() == setup.amounts[0]
+    assert cache.stats()["invalidations"] == 1
+
+    # a block read explicitly stays cached
+    assert vault.totalAssets(block_identifier=chain.height - 1) == 0
+    assert vault.totalAssets(block_identifier=chain.height - 1) == 0
+    assert cache.hits == 1
+
+    # going back (revert, reorg) drops everything
+    chain.undo()
+    assert vault.totalAssets() == 0
+    assert cache.stats()["size"] == 1
+
+
+def test_remined_block_invalidates(chain, bob, setup):
+    cache = BlockCache()
+    vault = cache.wrap(setup.vault)
+    setup.vault.deposit(setup.amounts[0], {"from": bob})
+    height = chain.height
+    assert vault.totalAssets(block_identifier=height) == setup.amounts[0]
+
+    # back one block and a different one mined at the same height
+    chain.undo()
+    chain.mine(1)
+    assert chain.height == height
+    assert vault.totalAssets(block_identifier=height) == 0
+    assert cache.stats() == {
+        "hits": 0,
+        "misses": 2,
+        "evictions": 0,
+        "invalidations": 1,
+        "size": 1,
+    }
+
+
+def test_lru_bound(setup):
+    cache = BlockCache(maxsize=2)
+    vault = cache.wrap(setup.vault)
+    with cache.pinned():
+        vault.totalAssets()
+        vault.totalSupply()
+        vault.pricePerShare()
+        # evicted as least recently used
+        vault.totalAssets()
+    assert cache.stats() == {
+        "hits": 0,
+        "misses": 4,
+        "evictions": 2,
+        "invalidations": 0,
+        "size": 2,
+    }
+
+
+def test_transactions_pass_through(gov, bob, setup):
+    cache = BlockCache()
+    vault = cache.wrap(setup.vault)
+    vault.deposit(setup.amounts[0], {"from": bob})
+    assert setup.vault.balanceOf(bob) > 0
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,39 @@
+from scripts import cadence
+from test_backtest import DAY, START, history
+
+INTERVALS = [DAY, 7 * DAY, 30 * DAY]
+
+
+def test_gas_favours_long_intervals():
+    ranked = cadence.optimize(
+        history(366),
+        {"dai_3pool": 100_000},
+        {"dai_3pool": 500_000},
+        INTERVALS,
+        [0, 100],
+        max_workers=2,
+    )
+    candidates = ranked["dai_3pool"]
+    assert len(candidates) == 6
+    assert (candidates[0].harvest_interval, candidates[0].slip) == (30 * DAY, 100)
+    assert [c.score for c in candidates] == sorted(
+        (c.score for c in candidates), reverse=True
+    )
+    # DAI into a DAI heavy pool never mints its full virtual price value
+    assert all(c.failed_harvests == c.harvests for c in candidates if c.slip == 0)
+
+
+def test_idle_deposits_favour_short_intervals():
+    flows = {"usdc_musd": {START + day * DAY: 1000 for day in range(1, 366)}}
+    ranked = cadence.optimize(
+        history(366),
+        {"usdc_musd": 100_000},
+        {},
+        INTERVALS,
+        [10, 100],
+        flows,
+        max_workers=2,
+    )
+    best = ranked["usdc_musd"][0]
+    assert (best.harvest_interval, best.slip) == (DAY, 10)
+    assert best.net_apy is None
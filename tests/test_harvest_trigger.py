@@ -0,0 +1,94 @@
+import brownie
+import pytest
+from brownie import ZERO_ADDRESS, network
+
+import mocks
+
+# wei of ETH per whole want token, at the stand-in router
+PRICE = 10 ** 18
+
+
+@pytest.fixture
+def priced(gov, strategist, setup):
+    # the stand-in router works on mainnet-fork as well
+    router = mocks.deploy_price_router(gov, setup.strategy.weth())
+    router.setPrice(setup.want, PRICE, {"from": gov})
+    setup.strategy.setPriceRouter(router, {"from": strategist})
+    # keep maxReportDelay out of the way
+    setup.strategy.setMaxReportDelay(10 ** 10, {"from": strategist})
+    yield router
+
+
+def eth(setup, amount):
+    return amount * PRICE // 10 ** setup.want.decimals()
+
+
+def test_credit_pays_for_harvest(bob, priced, setup):
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[0], {"from": bob})
+    cost = eth(setup, vault.creditAvailable(strategy)) // strategy.profitFactor()
+
+    assert strategy.harvestTrigger(cost - 1)
+    assert not strategy.harvestTrigger(cost + 1)
+
+
+def test_gain_pays_for_harvest(chain, gov, strategist, bob, priced, setup):
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.harvest({"from": gov})
+    # entry costs aren't a loss to harvest for here
+    strategy.setDebtThreshold(setup.amounts[0], {"from": strategist})
+
+    chain.sleep(3600 * 24 * 7)
+    chain.mine(1)
+    setup.pool.targetVaultStrat.harvest({"from": setup.pool.targetVaultStratOwner})
+    if not (setup.config.fork_profit or network.show_active() == "development"):
+        return
+    gain = (
+        strategy.estimatedTotalAssets() - vault.strategies(strategy).dict()["totalDebt"]
+    )
+    assert gain > 0
+    cost = eth(setup, gain) // strategy.profitFactor()
+
+    assert strategy.harvestTrigger(cost - 1)
+    assert not strategy.harvestTrigger(cost + 1)
+
+
+def test_price_sources(chain, strategist, bob, priced, setup):
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[0], {"from": bob})
+    credit = vault.creditAvailable(strategy)
+
+    # no price for want: only the delay and losses trigger
+    priced.setPrice(setup.want, 0, {"from": strategist})
+    assert not strategy.harvestTrigger(1)
+
+    # no router: callCost is in want
+    strategy.setPriceRouter(ZERO_ADDRESS, {"from": strategist})
+    assert strategy.harvestTrigger(credit // strategy.profitFactor() - 1)
+    assert not strategy.harvestTrigger(credit // strategy.profitFactor() + 1)
+
+    strategy.setMaxReportDelay(3600, {"from": strategist})
+    chain.sleep(3601)
+    chain.mine(1)
+    assert strategy.harvestTrigger(2 ** 128)
+
+
+def test_debt_outstanding_triggers(gov, strategist, bob, priced, setup):
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.harvest({"from": gov})
+    # no price: value can't pay for anything
+    priced.setPrice(setup.want, 0, {"from": strategist})
+
+    vault.revokeStrategy(strategy, {"from": gov})
+    outstanding = vault.debtOutstanding(strategy)
+    strategy.setDebtThreshold(outstanding, {"from": strategist})
+    assert not strategy.harvestTrigger(1)
+    strategy.setDebtThreshold(outstanding - 1, {"from": strategist})
+    assert strategy.harvestTrigger(2 ** 128)
+
+
+def test_price_router_setter(bob, setup):
+    with brownie.reverts("!sg"):
+        setup.strategy.setPriceRouter(ZERO_ADDRESS, {"from": bob})
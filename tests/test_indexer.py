@@ -0,0 +1,158 @@
+from types import SimpleNamespace
+
+import pytest
+from brownie import ZERO_ADDRESS, chain, web3
+from eth_abi import encode_abi, encode_single
+from eth_utils import event_abi_to_log_topic
+
+from scripts.indexer import Indexer
+
+VAULT = "0x000000000000000000000000000000000000dEaD"
+TRANSFER = {
+    "type": "event",
+    "name": "Transfer",
+    "anonymous": False,
+    "inputs": [
+        {"name": "sender", "type": "address", "indexed": True},
+        {"name": "receiver", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+
+
+class FakeNode:
+    """eth_getLogs over a fixed set of logs, refusing ranges longer than `limit` blocks."""
+
+    def __init__(self, logs, head, limit):
+        self.logs = logs
+        self.limit = limit
+        self.ranges = []
+        self.eth = SimpleNamespace(getLogs=self.get_logs, blockNumber=head)
+
+    def get_logs(self, params):
+        start, end = params["fromBlock"], params["toBlock"]
+        if end - start + 1 > self.limit:
+            raise ValueError(
+                {"code": -32005, "message": "query returned more than 10000 results"}
+            )
+        self.ranges.append((start, end))
+        return [log for log in self.logs if start <= log["blockNumber"] <= end]
+
+
+def transfer(block, receiver, value):
+    return {
+        "blockNumber": block,
+        "logIndex": 0,
+        "transactionHash": "0x" + f"{block:064x}",
+        "address": VAULT,
+        "topics": [
+            event_abi_to_log_topic(TRANSFER),
+            encode_single("address", ZERO_ADDRESS),
+            encode_single("address", receiver),
+        ],
+        "data": "0x" + encode_abi(["uint256"], [value]).hex(),
+    }
+
+
+def test_ranges_split_and_resume(tmp_path, accounts):
+    logs = [
+        transfer(block, accounts[block % 3].address, 2 ** 200 + block)
+        for block in range(0, 1000, 7)
+    ]
+    node = FakeNode(logs, head=1000, limit=100)
+    indexer = Indexer(
+        node,
+        [VAULT],
+        [[TRANSFER]],
+        tmp_path / "events.sqlite",
+        confirmations=10,
+        span=400,
+    )
+
+    assert indexer.sync(to_block=500) == len(
+        [log for log in logs if log["blockNumber"] <= 500]
+    )
+    assert indexer.splits > 0
+    # blocks are covered once, in order, without gaps
+    assert [r[0] for r in node.ranges] == [0] + [r[1] + 1 for r in node.ranges[:-1]]
+    assert node.ranges[-1][1] == 500
+
+    # a new indexer on the same store picks up after the checkpoint
+    node.ranges = []
+    resumed = Indexer(
+        node,
+        [VAULT],
+        [[TRANSFER]],
+        tmp_path / "events.sqlite",
+        confirmations=10,
+        span=50,
+    )
+    resumed.sync()
+    assert node.ranges[0][0] == 501 and node.ranges[-1][1] == 990
+
+    stored = resumed.query("Transfer")
+    assert len(stored) == len([log for log in logs if log["blockNumber"] <= 990])
+    assert stored[1] == {
+        "block": 7,
+        "log_index": 0,
+        "tx": "0x" + f"{7:064x}",
+        "address": VAULT,
+        "sender": ZERO_ADDRESS,
+        "receiver": accounts[1].address,
+        "value": 2 ** 200 + 7,
+    }
+
+
+def test_single_block_refused(tmp_path):
+    node = FakeNode([], head=100, limit=0)
+    with pytest.raises(ValueError):
+        Indexer(node, [VAULT], [[TRANSFER]], tmp_path / "events.sqlite").sync()
+
+
+def test_other_errors_raised(tmp_path):
+    node = FakeNode([], head=100, limit=1000)
+
+    def get_logs(params):
+        node.ranges.append((params["fromBlock"], params["toBlock"]))
+        raise ValueError(
+            {
+                "code": -32602,
+                "message": "invalid argument 0: hex string without 0x prefix",
+            }
+        )
+
+    node.eth.getLogs = get_logs
+    with pytest.raises(ValueError, match="invalid argument"):
+        Indexer(node, [VAULT], [[TRANSFER]], tmp_path / "events.sqlite").sync(
+            to_block=100
+        )
+    # raised on the first range, not split down to single blocks
+    assert len(node.ranges) == 1
+
+
+def test_vault_and_strategy_events(tmp_path, gov, bob, setup):
+    vault, strategy = setup.vault, setup.strategy
+    start = chain.height + 1
+    vault.deposit(setup.amounts[0], {"from": bob})
+    tx = strategy.harvest({"from": gov})
+
+    indexer = Indexer(
+        web3,
+        [vault, strategy],
+        [vault.abi, strategy.abi],
+        tmp_path / "events.sqlite",
+        start,
+        0,
+    )
+    indexer.sync()
+
+    mints = [e for e in indexer.query("Transfer", vault) if e["sender"] == ZERO_ADDRESS]
+    assert (mints[0]["receiver"], mints[0]["value"]) == (
+        bob.address,
+        vault.balanceOf(bob),
+    )
+    harvested = indexer.query("Harvested")
+    assert [e["profit"] for e in harvested] == [tx.events["Harvested"]["profit"]]
+    reported = indexer.query("StrategyReported", vault)
+    assert reported[-1]["strategy"] == strategy.address
+    assert reported[-1]["totalDebt"] == vault.strategies(strategy).dict()["totalDebt"]
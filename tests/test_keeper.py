@@ -0,0 +1,62 @@
+import asyncio
+
+from scripts.keeper import Keeper
+
+
+def fixed_price(want, decimals):
+    # no uniswap locally: one whole want token is worth 1 ETH
+    return 10 ** 18
+
+
+def test_keeper(chain, keeper, strategist, bob, setup):
+    vault, strategy = setup.vault, setup.strategy
+    strategy.setKeeper(keeper, {"from": strategist})
+    vault.deposit(setup.amounts[0], {"from": bob})
+
+    bot = Keeper(keeper, [strategy], price=fixed_price)
+
+    # the vault has credit for the new strategy, worth the gas
+    assert asyncio.run(bot.tick()) == {strategy.address: (True, "credit available")}
+    assert setup.pool.targetVault.balanceOf(strategy) > 0
+
+    # nothing to do right after a harvest
+    assert asyncio.run(bot.tick()) == {strategy.address: (False, "not profitable")}
+    bot.profit_factor = 10 ** 9
+
+    # well within maxReportDelay
+    chain.sleep(3600)
+    chain.mine(1)
+    setup.pool.targetVaultStrat.harvest({"from": setup.pool.targetVaultStratOwner})
+
+    # profit, but not enough to pay for gas a billion times over
+    assert asyncio.run(bot.tick()) == {strategy.address: (False, "not profitable")}
+
+    bot.profit_factor = 0
+    before = vault.strategies(strategy).dict()["totalGain"]
+    assert asyncio.run(bot.tick()) == {strategy.address: (True, "profitable")}
+    assert vault.strategies(strategy).dict()["totalGain"] > before
+
+
+def test_keeper_dry_run(keeper, strategist, bob, setup):
+    vault, strategy = setup.vault, setup.strategy
+    strategy.setKeeper(keeper, {"from": strategist})
+    vault.deposit(setup.amounts[0], {"from": bob})
+
+    bot = Keeper(keeper, [strategy], price=fixed_price, dry_run=True)
+    assert asyncio.run(bot.tick()) == {strategy.address: (True, "credit available")}
+    assert setup.pool.targetVault.balanceOf(strategy) == 0
+
+
+def test_keeper_waits_out_dust_credit(keeper, strategist, bob, setup):
+    vault, strategy = setup.vault, setup.strategy
+    strategy.setKeeper(keeper, {"from": strategist})
+    bot = Keeper(keeper, [strategy], price=fixed_price)
+
+    # credit worth far less than a harvest's gas
+    vault.deposit(10 ** setup.want.decimals() // 10 ** 4, {"from": bob})
+    assert vault.creditAvailable(strategy) > 0
+    assert asyncio.run(bot.tick()) == {strategy.address: (False, "not profitable")}
+    assert setup.pool.targetVault.balanceOf(strategy) == 0
+
+    vault.deposit(setup.amounts[0], {"from": bob})
+    assert asyncio.run(bot.tick()) == {strategy.address: (True, "credit available")}
@@ -0,0 +1,19 @@
+def test_migration(chain, gov, guardian, strategist, bob, alice, tinytim, setup):
+    vault, strategy = setup.vault, setup.strategy
+    targetVault = setup.pool.targetVault
+
+    # users deposit to vault
+    for user, amount in zip((bob, alice, tinytim), setup.amounts):
+        vault.deposit(amount, {"from": user})
+
+    chain.mine(1)
+
+    strategy.harvest({"from": gov})
+
+    newstrategy = guardian.deploy(setup.Strategy, vault, *setup.args)
+    newstrategy.setStrategist(strategist, {"from": guardian})
+
+    vault.migrateStrategy(strategy, newstrategy, {"from": gov})
+
+    assert targetVault.balanceOf(strategy) == 0
+    assert targetVault.balanceOf(newstrategy) > 0
@@ -0,0 +1,30 @@
+import brownie
+
+
+def test_small_deposits_wait(gov, strategist, bob, tinytim, setup):
+    vault, strategy = setup.vault, setup.strategy
+    targetVault = setup.pool.targetVault
+    bob_amount, _, tinytim_amount = setup.amounts
+    strategy.setMinInvest(tinytim_amount * 2, {"from": strategist})
+
+    # tinytim's deposit is below the threshold: it stays as want, still counted
+    vault.deposit(tinytim_amount, {"from": tinytim})
+    strategy.harvest({"from": gov})
+    assert targetVault.balanceOf(strategy) == 0
+    assert strategy.balanceOfWant() == tinytim_amount
+    assert strategy.estimatedTotalAssets() == tinytim_amount
+
+    # and goes in with the next inflow that takes the total over it
+    vault.deposit(bob_amount, {"from": bob})
+    strategy.harvest({"from": gov})
+    assert targetVault.balanceOf(strategy) > 0
+    assert strategy.balanceOfWant() == 0
+
+
+def test_min_invest_setter(strategist, bob, setup):
+    strategy = setup.strategy
+    assert strategy.minInvest() == 0
+    with brownie.reverts("!sg"):
+        strategy.setMinInvest(1, {"from": bob})
+    with brownie.reverts("!minInvest"):
+        strategy.setMinInvest(2 ** 128, {"from": strategist})
@@ -0,0 +1,43 @@
+from scripts.multicall import StrategyReader
+
+
+def test_snapshot_matches_direct_reads(chain, gov, bob, multicall, setup):
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.harvest({"from": gov})
+    chain.mine(1)
+
+    reader = StrategyReader(multicall, [strategy])
+    (snap,) = reader.snapshot()
+
+    params = vault.strategies(strategy).dict()
+    # ganache runs eth_call in a pending block on top of the requested one
+    assert snap.block in (chain.height, chain.height + 1)
+    assert snap.vault == vault.address
+    assert snap.balance_of_want == strategy.balanceOfWant()
+    assert snap.balance_of_stake == strategy.balanceOfStake()
+    assert snap.balance_of_pool == strategy.balanceOfPool(0)
+    assert snap.estimated_total_assets == strategy.estimatedTotalAssets()
+    assert snap.total_debt == params["totalDebt"]
+    assert snap.last_report == params["lastReport"]
+    assert snap.price_per_share == setup.pool.targetVault.getPricePerFullShare()
+    if setup.pool.base:
+        assert snap.base_virtual_price == setup.pool.base.pool.get_virtual_price()
+        assert snap.meta_virtual_price == setup.pool.pool.get_virtual_price()
+    else:
+        assert snap.base_virtual_price == setup.pool.pool.get_virtual_price()
+        assert snap.meta_virtual_price is None
+
+
+def test_snapshot_at_block(chain, gov, bob, multicall, setup):
+    vault, strategy = setup.vault, setup.strategy
+    vault.deposit(setup.amounts[0], {"from": bob})
+    reader = StrategyReader(multicall, [strategy])
+
+    before = chain.height
+    strategy.harvest({"from": gov})
+
+    (snap,) = reader.snapshot(block_identifier=before)
+    assert snap.block in (before, before + 1)
+    assert snap.total_debt == 0
+    assert snap.balance_of_stake == 0
@@ -0,0 +1,165 @@
+import pytest
+from brownie import network
+from eth_abi import encode_abi
+
+from scripts.preflight import (
+    ERROR_SELECTOR,
+    Preflight,
+    decode_revert,
+    describe,
+    revert_reason,
+    tunables_slot,
+    with_settings,
+)
+
+
+def skew(gov, setup):
+    # make the base pool want heavy, as in test_quote_slippage
+    want, strategy = setup.want, setup.strategy
+    base_pool = (setup.pool.base or setup.pool).pool
+    index = strategy.baseIndex()
+    other = (index + 1) % strategy.baseCoins()
+    amount = base_pool.balances(index) * 8 // 10
+    setup.pool.fund(want, gov, amount)
+    want.approve(base_pool, amount, {"from": gov})
+    base_pool.exchange(index, other, amount, 0, {"from": gov})
+
+
+def test_harvest_suggests_quoted_slippage(gov, strategist, bob, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    vault, strategy = setup.vault, setup.strategy
+    skew(gov, setup)
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.setSlip(10, {"from": strategist})
+    nonce = strategist.nonce
+
+    outcome = Preflight(strategist).harvest(strategy)
+
+    first = outcome.simulations[0]
+    assert not first.ok and first.reason.startswith("Slippage screw")
+    assert outcome.suggested == {"quoteSlippage": True}
+    if outcome.verified:
+        assert outcome.simulations[-1].ok
+    # nothing sent, nothing changed
+    assert not outcome.sent and outcome.adjustments == []
+    assert strategist.nonce == nonce
+    assert (strategy.slip(), strategy.quoteSlippage()) == (10, False)
+
+
+def test_harvest_tuned_on_chain(gov, strategist, bob, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    vault, strategy = setup.vault, setup.strategy
+    skew(gov, setup)
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.setSlip(10, {"from": strategist})
+    nonce = strategist.nonce
+
+    outcome = Preflight(strategist, tune=True).harvest(strategy)
+
+    assert outcome.adjustments == ["quoteSlippage on"]
+    # the setter, the harvest and the setter putting quoteSlippage back; no reverted harvest
+    assert strategist.nonce == nonce + 3
+    assert outcome.tx.status == 1
+    assert setup.pool.targetVault.balanceOf(strategy) > 0
+    assert (strategy.slip(), strategy.quoteSlippage()) == (10, False)
+
+
+def test_suggested_slip_capped(gov, strategist, bob, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    vault, strategy = setup.vault, setup.strategy
+    skew(gov, setup)
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.setSlip(0, {"from": strategist})
+    strategy.setQuoteSlippage(True, {"from": strategist})
+
+    preflight = Preflight(strategist, max_slip=4)
+    assert all(settings["slip"] <= 4 for settings in preflight.candidates(strategy))
+    outcome = preflight.harvest(strategy)
+
+    assert outcome.suggested.get("slip", 0) <= 4
+    assert strategy.slip() == 0 and strategy.quoteSlippage()
+
+
+def test_tunables_slot(strategist, setup):
+    strategy = setup.strategy
+    strategy.setSlip(25, {"from": strategist})
+    slot, word = tunables_slot(strategy)
+
+    assert with_settings(word, {"slip": 25, "quoteSlippage": False}) == word
+    strategy.setSlip(40, {"from": strategist})
+    strategy.setQuoteSlippage(True, {"from": strategist})
+    assert (
+        with_settings(word, {"slip": 40, "quoteSlippage": True})
+        == tunables_slot(strategy)[1]
+    )
+    assert describe({"quoteSlippage": True, "slip": 40}) == [
+        "quoteSlippage on",
+        "slip 40",
+    ]
+
+
+def test_reverting_harvest_not_sent(bob, setup):
+    nonce = bob.nonce
+    outcome = Preflight(bob).harvest(setup.strategy)
+
+    assert not outcome.sent
+    assert outcome.reason == "!authorized"
+    assert outcome.adjustments == []
+    assert bob.nonce == nonce
+
+
+def test_dry_run_sends_nothing(strategist, bob, setup):
+    setup.vault.deposit(setup.amounts[0], {"from": bob})
+    nonce = strategist.nonce
+    outcome = Preflight(strategist, dry_run=True).harvest(setup.strategy)
+
+    assert outcome.simulations[0].ok and outcome.simulations[0].gas > 0
+    assert not outcome.sent
+    assert strategist.nonce == nonce
+
+
+def test_withdraw_raises_max_loss(gov, bob, setup):
+    vault, want = setup.vault, setup.want
+    vault.deposit(setup.amounts[0], {"from": bob})
+    setup.strategy.harvest({"from": gov})
+    before = want.balanceOf(bob)
+
+    outcome = Preflight(bob, max_loss_limit=setup.config.max_loss).withdraw(
+        vault, vault.balanceOf(bob), max_loss=1
+    )
+
+    # every simulation but the last reverted, each retry raised maxLoss
+    assert outcome.sent
+    assert [s.ok for s in outcome.simulations] == [False] * len(outcome.adjustments) + [
+        True
+    ]
+    assert want.balanceOf(bob) > before
+
+
+def test_revert_reasons():
+    data = ERROR_SELECTOR + encode_abi(["string"], ["Slippage screwup"]).hex()
+    assert decode_revert(data) == "Slippage screwup"
+    assert decode_revert("0x") is None
+
+    # ganache
+    error = {
+        "message": "VM Exception while processing transaction: revert !authorized",
+        "data": {},
+    }
+    assert revert_reason(ValueError(error)) == "!authorized"
+    error["data"] = {
+        "0xabc": {"error": "revert", "return": data},
+        "name": "RuntimeError",
+    }
+    assert revert_reason(ValueError(error)) == "Slippage screwup"
+    # geth
+    assert (
+        revert_reason(
+            ValueError({"code": 3, "message": "execution reverted", "data": data})
+        )
+        == "Slippage screwup"
+    )
+    assert revert_reason(ValueError("execution reverted: !minLp")) == "!minLp"
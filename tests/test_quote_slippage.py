@@ -0,0 +1,42 @@
+import brownie
+import pytest
+from brownie import network
+
+
+def test_deposit_into_imbalanced_pool(gov, strategist, bob, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    vault, strategy, want = setup.vault, setup.strategy, setup.want
+    base_pool = (setup.pool.base or setup.pool).pool
+    index = strategy.baseIndex()
+
+    # make the base pool want heavy
+    other = (index + 1) % strategy.baseCoins()
+    amount = base_pool.balances(index) * 8 // 10
+    setup.pool.fund(want, gov, amount)
+    want.approve(base_pool, amount, {"from": gov})
+    base_pool.exchange(index, other, amount, 0, {"from": gov})
+
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.setSlip(10, {"from": strategist})
+    # want in is worth more than 0.1% less than its virtual price value
+    with brownie.reverts():
+        strategy.harvest({"from": gov})
+
+    # but is within 0.1% of what the pool quotes
+    strategy.setQuoteSlippage(True, {"from": strategist})
+    strategy.harvest({"from": gov})
+    assert setup.pool.targetVault.balanceOf(strategy) > 0
+
+    # withdrawals pass quoted minimums too
+    vault.withdraw(vault.balanceOf(bob), bob, 10_000, {"from": bob})
+    assert want.balanceOf(bob) > 0
+
+
+def test_quote_slippage_setter(strategist, bob, setup):
+    strategy = setup.strategy
+    assert not strategy.quoteSlippage()
+    with brownie.reverts("!sg"):
+        strategy.setQuoteSlippage(True, {"from": bob})
+    strategy.setQuoteSlippage(True, {"from": strategist})
+    assert strategy.quoteSlippage()
@@ -0,0 +1,36 @@
+import brownie
+from brownie import ZERO_ADDRESS, StrategyCurveLP
+
+
+def test_route(setup):
+    strategy, pool = setup.strategy, setup.pool
+    assert strategy.lpToken() == pool.lp
+    assert strategy.targetVault() == pool.targetVault
+    assert strategy.wantScale() == 10 ** (18 - setup.config.decimals)
+    if pool.base:
+        assert strategy.basePool() == pool.base.pool
+        assert strategy.metaPool() == pool.pool
+    else:
+        assert strategy.basePool() == pool.pool
+        assert strategy.metaPool() == ZERO_ADDRESS
+
+
+def test_route_validation(guardian, setup):
+    pool = setup.pool.base or setup.pool
+    route = [
+        pool.pool,
+        3,
+        0,
+        pool.lp,
+        ZERO_ADDRESS,
+        0,
+        ZERO_ADDRESS,
+        setup.pool.targetVault,
+    ]
+
+    with brownie.reverts("!coins"):
+        guardian.deploy(StrategyCurveLP, setup.vault, [route[0], 4] + route[2:], "bad")
+    with brownie.reverts("!index"):
+        guardian.deploy(
+            StrategyCurveLP, setup.vault, route[:2] + [3] + route[3:], "bad"
+        )
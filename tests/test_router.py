@@ -0,0 +1,158 @@
+import brownie
+import pytest
+from brownie import ZERO_ADDRESS, CurveRouter, MockERC20, network
+
+import mocks
+
+DIRECT = 0
+
+
+@pytest.fixture
+def uniswap(gov, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    # every coin of the route at par, no fees
+    uniswap = mocks.deploy_price_router(gov, setup.strategy.weth())
+    base = setup.pool.base or setup.pool
+    for i in range(setup.strategy.baseCoins()):
+        uniswap.setPrice(base.pool.coins(i), 10 ** 18, {"from": gov})
+    if setup.pool.base:
+        uniswap.setPrice(setup.pool.pool.coins(0), 10 ** 18, {"from": gov})
+    yield uniswap
+
+
+def deploy_router(gov, uniswap, strategy):
+    router = CurveRouter.deploy(uniswap, {"from": gov})
+    router.setStrategy(strategy, True, {"from": gov})
+    strategy.setRouter(router, {"from": gov})
+    return router
+
+
+def direct_quote(setup, amount):
+    strategy = setup.strategy
+    amounts = [0] * strategy.baseCoins()
+    amounts[strategy.baseIndex()] = amount
+    lp = (setup.pool.base or setup.pool).pool.calc_token_amount(amounts, True)
+    if setup.pool.base:
+        amounts = [0, 0]
+        amounts[strategy.metaIndex()] = lp
+        lp = setup.pool.pool.calc_token_amount(amounts, True)
+    return lp
+
+
+def assert_holds_nothing(router, setup):
+    strategy = setup.strategy
+    for token in {strategy.want(), strategy.baseLp(), strategy.lpToken()}:
+        assert MockERC20.at(token).balanceOf(router) == 0
+
+
+def test_curve_only_router(gov, bob, setup):
+    vault, strategy, want = setup.vault, setup.strategy, setup.want
+    router = deploy_router(gov, ZERO_ADDRESS, strategy)
+    assert router.quoteEnter(strategy, setup.amounts[0]) == (
+        DIRECT,
+        direct_quote(setup, setup.amounts[0]),
+    )
+
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.harvest({"from": gov})
+    assert setup.pool.targetVault.balanceOf(strategy) > 0
+
+    vault.withdraw(vault.balanceOf(bob), bob, setup.config.max_loss, {"from": bob})
+    assert want.balanceOf(bob) > setup.amounts[0] * 99 // 100
+    assert_holds_nothing(router, setup)
+
+
+def test_routes_around_imbalanced_pool(gov, strategist, bob, uniswap, setup):
+    vault, strategy, want = setup.vault, setup.strategy, setup.want
+    base_pool = (setup.pool.base or setup.pool).pool
+    index = strategy.baseIndex()
+
+    # make the base pool want heavy
+    other = (index + 1) % strategy.baseCoins()
+    amount = base_pool.balances(index) * 8 // 10
+    setup.pool.fund(want, gov, amount)
+    want.approve(base_pool, amount, {"from": gov})
+    base_pool.exchange(index, other, amount, 0, {"from": gov})
+
+    router = deploy_router(gov, uniswap, strategy)
+    path, lp = router.quoteEnter(strategy, setup.amounts[0])
+    assert path != DIRECT
+    assert lp > direct_quote(setup, setup.amounts[0])
+
+    # the direct path would be more than 0.1% short of the virtual price value
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.setSlip(10, {"from": strategist})
+    strategy.harvest({"from": gov})
+    assert strategy.balanceOfStake() >= lp * 999 // 1000
+    assert_holds_nothing(router, setup)
+
+    vault.withdraw(vault.balanceOf(bob), bob, 10_000, {"from": bob})
+    assert want.balanceOf(bob) > 0
+    assert_holds_nothing(router, setup)
+
+
+def test_exit_bounded_by_virtual_price(gov, strategist, bob, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    vault, strategy = setup.vault, setup.strategy
+    deploy_router(gov, ZERO_ADDRESS, strategy)
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.harvest({"from": gov})
+
+    # make the base pool short of want: want out is worth well under its virtual price value
+    base_pool = (setup.pool.base or setup.pool).pool
+    index = strategy.baseIndex()
+    other = (index + 1) % strategy.baseCoins()
+    coin = MockERC20.at(base_pool.coins(other))
+    amount = base_pool.balances(other) * 8 // 10
+    setup.pool.fund(coin, gov, amount)
+    coin.approve(base_pool, amount, {"from": gov})
+    base_pool.exchange(other, index, amount, 0, {"from": gov})
+
+    strategy.setSlip(10, {"from": strategist})
+    # maxLoss doesn't matter: the strategy's minimum holds, whatever the router quotes
+    with brownie.reverts("!minOut"):
+        vault.withdraw(vault.balanceOf(bob), bob, 10_000, {"from": bob})
+
+    strategy.setSlip(10_000, {"from": strategist})
+    vault.withdraw(vault.balanceOf(bob), bob, 10_000, {"from": bob})
+
+
+def test_router_setter(gov, strategist, setup):
+    strategy, want = setup.strategy, setup.want
+    router = CurveRouter.deploy(ZERO_ADDRESS, {"from": gov})
+    with brownie.reverts("!authorized"):
+        strategy.setRouter(router, {"from": strategist})
+
+    strategy.setRouter(router, {"from": gov})
+    assert want.allowance(strategy, router) > 0
+    strategy.setRouter(ZERO_ADDRESS, {"from": gov})
+    assert want.allowance(strategy, router) == 0
+    assert strategy.router() == ZERO_ADDRESS
+
+
+def test_router_callers(gov, bob, setup):
+    strategy, want = setup.strategy, setup.want
+    router = CurveRouter.deploy(ZERO_ADDRESS, {"from": gov})
+    strategy.setRouter(router, {"from": gov})
+
+    # a strategy governance didn't allow can't route: harvest can't invest
+    setup.vault.deposit(setup.amounts[0], {"from": bob})
+    with brownie.reverts("!strategy"):
+        strategy.harvest({"from": gov})
+    with brownie.reverts("!strategy"):
+        router.enter(1, 0, {"from": bob})
+    with brownie.reverts("!governance"):
+        router.setStrategy(bob, True, {"from": bob})
+
+    # a stray balance isn't paid out with the next call, governance sweeps it
+    router.setStrategy(strategy, True, {"from": gov})
+    setup.pool.fund(want, bob, setup.amounts[2])
+    want.transfer(router, setup.amounts[2], {"from": bob})
+    strategy.harvest({"from": gov})
+    assert want.balanceOf(router) == setup.amounts[2]
+    with brownie.reverts("!governance"):
+        router.sweep(want, {"from": bob})
+    router.sweep(want, {"from": gov})
+    assert want.balanceOf(router) == 0
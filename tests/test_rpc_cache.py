@@ -0,0 +1,108 @@
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.rpc_cache import RecordingProxy, fork_block
+
+PINNED = 11860000
+
+
+@pytest.fixture
+def upstream():
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests.extend(payload)
+            if any(r["method"] == "eth_rejected" for r in payload):
+                # a node refusing the whole batch answers with a single error object
+                body = json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": None,
+                        "error": {"code": -32600, "message": "rejected"},
+                    }
+                )
+            else:
+                # answered in reverse, as a node may order batch responses
+                body = json.dumps(
+                    [
+                        {"jsonrpc": "2.0", "id": r["id"], "result": r["method"]}
+                        for r in payload[::-1]
+                    ]
+                )
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requests
+    server.shutdown()
+
+
+def rpc(method, *params, id=1):
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": list(params)}
+
+
+def test_pinned_state_replays(tmp_path, upstream):
+    url, requests = upstream
+    proxy = RecordingProxy(url, tmp_path / "cache.sqlite", PINNED)
+    storage = rpc("eth_getStorageAt", "0xabc", "0x0", hex(PINNED))
+    code = rpc("eth_getCode", "0xabc", hex(PINNED - 1), id=2)
+
+    assert proxy.handle([storage, code]) == proxy.handle([storage, code])
+    assert proxy.handle(storage)["result"] == "eth_getStorageAt"
+    assert len(requests) == 2
+    assert (proxy.hits, proxy.misses) == (3, 2)
+
+    # later and symbolic blocks always go upstream
+    proxy.handle(rpc("eth_getBalance", "0xabc", hex(PINNED + 1)))
+    proxy.handle(rpc("eth_getBalance", "0xabc", "latest"))
+    proxy.handle(rpc("eth_blockNumber"))
+    assert len(requests) == 5
+
+    # a later run replays without an upstream
+    offline = RecordingProxy(None, tmp_path / "cache.sqlite", PINNED, offline=True)
+    assert offline.handle(code)["result"] == "eth_getCode"
+    assert "error" in offline.handle(rpc("eth_getBalance", "0xabc", "latest"))
+
+
+def test_upstream_error_passed_back(tmp_path, upstream):
+    url, requests = upstream
+    proxy = RecordingProxy(url, tmp_path / "cache.sqlite", PINNED)
+    balance = rpc("eth_getBalance", "0xabc", hex(PINNED))
+
+    responses = proxy.handle([balance, rpc("eth_rejected", id=2)])
+    assert [(r["id"], r["error"]["message"]) for r in responses] == [
+        (1, "rejected"),
+        (2, "rejected"),
+    ]
+
+    # errors aren't recorded
+    assert proxy.handle(balance)["result"] == "eth_getBalance"
+    assert len(requests) == 3
+
+
+def test_serves_over_http(tmp_path, upstream):
+    url, requests = upstream
+    server = RecordingProxy(url, tmp_path / "cache.sqlite", PINNED).serve(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    body = json.dumps(rpc("eth_chainId")).encode()
+    for _ in range(2):
+        request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}", body)
+        with urllib.request.urlopen(request) as response:
+            assert json.loads(response.read())["result"] == "eth_chainId"
+    server.shutdown()
+    assert len(requests) == 1
+
+
+def test_fork_block_is_pinned():
+    assert fork_block() == PINNED
@@ -0,0 +1,34 @@
+def test_shutdown(chain, gov, bob, alice, tinytim, setup):
+    vault, strategy, want = setup.vault, setup.strategy, setup.want
+    targetVault = setup.pool.targetVault
+
+    # users deposit to vault
+    for user, amount in zip((bob, alice, tinytim), setup.amounts):
+        vault.deposit(amount, {"from": user})
+
+    chain.mine(1)
+
+    strategy.harvest({"from": gov})
+
+    assert targetVault.balanceOf(strategy) > 0
+    chain.sleep(3600 * 24 * 7 * 10)
+    chain.mine(1)
+
+    # small profit
+    setup.pool.targetVaultStrat.harvest({"from": setup.pool.targetVaultStratOwner})
+    strategy.harvest({"from": gov})
+    chain.mine(1)
+
+    strategy.setEmergencyExit({"from": gov})
+    strategy.harvest({"from": gov})
+    chain.mine(1)
+
+    assert want.balanceOf(vault) > 0
+
+    for user in (alice, bob, tinytim):
+        vault.withdraw(
+            vault.balanceOf(user), user, setup.config.max_loss, {"from": user}
+        )
+        assert want.balanceOf(user) > 0
+
+    assert vault.pricePerShare() > 1
@@ -0,0 +1,93 @@
+import pytest
+from brownie import MockERC20, network, web3
+
+import registry
+from scripts import stableswap
+
+# trade sizes as fractions of the pool's balance of the coin
+FRACTIONS = [10 ** 6, 10 ** 3, 10]
+# how long mainnet metapools keep their cached base pool virtual price
+BASE_CACHE_EXPIRES = 10 * 60
+
+
+@pytest.fixture(scope="module")
+def chains(pool_chains):
+    # loaded here rather than in the tests, so it happens before `isolation` snapshots
+    return {pool_id: pool_chains(pool_id) for pool_id in registry.POOLS}
+
+
+def on_fork():
+    return network.show_active().endswith("-fork")
+
+
+def base_rate(chain):
+    # the base LP rate a mainnet metapool quotes with: its cached base virtual price while
+    # fresh, the base pool's own after that (None: from_contract reads it)
+    if (
+        web3.eth.getBlock("latest").timestamp
+        > chain.pool.base_cache_updated() + BASE_CACHE_EXPIRES
+    ):
+        return None
+    return chain.pool.base_virtual_price()
+
+
+def model(chain):
+    cfg = registry.POOLS[chain.id]
+    base_virtual_price = base_rate(chain) if on_fork() and cfg.base else None
+    return stableswap.from_contract(
+        chain.pool, chain.lp, cfg.n_coins, base_virtual_price
+    )
+
+
+def one_coin(n, i, amount):
+    amounts = [0] * n
+    amounts[i] = amount
+    return amounts
+
+
+@pytest.mark.parametrize("pool_id", list(registry.POOLS))
+def test_quotes_match_pool(chains, pool_id):
+    # on mainnet-fork: the mainnet pools, metapools (mUSD, gUSD) included
+    chain = chains[pool_id]
+    pool = model(chain)
+
+    assert pool.virtual_price == chain.pool.get_virtual_price()
+    for i in range(pool.n):
+        for fraction in FRACTIONS:
+            amounts = one_coin(pool.n, i, pool.balances[i] // fraction)
+            assert pool.calc_token_amount(
+                amounts, True
+            ) == chain.pool.calc_token_amount(amounts, True)
+            assert pool.calc_token_amount(
+                amounts, False
+            ) == chain.pool.calc_token_amount(amounts, False)
+
+            token_amount = pool.supply // fraction
+            assert pool.calc_withdraw_one_coin(
+                token_amount, i
+            ) == chain.pool.calc_withdraw_one_coin(token_amount, i)
+
+
+@pytest.mark.parametrize("pool_id", list(registry.POOLS))
+def test_trades_match_quotes(chains, pool_id, bob):
+    if on_fork():
+        pytest.skip("mints coins of the local stand-ins")
+    chain = chains[pool_id]
+    lp = MockERC20.at(chain.lp)
+
+    for i in range(registry.POOLS[pool_id].n_coins):
+        pool = model(chain)
+        coin = MockERC20.at(chain.pool.coins(i))
+        amount = pool.balances[i] // 100
+        coin.mint(bob, amount, {"from": bob})
+        coin.approve(chain.pool, amount, {"from": bob})
+
+        minted = pool.add_liquidity(one_coin(pool.n, i, amount))
+        chain.pool.add_liquidity(one_coin(pool.n, i, amount), 0, {"from": bob})
+        assert lp.balanceOf(bob) == minted
+
+        pool = model(chain)
+        received = pool.calc_withdraw_one_coin(minted, i)
+        before = coin.balanceOf(bob)
+        chain.pool.remove_liquidity_one_coin(minted, i, 0, {"from": bob})
+        assert coin.balanceOf(bob) - before == received
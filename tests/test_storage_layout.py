@@ -0,0 +1,69 @@
+import brownie
+from brownie import ZERO_ADDRESS, web3
+
+# BaseStrategy plus the strategy's own variables fit well below this
+SLOTS = 32
+
+
+def storage(contract):
+    return [web3.eth.getStorageAt(contract.address, i) for i in range(SLOTS)]
+
+
+def changed_slots(before, after):
+    return [i for i, (a, b) in enumerate(zip(before, after)) if a != b]
+
+
+def test_config_addresses_are_immutable(setup):
+    # want itself is stored by BaseStrategy
+    strategy = setup.strategy
+    slots = storage(strategy)
+    for address in (
+        strategy.basePool(),
+        strategy.baseLp(),
+        strategy.metaPool(),
+        strategy.metaLp(),
+        strategy.targetVault(),
+    ):
+        if address == ZERO_ADDRESS:
+            continue
+        word = bytes.fromhex(address[2:].lower()).rjust(32, b"\0")
+        assert word not in slots
+
+
+def test_tunables_share_emergency_exit_slot(gov, strategist, setup):
+    strategy = setup.strategy
+
+    before = storage(strategy)
+    strategy.setSlip(250, {"from": strategist})
+    slip_slots = changed_slots(before, storage(strategy))
+
+    before = storage(strategy)
+    strategy.setMaxImpact(50, {"from": strategist})
+    impact_slots = changed_slots(before, storage(strategy))
+
+    before = storage(strategy)
+    strategy.setWantFloat(50, {"from": strategist})
+    float_slots = changed_slots(before, storage(strategy))
+
+    before = storage(strategy)
+    strategy.setQuoteSlippage(True, {"from": strategist})
+    quote_slots = changed_slots(before, storage(strategy))
+
+    before = storage(strategy)
+    strategy.setMinInvest(10 ** 20, {"from": strategist})
+    min_invest_slots = changed_slots(before, storage(strategy))
+
+    before = storage(strategy)
+    strategy.setEmergencyExit({"from": gov})
+    exit_slots = changed_slots(before, storage(strategy))
+
+    assert strategy.slip() == 250
+    assert strategy.maxImpact() == 50
+    assert len(slip_slots) == 1
+    assert impact_slots == float_slots == quote_slots == min_invest_slots == slip_slots
+    assert slip_slots[0] in exit_slots
+
+
+def test_slip_bounded(strategist, setup):
+    with brownie.reverts("!slip"):
+        setup.strategy.setSlip(10_001, {"from": strategist})
@@ -0,0 +1,35 @@
+import brownie
+from brownie import network
+
+
+def test_profit_reported_from_float(chain, gov, strategist, bob, setup):
+    vault, strategy = setup.vault, setup.strategy
+    targetVault = setup.pool.targetVault
+    strategy.setWantFloat(100, {"from": strategist})
+
+    vault.deposit(setup.amounts[0], {"from": bob})
+    strategy.harvest({"from": gov})
+    assert strategy.balanceOfWant() == setup.amounts[0] * 100 // 10_000
+
+    for _ in range(2):
+        chain.sleep(3600 * 24 * 7)
+        chain.mine(1)
+        setup.pool.targetVaultStrat.harvest({"from": setup.pool.targetVaultStratOwner})
+        shares = targetVault.balanceOf(strategy)
+        gain = vault.strategies(strategy).dict()["totalGain"]
+
+        strategy.harvest({"from": gov})
+
+        # profit went to the vault without leaving the target vault
+        if setup.config.fork_profit or network.show_active() == "development":
+            assert vault.strategies(strategy).dict()["totalGain"] > gain
+        assert targetVault.balanceOf(strategy) >= shares
+
+
+def test_want_float_bounded(strategist, bob, setup):
+    strategy = setup.strategy
+    assert strategy.wantFloat() == 0
+    with brownie.reverts("!float"):
+        strategy.setWantFloat(10_001, {"from": strategist})
+    with brownie.reverts("!sg"):
+        strategy.setWantFloat(50, {"from": bob})
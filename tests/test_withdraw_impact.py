@@ -0,0 +1,64 @@
+import brownie
+import pytest
+from brownie import MockERC20, network
+
+MAX_BPS = 10_000
+
+
+def test_bounded_impact_withdrawal(gov, strategist, bob, setup):
+    if network.show_active().endswith("-fork"):
+        pytest.skip("skews the local stand-in pools")
+    vault, strategy, want = setup.vault, setup.strategy, setup.want
+    base_pool = (setup.pool.base or setup.pool).pool
+    index = strategy.baseIndex()
+
+    # a whale holding 30% of the base pool's want
+    amount = base_pool.balances(index) * 3 // 10
+    setup.pool.fund(want, bob, amount)
+    vault.deposit(amount, {"from": bob})
+    strategy.setSlip(MAX_BPS, {"from": strategist})
+    strategy.harvest({"from": gov})
+
+    # then want gets drained out of the base pool
+    other = (index + 1) % strategy.baseCoins()
+    coin = MockERC20.at(base_pool.coins(other))
+    dx = (
+        base_pool.balances(index)
+        * 8
+        // 10
+        * 10 ** coin.decimals()
+        // 10 ** want.decimals()
+    )
+    coin.mint(gov, dx, {"from": gov})
+    coin.approve(base_pool, dx, {"from": gov})
+    base_pool.exchange(other, index, dx, 0, {"from": gov})
+
+    value = vault.balanceOf(bob) * vault.pricePerShare() // 10 ** vault.decimals()
+    one_shot = strategy.withdrawImpact(value)
+    floor = strategy.withdrawImpact(value // 1000)
+    assert one_shot > floor + 100
+    max_impact = (one_shot + floor) // 2
+    strategy.setMaxImpact(max_impact, {"from": strategist})
+
+    shares = vault.balanceOf(bob)
+    price = vault.pricePerShare()
+    before = want.balanceOf(bob)
+    vault.withdraw(shares, bob, MAX_BPS, {"from": bob})
+    burned = shares - vault.balanceOf(bob)
+    received = want.balanceOf(bob) - before
+    loss = MAX_BPS - received * MAX_BPS * 10 ** vault.decimals() // (burned * price)
+
+    # part of the position stays invested for later, what came out lost at most maxImpact
+    assert 0 < received < value
+    assert vault.balanceOf(bob) > 0
+    assert loss <= max_impact + 1
+    assert loss < one_shot
+
+
+def test_max_impact_bounded(strategist, bob, setup):
+    strategy = setup.strategy
+    assert strategy.maxImpact() == MAX_BPS
+    with brownie.reverts("!impact"):
+        strategy.setMaxImpact(MAX_BPS + 1, {"from": strategist})
+    with brownie.reverts("!sg"):
+        strategy.setMaxImpact(50, {"from": bob})